@@ -0,0 +1,249 @@
+"""
+QuantResearch Alert Engine
+==========================
+Price alerts evaluated on tick arrival instead of on the chart refresh.
+
+Price-level and percentage-move alerts live in per-ticker sorted
+indexes: ``above`` levels ascending, ``below`` levels ascending.  A tick
+only has to compare against the nearest level (O(1) when nothing fires,
+O(log k + fired) when something does), so thousands of alerts cost
+nothing measurable per tick.  Indicator-cross and QuantQL-expression
+alerts share one bar builder per ticker and are evaluated when a bar
+closes.
+
+Fired alerts are pushed to ``AlertEngine.events`` (a ``queue.Queue``);
+the GUI drains it from its own loop, so the feed thread never blocks.
+"""
+
+from __future__ import annotations
+import itertools, math, queue, threading
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from .backtest_engine import (
+    Strategy, IndicatorDecl, ValueNode, CompareNode, CrossNode, LogicNode, NotNode,
+    Parser, tokenize, TT,
+)
+from .incremental import IndicatorSet, BarBuilder, eval_row
+
+
+@dataclass
+class Alert:
+    id: int; ticker: str; kind: str            # 'level' | 'pct' | 'expr'
+    side: str = 'above'                        # level / pct alerts: 'above' | 'below'
+    level: float = math.nan
+    expr: str = ''
+    once: bool = True
+    note: str = ''
+    cond: Any = field(default=None, repr=False)
+
+    def describe(self) -> str:
+        if self.kind == 'expr': return f"{self.ticker}: {self.expr}"
+        return f"{self.ticker} {self.side.upper()} {self.level:,.2f}" + (f" ({self.note})" if self.note else '')
+
+
+@dataclass
+class AlertEvent:
+    alert: Alert; ticker: str; price: float; time_ms: int
+
+    @property
+    def text(self) -> str:
+        return f"{self.alert.describe()}  —  last {self.price:,.2f}"
+
+
+def parse_condition(expr: str):
+    """Compile a QuantQL condition (``RSI(7) < 30 AND CLOSE CROSSES_ABOVE SMA(50)``)."""
+    p = Parser(tokenize(expr))
+    cond = p._pcond()
+    if not p._at(TT.EOF):
+        tok = p._c()
+        raise SyntaxError(f"Unexpected '{tok.value}' after condition")
+    return cond
+
+
+def _decls(cond) -> list:
+    """Indicator params come from the expression itself, e.g. ``SMA(50)``."""
+    out = {}
+    def _walk(n):
+        if isinstance(n, ValueNode) and n.kind == 'indicator':
+            if n.name not in out or n.params: out[n.name] = n.params
+        elif isinstance(n, (CompareNode, CrossNode)): _walk(n.left); _walk(n.right)
+        elif isinstance(n, LogicNode):
+            for c in n.children: _walk(c)
+        elif isinstance(n, NotNode): _walk(n.child)
+    _walk(cond)
+    return [IndicatorDecl(k, tuple(v)) for k, v in sorted(out.items())]
+
+
+class _ExprGroup:
+    """Expression alerts on one ticker that need the same indicator set."""
+    def __init__(self, decls):
+        self.ind = IndicatorSet(Strategy(indicators=list(decls)))
+        self.prev = None
+        self.alerts: dict = {}              # id → [Alert, was_true]
+
+
+class _TickerBook:
+    __slots__ = ('above', 'below', 'pending_pct', 'bars', 'groups', 'last')
+    def __init__(self, interval):
+        self.above = []                     # [(level, id)] ascending → fire prefix
+        self.below = []                     # [(level, id)] ascending → fire suffix
+        self.pending_pct = []               # pct alerts waiting for a reference price
+        self.bars = BarBuilder(interval)
+        self.groups: dict = {}              # decl key → _ExprGroup
+        self.last = None
+
+
+class AlertEngine:
+    """
+        eng = AlertEngine()
+        eng.attach(live_store)                        # evaluated inside add_tick
+        eng.add_above('RELIANCE.NS', 3000)
+        eng.add_pct('BTC-USD', -2.5)                  # −2.5 % from the current price
+        eng.add_expr('TCS.NS', 'EMA(9) CROSSES_ABOVE SMA(21)')
+        ...
+        while not eng.events.empty(): ev = eng.events.get_nowait()
+    """
+    def __init__(self, interval='1min', on_fire: Callable = None):
+        self.interval = interval
+        self.events: queue.Queue = queue.Queue()
+        self.on_fire = on_fire
+        self._books: dict = {}
+        self._alerts: dict = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    # ── registration ───────────────────────────────────────────
+    def _book(self, ticker):
+        b = self._books.get(ticker)
+        if b is None: b = self._books[ticker] = _TickerBook(self.interval)
+        return b
+
+    def _index(self, a: Alert, book: _TickerBook):
+        insort(book.above if a.side == 'above' else book.below, (a.level, a.id))
+
+    def add_above(self, ticker: str, level: float) -> int:
+        return self._add_level(ticker, 'above', level)
+
+    def add_below(self, ticker: str, level: float) -> int:
+        return self._add_level(ticker, 'below', level)
+
+    def _add_level(self, ticker, side, level):
+        t = ticker.strip().upper()
+        with self._lock:
+            a = Alert(next(self._ids), t, 'level', side, float(level))
+            self._alerts[a.id] = a; self._index(a, self._book(t))
+        return a.id
+
+    def add_pct(self, ticker: str, pct: float, ref: float = None) -> int:
+        """Move of ``pct`` % from ``ref`` (default: the next/last tick price)."""
+        t = ticker.strip().upper()
+        with self._lock:
+            a = Alert(next(self._ids), t, 'pct', 'above' if pct >= 0 else 'below', note=f"{pct:+g}%")
+            self._alerts[a.id] = a; book = self._book(t)
+            ref = ref if ref is not None else book.last
+            if ref is None: book.pending_pct.append((a, pct))
+            else: a.level = ref * (1 + pct / 100); self._index(a, book)
+        return a.id
+
+    def add_expr(self, ticker: str, expr: str, once: bool = True) -> int:
+        """QuantQL condition on closed bars; with ``once=False`` it re-arms on every false→true edge."""
+        t = ticker.strip().upper(); cond = parse_condition(expr)
+        decls = _decls(cond)
+        key = tuple((d.name, d.params) for d in decls)
+        with self._lock:
+            a = Alert(next(self._ids), t, 'expr', expr=expr.strip(), once=once, cond=cond)
+            self._alerts[a.id] = a
+            book = self._book(t)
+            g = book.groups.get(key)
+            if g is None: g = book.groups[key] = _ExprGroup(decls)
+            g.alerts[a.id] = [a, False]
+        return a.id
+
+    def remove(self, alert_id: int):
+        with self._lock:
+            a = self._alerts.pop(alert_id, None)
+            if a is None: return
+            book = self._books.get(a.ticker)
+            if book is None: return
+            if a.kind != 'expr' and not math.isnan(a.level):
+                lst = book.above if a.side == 'above' else book.below
+                i = bisect_left(lst, (a.level, a.id))
+                if i < len(lst) and lst[i][1] == a.id: del lst[i]
+            book.pending_pct = [p for p in book.pending_pct if p[0].id != alert_id]
+            for g in book.groups.values(): g.alerts.pop(alert_id, None)
+
+    def clear(self, ticker: str = None):
+        with self._lock:
+            if ticker is None:
+                self._books.clear(); self._alerts.clear(); return
+            t = ticker.strip().upper()
+            self._books.pop(t, None)
+            self._alerts = {k: a for k, a in self._alerts.items() if a.ticker != t}
+
+    def active(self, ticker: str = None) -> list:
+        with self._lock:
+            return [a for a in self._alerts.values() if ticker is None or a.ticker == ticker.upper()]
+
+    # ── evaluation (feed thread) ───────────────────────────────
+    def attach(self, store):
+        store.subscribe(self.on_tick)
+
+    def detach(self, store):
+        store.unsubscribe(self.on_tick)
+
+    def on_tick(self, ticker: str, ts_ms, price: float):
+        book = self._books.get(ticker)
+        if book is None: return
+        fired = []
+        with self._lock:
+            book.last = price
+            if book.pending_pct:
+                for a, pct in book.pending_pct:
+                    a.level = price * (1 + pct / 100); self._index(a, book)
+                book.pending_pct = []
+            up, dn = book.above, book.below
+            if up and price >= up[0][0]:
+                k = bisect_right(up, (price, math.inf))
+                fired += [self._alerts.pop(i) for _, i in up[:k] if i in self._alerts]
+                del up[:k]
+            if dn and price <= dn[-1][0]:
+                k = bisect_left(dn, (price, -math.inf))
+                fired += [self._alerts.pop(i) for _, i in dn[k:] if i in self._alerts]
+                del dn[k:]
+            if book.groups:
+                bar = book.bars.add(ts_ms, price)
+                if bar is not None: fired += self._on_bar(book, bar)
+        for a in fired: self._emit(a, ticker, price, ts_ms)
+
+    def _on_bar(self, book, bar):
+        fired = []
+        for key, g in list(book.groups.items()):
+            row = g.ind.update_bar(bar)
+            for aid, slot in list(g.alerts.items()):
+                a, was = slot
+                now = eval_row(a.cond, row, g.prev)
+                slot[1] = now
+                if now and not was:
+                    fired.append(a)
+                    if a.once:
+                        del g.alerts[aid]; self._alerts.pop(aid, None)
+            g.prev = row
+            if not g.alerts: del book.groups[key]
+        return fired
+
+    def _emit(self, a, ticker, price, ts_ms):
+        ev = AlertEvent(a, ticker, price, int(ts_ms))
+        self.events.put_nowait(ev)
+        if self.on_fire:
+            try: self.on_fire(ev)
+            except Exception as exc: print(f"[WARN] alert callback: {exc}")
+
+    def drain(self, limit: int = 100) -> list:
+        """Non-blocking: up to ``limit`` pending events."""
+        out = []
+        while len(out) < limit:
+            try: out.append(self.events.get_nowait())
+            except queue.Empty: break
+        return out
@@ -7,7 +7,7 @@ Added:  Pre-plot data before simulation, visual trade book,
 """
 
 from __future__ import annotations
-import re, math, os, threading, csv
+import re, math, os, csv, sys, copy
 from enum import Enum, auto
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -76,6 +76,9 @@ except ImportError:
             for s in ax.spines.values(): s.set_color(C['border'])
             if title: ax.set_title(title,color=C['white'],fontsize=fontsize,fontweight='bold',pad=5)
             if ylabel: ax.set_ylabel(ylabel,color=C['muted'],fontsize=7)
+from .data_service import get_service
+from .metrics import BacktestMetrics, trade_metrics
+from .lod import LODView, draw_bars, draw_candles, fill_between, minmax_index, scatter
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -274,6 +277,48 @@ class Parser:
         raise SyntaxError(f"Line {self._c().line}: expected value, got {self._c().type.name}")
 
 
+# ── unparser: AST → QuantQL source (compile_strategy(unparse_strategy(s)) == s) ──
+def _num_src(v):
+    if v<0: raise ValueError(f"QuantQL has no negative literals: {v}")
+    return str(int(v)) if float(v).is_integer() else f"{v:.10f}".rstrip('0')
+
+def unparse_value(n:ValueNode)->str:
+    if n.kind=='number': return _num_src(n.number)
+    if not n.params: return n.name
+    return f"{n.name}({', '.join(_num_src(p) for p in n.params)})"
+
+def unparse_cond(n)->str:
+    """Condition → source.  AND / OR share one precedence level in the parser, so nested
+    logic is always parenthesised."""
+    if isinstance(n,CompareNode): return f"{unparse_value(n.left)} {n.op} {unparse_value(n.right)}"
+    if isinstance(n,CrossNode):
+        return f"{unparse_value(n.left)} CROSSES_{n.direction.upper()} {unparse_value(n.right)}"
+    if isinstance(n,LogicNode):
+        wrap=lambda c: f"({unparse_cond(c)})" if isinstance(c,LogicNode) else unparse_cond(c)
+        return f" {n.op} ".join(wrap(c) for c in n.children)
+    if isinstance(n,NotNode): return f"NOT ({unparse_cond(n.child)})"
+    raise TypeError(f"not a condition node: {n!r}")
+
+def unparse_strategy(s:Strategy)->str:
+    d=Strategy(); pct=lambda v: f"{_num_src(v)}%"
+    out=[f'BACKTEST "{s.name}"']
+    if s.market!=d.market: out.append(f"MARKET {s.market}")
+    if s.ticker: out.append(f"TICKER {s.ticker}")
+    out.append(f"PERIOD {s.period_str}")
+    out.append("")
+    out+=[f"USE {unparse_value(ValueNode('indicator',name=i.name,params=i.params))}" for i in s.indicators]
+    if s.indicators: out.append("")
+    if s.buy_cond is not None:  out.append(f"BUY  WHEN {unparse_cond(s.buy_cond)}")
+    if s.sell_cond is not None: out.append(f"SELL WHEN {unparse_cond(s.sell_cond)}")
+    out.append("")
+    out.append(f"CAPITAL {_num_src(s.capital)}")
+    for kw,f in (('POSITION_SIZE','position_pct'),('STOP_LOSS','stop_loss_pct'),
+                 ('TAKE_PROFIT','take_profit_pct'),('COMMISSION','commission_pct'),
+                 ('SLIPPAGE','slippage_pct')):
+        if getattr(s,f)!=getattr(d,f) or kw=='COMMISSION': out.append(f"{kw} {pct(getattr(s,f))}")
+    return "\n".join(out)
+
+
 # ═══════════════════════════════════════════════════════════════════
 # 4. INDICATOR COMPUTE
 # ═══════════════════════════════════════════════════════════════════
@@ -314,8 +359,9 @@ _ALIAS = {
     'PLUS_DI':'ADX','MINUS_DI':'ADX','SAR_TREND':'SAR',
 }
 
-def compute_indicators(data, strat):
-    comp={}; needed=set()
+def _needed_indicators(strat):
+    """Registry key → params for every indicator the strategy declares or references."""
+    needed=set()
     for d in strat.indicators: needed.add(d.name)
     def _walk(n):
         if n is None: return
@@ -333,7 +379,11 @@ def compute_indicators(data, strat):
             for dd in strat.indicators:
                 if dd.name in (key,nm): pr=dd.params; break
             todo[key]=pr
-    for key,pr in todo.items():
+    return todo
+
+def compute_indicators(data, strat):
+    comp={}
+    for key,pr in _needed_indicators(strat).items():
         try: comp.update(_IND_REG[key](data,*pr))
         except Exception as e: print(f"[WARN] {key}: {e}")
     return comp
@@ -371,6 +421,51 @@ def _ec(n,i,d,ind):
     if isinstance(n,NotNode): return not _ec(n.child,i,d,ind)
     return False
 
+# ── vectorised: one pass over all bars (and any number of parameter columns) ──
+_PRICE_COL={'CLOSE':'Close','OPEN':'Open','HIGH':'High','LOW':'Low','VOLUME':'Volume'}
+_OPS={'>':np.greater,'<':np.less,'>=':np.greater_equal,'<=':np.less_equal,
+      '==':np.equal,'!=':np.not_equal}
+
+def _values(d,ind):
+    """ValueNode → float array over the bars of ``d`` (a scalar for numbers), for ``_mask``."""
+    cache={}
+    def val(n):
+        if n.kind=='number': return n.number
+        key=(n.kind,n.name)
+        if key not in cache:
+            s=d[_PRICE_COL.get(n.name,n.name)] if n.kind=='price' else ind.get(n.name)
+            cache[key]=np.asarray(s,float) if s is not None else np.full(len(d),np.nan)
+        return cache[key]
+    return val
+
+def _prev(a):
+    """Value one bar earlier (NaN at bar 0); constants (scalar / leading axis 1) are unchanged."""
+    a=np.asarray(a)
+    if a.ndim==0 or a.shape[0]==1: return a
+    p=np.empty_like(a); p[:1]=np.nan; p[1:]=a[:-1]; return p
+
+def _mask_node(n,val):
+    if n is None: return np.False_
+    if isinstance(n,CompareNode):
+        f=_OPS.get(n.op)
+        if f is None: return np.False_
+        l,r=val(n.left),val(n.right); m=f(l,r)
+        return m&~np.isnan(l)&~np.isnan(r) if n.op=='!=' else m
+    if isinstance(n,CrossNode):
+        l,r=val(n.left),val(n.right); lp,rp=_prev(l),_prev(r)
+        return (lp<=rp)&(l>r) if n.direction=='above' else (lp>=rp)&(l<r)
+    if isinstance(n,LogicNode):
+        ms=[_mask_node(c,val) for c in n.children]; m=ms[0]
+        for x in ms[1:]: m=(m&x) if n.op=='AND' else (m|x)
+        return m
+    if isinstance(n,NotNode): return ~np.asarray(_mask_node(n.child,val))
+    return np.False_
+
+def _mask(n,val,shape):
+    """``_ec`` at every bar at once → bool array of ``shape`` (bars first)."""
+    with np.errstate(invalid='ignore'):
+        return np.broadcast_to(_mask_node(n,val),shape)
+
 
 # ═══════════════════════════════════════════════════════════════════
 # 6. TRADE
@@ -382,6 +477,85 @@ class Trade:
     pnl:float=0; pnl_pct:float=0; commission:float=0
 
 
+class TradeBook:
+    """
+    Columnar trade log behind the trade-book table: one numpy array per
+    column, built once per result.  Sorting and filtering only rebuild
+    ``order`` (positions into the columns); rows are formatted on demand,
+    so only what is on screen is ever turned into strings.
+    """
+    COLS = ('#','entry_date','exit_date','entry_px','exit_px','shares','pnl','pnl_pct','comm','reason')
+    FILTERS = ('All', 'Wins', 'Losses')
+
+    def __init__(self, trades, index=None, currency='$'):
+        n = len(trades); self.n = n; self.ccy = currency
+        num = lambda a: np.fromiter((getattr(t, a) for t in trades), float, n)
+        day = lambda a: pd.to_datetime([getattr(t, a) for t in trades], errors='coerce').values
+        self.reasons, codes = np.unique(np.array([t.exit_reason or '' for t in trades], dtype=object),
+                                        return_inverse=True)
+        self.cols = {'#': np.arange(1, n + 1), 'entry_date': day('entry_date'), 'exit_date': day('exit_date'),
+                     'entry_px': num('entry_price'), 'exit_px': num('exit_price'), 'shares': num('shares'),
+                     'pnl': num('pnl'), 'pnl_pct': num('pnl_pct'), 'comm': num('commission'),
+                     'reason': codes.reshape(-1)}
+        # bar positions of entry / exit on the chart's x axis
+        if index is not None and len(index):
+            idx = pd.DatetimeIndex(index).values; last = len(idx) - 1
+            self.entry_i = np.clip(idx.searchsorted(self.cols['entry_date']), 0, last)
+            self.exit_i = np.clip(idx.searchsorted(self.cols['exit_date']), 0, last)
+        else:
+            self.entry_i = self.exit_i = np.zeros(n, int)
+        self.sort_key = (None, False); self.filter = 'All'
+        self.order = np.arange(n)
+
+    def __len__(self):
+        return len(self.order)
+
+    @property
+    def net(self):
+        return float(self.cols['pnl'][self.order].sum())
+
+    def set_view(self, sort_key=None, filter=None):
+        """Re-sort / re-filter by recomputing ``order``; the columns are never touched."""
+        if sort_key is not None: self.sort_key = sort_key
+        if filter is not None: self.filter = filter
+        pnl = self.cols['pnl']; f = self.filter
+        if f == 'Wins':     idx = np.flatnonzero(pnl >= 0)
+        elif f == 'Losses': idx = np.flatnonzero(pnl < 0)
+        elif f in self.reasons: idx = np.flatnonzero(self.cols['reason'] == self.reasons.tolist().index(f))
+        else:               idx = np.arange(self.n)
+        col, desc = self.sort_key
+        if col is not None:
+            key = self.cols[col][idx]
+            if key.dtype.kind == 'M': key = key.view('i8')
+            o = np.argsort(key, kind='stable')
+            idx = idx[o[::-1] if desc else o]
+        self.order = idx
+        return self.order
+
+    def position(self, k):
+        """Row of trade ``k`` in the current view, or -1 when filtered out."""
+        hit = np.flatnonzero(self.order == k)
+        return int(hit[0]) if len(hit) else -1
+
+    def at_bar(self, i):
+        """The trade open at bar ``i`` (entry ≤ i ≤ exit), or the nearest one."""
+        if not self.n: return -1
+        k = int(np.clip(self.entry_i.searchsorted(i, 'right') - 1, 0, self.n - 1))
+        if i > self.exit_i[k] and k + 1 < self.n and self.entry_i[k + 1] - i < i - self.exit_i[k]: k += 1
+        return k
+
+    def row(self, k):
+        c = self.cols; ccy = self.ccy
+        d = lambda v: '' if np.isnat(v) else str(v.astype('datetime64[D]'))
+        return (str(c['#'][k]), d(c['entry_date'][k]), d(c['exit_date'][k]),
+                f"{ccy}{c['entry_px'][k]:,.2f}", f"{ccy}{c['exit_px'][k]:,.2f}",
+                str(int(c['shares'][k])), f"{ccy}{c['pnl'][k]:+,.2f}", f"{c['pnl_pct'][k]:+.1f}%",
+                f"{ccy}{c['comm'][k]:,.2f}", str(self.reasons[c['reason'][k]]))
+
+    def tag(self, k):
+        return 'win' if self.cols['pnl'][k] >= 0 else 'loss'
+
+
 # ═══════════════════════════════════════════════════════════════════
 # 7. BACKTEST ENGINE
 # ═══════════════════════════════════════════════════════════════════
@@ -389,63 +563,218 @@ class Trade:
 class BacktestResult:
     strategy:Strategy; trades:list; equity_curve:pd.Series
     buy_signals:list; sell_signals:list; indicators:dict
-    data:pd.DataFrame; metrics:dict; currency:str='$'; exchange:str='US'
+    data:pd.DataFrame; metrics:BacktestMetrics; currency:str='$'; exchange:str='US'
     yf_ticker:str=''
 
-class BacktestEngine:
-    def __init__(self, strat): self.strat=strat
 
-    def run(self)->BacktestResult:
+# ── result retention (batch runs) ──────────────────────────
+RETAIN = ('metrics', 'trades', 'equity', 'full')
+EQUITY_POINTS = 128                           # min/max buckets kept by retain='equity'
+EXIT_REASONS = ('', 'signal', 'stop_loss', 'take_profit', 'end_of_data')
+TRADE_DTYPE = np.dtype([('entry_date','M8[s]'),('exit_date','M8[s]'),('entry_price','f8'),
+                        ('exit_price','f8'),('shares','f8'),('pnl','f8'),('pnl_pct','f8'),
+                        ('commission','f8'),('exit_reason','u1')])
+
+def _naive_s(dates):
+    idx=pd.DatetimeIndex(pd.to_datetime(list(dates),errors='coerce'))
+    if idx.tz is not None: idx=idx.tz_localize(None)
+    return idx.values.astype('M8[s]')
+
+def compact_trades(trades)->np.ndarray:
+    """List of ``Trade`` → ``TRADE_DTYPE`` structured array (65 bytes a trade, dates tz-naive)."""
+    a=np.zeros(len(trades),TRADE_DTYPE)
+    if not len(trades): return a
+    a['entry_date']=_naive_s(t.entry_date for t in trades)
+    a['exit_date']=_naive_s(t.exit_date for t in trades)
+    for c in ('entry_price','exit_price','shares','pnl','pnl_pct','commission'):
+        a[c]=[getattr(t,c) for t in trades]
+    a['exit_reason']=[EXIT_REASONS.index(t.exit_reason) if t.exit_reason in EXIT_REASONS else 0
+                      for t in trades]
+    return a
+
+def expand_trades(a:np.ndarray)->list:
+    """Inverse of ``compact_trades``."""
+    ts=lambda v: None if np.isnat(v) else pd.Timestamp(v)
+    return [Trade(ts(r['entry_date']),float(r['entry_price']),float(r['shares']),ts(r['exit_date']),
+                  float(r['exit_price']),EXIT_REASONS[r['exit_reason']],float(r['pnl']),
+                  float(r['pnl_pct']),float(r['commission'])) for r in a]
+
+class SlimResult:
+    """
+    What a batch run keeps of a ``BacktestResult``: the metrics record plus,
+    depending on ``retain``, compact trades or a min/max-downsampled equity
+    curve.  No price data or indicator series, so a run costs a few KB.
+    """
+    __slots__=('strategy','metrics','trades','equity_dates','equity','currency','exchange',
+               'yf_ticker','retain')
+
+    def __init__(self, r:BacktestResult, retain:str, equity_points:int=EQUITY_POINTS):
+        self.strategy=r.strategy; self.metrics=r.metrics; self.retain=retain
+        self.currency=r.currency; self.exchange=r.exchange; self.yf_ticker=r.yf_ticker
+        self.trades=compact_trades(r.trades) if retain=='trades' else None
+        self.equity_dates=self.equity=None
+        if retain=='equity':
+            eq=r.equity_curve.to_numpy(float)
+            idx=np.union1d(minmax_index(eq,equity_points),[0,len(eq)-1]) if len(eq) else np.arange(0)
+            self.equity=eq[idx]; self.equity_dates=_naive_s(r.equity_curve.index[idx])
+
+    @property
+    def equity_curve(self):
+        if self.equity is None: return None
+        return pd.Series(self.equity,index=pd.DatetimeIndex(self.equity_dates))
+
+    def trade_list(self)->list:
+        return expand_trades(self.trades) if self.trades is not None else []
+
+    @property
+    def nbytes(self)->int:
+        """Approximate retained size (the strategy AST is shared, not counted)."""
+        arr=sum(a.nbytes for a in (self.trades,self.equity,self.equity_dates) if a is not None)
+        return arr+sys.getsizeof(self.metrics.__dict__)+24*len(self.metrics.__dict__)+64*len(self.__slots__)
+
+    def __repr__(self):
+        return (f"SlimResult({self.yf_ticker!r}, retain={self.retain!r}, "
+                f"trades={self.metrics.total_trades}, sharpe={self.metrics.sharpe:.2f})")
+
+def retain_result(r:BacktestResult, retain:str='full', equity_points:int=EQUITY_POINTS):
+    """``r`` itself for ``'full'``, otherwise a ``SlimResult`` keeping only what ``retain`` names."""
+    if retain not in RETAIN: raise ValueError(f"retain must be one of {RETAIN}, got {retain!r}")
+    return r if retain=='full' else SlimResult(r,retain,equity_points)
+
+@dataclass
+class EngineState:
+    """
+    Terminal state of a run, taken before the end-of-data close: cash, the
+    open position, closed trades, signal bars, raw equity and the bars seen
+    (the indicators' state: they are recomputed over them, so continuing
+    stays bit-identical to a full run).  Picklable, for nightly refreshes.
+    """
+    strategy:Strategy; data:pd.DataFrame; cap:float; pos:Any; trades:list
+    buys:list; sells:list; eq:np.ndarray; warmup:int
+    yf_ticker:str=''; currency:str='$'; exchange:str='US'
+
+    @property
+    def last(self): return self.data.index[-1]
+
+    def copy(self)->"EngineState":
+        return EngineState(self.strategy,self.data,self.cap,copy.copy(self.pos),list(self.trades),
+                           list(self.buys),list(self.sells),self.eq,self.warmup,
+                           self.yf_ticker,self.currency,self.exchange)
+
+    def save(self, path:str):
+        tmp=path+'.tmp'; pd.to_pickle(self,tmp); os.replace(tmp,path)
+
+    @staticmethod
+    def load(path:str)->"EngineState":
+        return pd.read_pickle(path)
+
+class BacktestEngine:
+    """``run`` leaves its terminal ``EngineState`` in ``self.state``; ``extend(state)`` continues it over new bars."""
+    def __init__(self, strat, fetcher=None, retain:str='full', equity_points:int=EQUITY_POINTS):
+        self.strat=strat; self.fetch=fetcher or fetch_data   # fetcher(ticker, start, end) → DataFrame
+        if retain not in RETAIN: raise ValueError(f"retain must be one of {RETAIN}, got {retain!r}")
+        self.retain=retain; self.equity_points=equity_points; self.state=None
+
+    def fetch_data(self):
+        """(data, yf_ticker, currency, exchange) for the strategy's ticker and period."""
         s=self.strat
         yf_t,ccy,exch,disp=normalize_ticker(s.ticker,s.market)
         end=datetime.now(); start=end-timedelta(days=s.period_days)
-        data=fetch_data(yf_t,start.strftime('%Y-%m-%d'),end.strftime('%Y-%m-%d'))
+        data=self.fetch(yf_t,start.strftime('%Y-%m-%d'),end.strftime('%Y-%m-%d'))
         if data is None or data.empty:
             # try BSE fallback
             if s.market in ('AUTO','NSE'):
                 alt = s.ticker.upper()+'.BO'
-                data=fetch_data(alt,start.strftime('%Y-%m-%d'),end.strftime('%Y-%m-%d'))
+                data=self.fetch(alt,start.strftime('%Y-%m-%d'),end.strftime('%Y-%m-%d'))
                 if data is not None and not data.empty:
                     yf_t=alt; exch='BSE'; ccy='₹'
             if data is None or data.empty:
                 raise RuntimeError(f"No data for {yf_t}. Check ticker/market.")
+        return data,yf_t,ccy,exch
+
+    def run(self, data:pd.DataFrame=None)->BacktestResult:
+        """Simulate; ``data`` (OHLCV) skips the fetch, e.g. for frames already cached by a sweep."""
+        s=self.strat
+        if data is None: data,yf_t,ccy,exch=self.fetch_data()
+        else:            yf_t,ccy,exch,_=normalize_ticker(s.ticker,s.market)
+        st=EngineState(s,data,s.capital,None,[],[],[],np.full(len(data),s.capital,dtype=float),
+                       min(60,len(data)//4),yf_t,ccy,exch)
+        return self._simulate(st,data,0)
+
+    def extend(self, state:EngineState, new_data:pd.DataFrame=None)->BacktestResult:
+        """
+        Continue ``state`` over the bars after ``state.last``: ``new_data``,
+        or fetched from ``state.last`` to today.  Equal to ``run`` over the
+        stored bars plus the new ones; that full run is what happens when a
+        stored bar was revised or the warmup length would change.
+        """
+        s=self.strat; old=state.data
+        if state.strategy!=s: raise ValueError("state was taken for a different strategy")
+        if new_data is None:
+            new_data=self.fetch(state.yf_ticker,str(state.last)[:10],datetime.now().strftime('%Y-%m-%d'))
+            if new_data is None: new_data=old.iloc[:0]
+        new_data=new_data[list(old.columns)]
+        first=new_data.index[0] if len(new_data) else None
+        overlap=old.loc[old.index>=first] if first is not None else old.iloc[:0]
+        revised=len(overlap) and not overlap.equals(new_data.iloc[:len(overlap)])
+        data=pd.concat([old.loc[old.index<first] if revised else old,
+                        new_data if revised else new_data.loc[new_data.index>state.last]])
+        self.state=None
+        if revised or min(60,len(data)//4)!=state.warmup:
+            yf_t,ccy,exch=state.yf_ticker,state.currency,state.exchange
+            st=EngineState(s,data,s.capital,None,[],[],[],np.full(len(data),s.capital,dtype=float),
+                           min(60,len(data)//4),yf_t,ccy,exch)
+            return self._simulate(st,data,0)
+        st=state.copy(); st.data=data
+        st.eq=np.concatenate([state.eq,np.full(len(data)-len(old),s.capital,dtype=float)])
+        return self._simulate(st,data,len(old))
+
+    def _simulate(self, st:EngineState, data:pd.DataFrame, i0:int)->BacktestResult:
+        """Advance ``st`` over bars ``i0:``, keep it as ``self.state`` and build the result."""
+        s=self.strat
         ind=compute_indicators(data,s)
-        cap=s.capital; pos=None; trades=[]; eq=np.full(len(data),cap)
-        buys=[]; sells=[]
+        cap=st.cap; pos=st.pos; trades=st.trades; eq=st.eq
+        buys=st.buys; sells=st.sells
         cr=s.commission_pct/100; pf=s.position_pct/100
-        warmup=min(60,len(data)//4)
+        warmup=st.warmup
+        n=len(data); val=_values(data,ind); idx=data.index
+        close=data['Close'].to_numpy(float)
+        buy_m=_mask(s.buy_cond,val,(n,)); sell_m=_mask(s.sell_cond,val,(n,))
 
-        for i in range(len(data)):
-            price=float(data['Close'].iloc[i])
+        for i in range(i0,n):
+            price=float(close[i])
             if i>=warmup:
                 if pos is not None:
                     pnl_p=(price/pos.entry_price-1)*100
                     hit_sl=s.stop_loss_pct>0 and pnl_p<=-s.stop_loss_pct
                     hit_tp=s.take_profit_pct>0 and pnl_p>=s.take_profit_pct
-                    sig_sell=_ec(s.sell_cond,i,data,ind)
+                    sig_sell=sell_m[i]
                     if hit_sl or hit_tp or sig_sell:
                         reason='stop_loss' if hit_sl else ('take_profit' if hit_tp else 'signal')
                         cm=price*pos.shares*cr
                         gross=(price-pos.entry_price)*pos.shares
-                        pos.exit_date=data.index[i]; pos.exit_price=price
+                        pos.exit_date=idx[i]; pos.exit_price=price
                         pos.pnl=gross-cm-pos.commission
                         pos.pnl_pct=(pos.pnl/(pos.entry_price*pos.shares))*100
                         pos.exit_reason=reason; pos.commission+=cm
                         cap+=pos.entry_price*pos.shares+pos.pnl
                         trades.append(pos); sells.append(i); pos=None
                 if pos is None and i>=warmup:
-                    if _ec(s.buy_cond,i,data,ind):
+                    if buy_m[i]:
                         alloc=cap*pf; shares=int(alloc//price) if price>0 else 0
                         if shares>0:
                             cm=price*shares*cr; cap-=price*shares+cm
-                            pos=Trade(entry_date=data.index[i],entry_price=price,
+                            pos=Trade(entry_date=idx[i],entry_price=price,
                                       shares=shares,commission=cm)
                             buys.append(i)
             mtm=cap+(price*pos.shares if pos else 0)
             eq[i]=mtm
+        st.cap=cap; st.pos=pos; self.state=st
 
-        if pos is not None:
-            price=float(data['Close'].iloc[-1]); cm=price*pos.shares*cr
+        trades=list(trades); sells=list(sells); eq=eq.copy()
+        if pos is not None:                      # closed on a copy: the state keeps the position open
+            pos=copy.copy(pos)
+            price=float(close[-1]); cm=price*pos.shares*cr
             gross=(price-pos.entry_price)*pos.shares
             pos.exit_date=data.index[-1]; pos.exit_price=price
             pos.pnl=gross-cm-pos.commission; pos.exit_reason='end_of_data'
@@ -456,49 +785,40 @@ class BacktestEngine:
         eq[:warmup]=eq[warmup] if warmup<len(eq) else s.capital
         eqs=pd.Series(eq,index=data.index)
         metrics=self._metrics(trades,eqs,s)
-        return BacktestResult(s,trades,eqs,buys,sells,ind,data,metrics,ccy,exch,yf_t)
+        return retain_result(BacktestResult(s,trades,eqs,buys,sells,ind,data,metrics,
+                                            st.currency,st.exchange,st.yf_ticker),
+                             self.retain,self.equity_points)
 
     @staticmethod
-    def _metrics(trades,eq,s):
-        n=len(trades)
-        if n==0: return {'Total Trades':'0','Note':'No trades — conditions never triggered'}
-        wins=[t for t in trades if t.pnl>0]; losses=[t for t in trades if t.pnl<=0]
-        tpnl=sum(t.pnl for t in trades); tcomm=sum(t.commission for t in trades)
-        gp=sum(t.pnl for t in wins) if wins else 0
-        gl=sum(t.pnl for t in losses) if losses else 0
-        aw=np.mean([t.pnl for t in wins]) if wins else 0
-        al=np.mean([t.pnl for t in losses]) if losses else 0
-        hd=[]
-        for t in trades:
-            if t.entry_date and t.exit_date:
-                hd.append(max((pd.Timestamp(t.exit_date)-pd.Timestamp(t.entry_date)).days,1))
-        ret=eq.pct_change().dropna(); ann=252
-        tr=(eq.iloc[-1]/eq.iloc[0])-1
-        vol=ret.std()*np.sqrt(ann) if len(ret)>1 else 0
-        rf=(1+0.065)**(1/ann)-1
-        sh=((ret.mean()-rf)/ret.std()*np.sqrt(ann)) if ret.std()>0 else 0
-        cum=(1+ret).cumprod(); dd=(cum-cum.cummax())/cum.cummax(); mdd=dd.min()
-        pfac=abs(gp/gl) if gl!=0 else float('inf')
-        sw=sl_c=mw=ml=0
-        for t in trades:
-            if t.pnl>0: sw+=1;sl_c=0;mw=max(mw,sw)
-            else: sl_c+=1;sw=0;ml=max(ml,sl_c)
-        return {
-            'Total Trades':str(n),'Winners':str(len(wins)),'Losers':str(len(losses)),
-            'Win Rate':f"{len(wins)/n*100:.1f}%",'Net P&L':f"{tpnl:+,.2f}",
-            'Total Return':f"{tr*100:+.2f}%",'Gross Profit':f"{gp:+,.2f}",
-            'Gross Loss':f"{gl:+,.2f}",'Profit Factor':f"{pfac:.2f}" if pfac!=float('inf') else "∞",
-            'Avg Win':f"{aw:+,.2f}",'Avg Loss':f"{al:+,.2f}",
-            'Max Consec Wins':str(mw),'Max Consec Losses':str(ml),
-            'Avg Hold (days)':f"{np.mean(hd):.1f}" if hd else "—",
-            'Total Commission':f"{tcomm:,.2f}",
-            'Sharpe Ratio':f"{sh:.2f}",'Max Drawdown':f"{mdd*100:.2f}%",
-            'Volatility':f"{vol*100:.2f}%",
-            'Starting Capital':f"{s.capital:,.0f}",'Final Equity':f"{eq.iloc[-1]:,.2f}",
-        }
+    def _metrics(trades,eq,s)->BacktestMetrics:
+        return trade_metrics(trades,eq,s.capital)
 
 def compile_strategy(src): return Parser(tokenize(src)).parse()
-def run_backtest(src): return BacktestEngine(compile_strategy(src)).run()
+def run_incremental(src, state_path:str, fetcher=None, retain='full', max_bars:int=None):
+    """
+    Continues the ``EngineState`` saved at ``state_path`` (when it is for
+    the same strategy), fetching only the bars since its last one, and
+    saves the new state there.  The history stays anchored at the first
+    run's start bar and grows by the new bars, so after the first refresh
+    this is not what a fresh ``run_backtest`` returns (that re-anchors at
+    now - PERIOD).  Delete the state file to re-anchor, or pass
+    ``max_bars``: a state holding that many bars is dropped for a fresh
+    ``run`` over the script's PERIOD.
+    """
+    eng=BacktestEngine(compile_strategy(src),fetcher,retain)
+    st=None
+    if os.path.exists(state_path):
+        try: st=EngineState.load(state_path)
+        except Exception as e: print(f"[WARN] {state_path}: {e}")
+    if st is not None and max_bars is not None and len(st.data)>=max_bars: st=None
+    r=eng.extend(st) if st is not None and st.strategy==eng.strat else eng.run()
+    eng.state.save(state_path)
+    return r
+
+def run_backtest(src, fetcher=None, retain='full', store=None):
+    """``store`` (a ``results_store.ResultStore``) saves the run, or returns the stored one for the same script and data."""
+    if store is not None: return store.run(src, fetcher, retain=retain)
+    return BacktestEngine(compile_strategy(src), fetcher, retain).run()
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -601,6 +921,7 @@ class BacktestTab:
         self._ani_bar = 0
         self._ani_speed = 15
         self._ani_running = False
+        self._frame_end = 0
         self._build()
 
     def _build(self):
@@ -622,6 +943,12 @@ class BacktestTab:
         tk.Button(tb, text="⏹ Stop", command=self._stop_animation,
                   bg=C['bg3'], fg=C['red'], font=('Consolas',8,'bold'),
                   relief=tk.FLAT, cursor='hand2').pack(side=tk.RIGHT, padx=2, ipady=2)
+        tk.Button(tb, text="📂 Open", command=self._open_result,
+                  bg=C['bg3'], fg=C['cyan'], font=('Consolas',8,'bold'),
+                  relief=tk.FLAT, cursor='hand2').pack(side=tk.RIGHT, padx=2, ipady=2)
+        tk.Button(tb, text="🗄 Save", command=self._save_result,
+                  bg=C['bg3'], fg=C['cyan'], font=('Consolas',8,'bold'),
+                  relief=tk.FLAT, cursor='hand2').pack(side=tk.RIGHT, padx=2, ipady=2)
         tk.Button(tb, text="💾 CSV", command=self._export_csv,
                   bg=C['bg3'], fg=C['cyan'], font=('Consolas',8,'bold'),
                   relief=tk.FLAT, cursor='hand2').pack(side=tk.RIGHT, padx=2, ipady=2)
@@ -706,29 +1033,51 @@ class BacktestTab:
         self._trade_summary_var = tk.StringVar(value="")
         tk.Label(log_tb, textvariable=self._trade_summary_var, font=('Consolas',8,'bold'),
                  bg=C['bg2'], fg=C['gold']).pack(side=tk.RIGHT, padx=8)
-
-        # treeview
-        cols = ('#','entry_date','exit_date','entry_px','exit_px','shares','pnl','pnl_pct','comm','reason')
+        self._log_filter_var = tk.StringVar(value='All')
+        self._log_filter_cb = ttk.Combobox(log_tb, textvariable=self._log_filter_var,
+                                           values=TradeBook.FILTERS, width=12,
+                                           state='readonly', font=('Consolas',8))
+        self._log_filter_cb.pack(side=tk.RIGHT, padx=2)
+        self._log_filter_cb.bind('<<ComboboxSelected>>', lambda e: self._log_set_filter())
+        tk.Label(log_tb, text="SHOW", font=('Consolas',7,'bold'),
+                 bg=C['bg2'], fg=C['muted']).pack(side=tk.RIGHT)
+
+        # treeview — a fixed pool of rows ("slots") re-filled from the TradeBook
+        # view as it scrolls; the widget never holds more rows than fit on screen
+        cols = TradeBook.COLS
         self._tree = ttk.Treeview(log_outer, columns=cols, show='headings', height=8,
-                                   style='BT.Treeview')
-        hdrs = {'#':'#','entry_date':'Entry Date','exit_date':'Exit Date',
-                'entry_px':'Entry Price','exit_px':'Exit Price','shares':'Shares',
-                'pnl':'P&L','pnl_pct':'Return %','comm':'Commission','reason':'Exit Reason'}
+                                   style='BT.Treeview', selectmode='browse')
+        self._log_hdrs = {'#':'#','entry_date':'Entry Date','exit_date':'Exit Date',
+                          'entry_px':'Entry Price','exit_px':'Exit Price','shares':'Shares',
+                          'pnl':'P&L','pnl_pct':'Return %','comm':'Commission','reason':'Exit Reason'}
         widths = {'#':30,'entry_date':90,'exit_date':90,'entry_px':85,'exit_px':85,
                   'shares':55,'pnl':95,'pnl_pct':65,'comm':70,'reason':85}
         for c in cols:
-            self._tree.heading(c, text=hdrs[c])
+            self._tree.heading(c, text=self._log_hdrs[c], command=lambda c=c: self._log_sort(c))
             anc = 'center' if c=='#' else ('w' if c=='reason' else 'e')
             self._tree.column(c, width=widths[c], anchor=anc, minwidth=30)
+        self._tree.tag_configure('win', foreground=C['green'])
+        self._tree.tag_configure('loss', foreground=C['red'])
 
-        vsb = ttk.Scrollbar(log_outer, orient="vertical", command=self._tree.yview)
-        self._tree.configure(yscrollcommand=vsb.set)
+        self._log_vsb = ttk.Scrollbar(log_outer, orient="vertical", command=self._log_yview)
         self._tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(4,0), pady=(0,4))
-        vsb.pack(side=tk.RIGHT, fill=tk.Y, padx=(0,4), pady=(0,4))
+        self._log_vsb.pack(side=tk.RIGHT, fill=tk.Y, padx=(0,4), pady=(0,4))
+
+        self._book = TradeBook([])
+        self._log_slots = []; self._log_shown = []
+        self._log_top = 0; self._log_sel = None; self._trade_hl = None; self._log_rowh = 22
+        self._tree.bind('<Configure>', lambda e: self._log_resize())
+        self._tree.bind('<<TreeviewSelect>>', self._log_on_select)
+        self._tree.bind('<MouseWheel>', lambda e: self._log_scroll(-3 if e.delta > 0 else 3))
+        self._tree.bind('<Button-4>', lambda e: self._log_scroll(-3))
+        self._tree.bind('<Button-5>', lambda e: self._log_scroll(3))
+        for key, step in (('<Up>', -1), ('<Down>', 1), ('<Prior>', -10), ('<Next>', 10),
+                          ('<Home>', -10**9), ('<End>', 10**9)):
+            self._tree.bind(key, lambda e, s=step: self._log_step(s))
 
         sty = ttk.Style()
         sty.configure('BT.Treeview', background=C['bg3'], foreground=C['white'],
-                       fieldbackground=C['bg3'], font=('Consolas',8), rowheight=22)
+                       fieldbackground=C['bg3'], font=('Consolas',8), rowheight=self._log_rowh)
         sty.configure('BT.Treeview.Heading', background=C['bg2'],
                        foreground=C['accent'], font=('Consolas',8,'bold'))
         sty.map('BT.Treeview', background=[('selected', C['bg3'])])
@@ -799,16 +1148,9 @@ class BacktestTab:
         lbl = tk.Label(self._chart_frame, text="⏳  Compiling & fetching data…",
                        font=('Consolas',13,'bold'), bg=C['bg2'], fg=C['accent'])
         lbl.pack(expand=True)
-        self.parent.update()
-
-        def _bg():
-            try:
-                result = run_backtest(src)
-                self.parent.after(0, lambda: self._on_result(result))
-            except Exception as e:
-                self.parent.after(0, lambda: self._on_error(str(e)))
-
-        threading.Thread(target=_bg, daemon=True).start()
+        svc = get_service(); svc.attach_tk(self.parent)
+        svc.call(run_backtest, src, svc.fetch_sync,
+                 callback=self._on_result, errback=lambda e: self._on_error(str(e)))
 
     def _on_error(self, msg):
         for w in self._chart_frame.winfo_children(): w.destroy()
@@ -829,25 +1171,25 @@ class BacktestTab:
         self._start_animation()
 
     # ── METRICS ────────────────────────────────────────────────
-    def _update_metrics(self, metrics):
+    def _update_metrics(self, m: BacktestMetrics):
         for w in self._metrics_grid.winfo_children(): w.destroy()
         cmap = {
-            'Net P&L': lambda v: C['green'] if not v.startswith('-') else C['red'],
-            'Win Rate': lambda v: C['green'] if float(v.rstrip('%'))>=50 else C['red'],
-            'Sharpe Ratio': lambda v: C['green'] if float(v)>=1 else C['gold'] if float(v)>=0 else C['red'],
-            'Max Drawdown': lambda v: C['red'],
-            'Total Return': lambda v: C['green'] if '+' in v else C['red'],
-            'Profit Factor': lambda v: C['green'] if v=='∞' or float(v)>=1.5 else C['gold'] if float(v)>=1 else C['red'],
+            'Net P&L': lambda m: C['green'] if m.net_pnl>=0 else C['red'],
+            'Win Rate': lambda m: C['green'] if m.win_rate>=0.5 else C['red'],
+            'Sharpe Ratio': lambda m: C['green'] if m.sharpe>=1 else C['gold'] if m.sharpe>=0 else C['red'],
+            'Max Drawdown': lambda m: C['red'],
+            'Total Return': lambda m: C['green'] if m.total_return>=0 else C['red'],
+            'Profit Factor': lambda m: C['green'] if m.profit_factor>=1.5 else C['gold'] if m.profit_factor>=1 else C['red'],
         }
+        labels=m.formatted()
         order=['Total Trades','Win Rate','Net P&L','Total Return','Profit Factor',
                'Sharpe Ratio','Max Drawdown','Avg Hold (days)','Final Equity',
                'Volatility','Total Commission']
-        keys=[k for k in order if k in metrics]+[k for k in metrics if k not in order and k!='Note']
+        keys=[k for k in order if k in labels]+[k for k in labels if k not in order and k!='Note']
         for i,k in enumerate(keys):
-            v=metrics[k]; r,c0=i//3,(i%3)*2
+            v=labels[k]; r,c0=i//3,(i%3)*2
             cfn=cmap.get(k)
-            try: vc=cfn(v) if cfn else C['white']
-            except: vc=C['white']
+            vc=cfn(m) if cfn else C['white']
             tk.Label(self._metrics_grid, text=k, font=('Consolas',7),
                      bg=C['bg2'], fg=C['muted'], anchor='w'
                      ).grid(row=r, column=c0, sticky='w', padx=(2,1), pady=1)
@@ -857,26 +1199,136 @@ class BacktestTab:
 
     # ── TRADE LOG ──────────────────────────────────────────────
     def _update_trade_log(self, r):
-        for item in self._tree.get_children(): self._tree.delete(item)
-        ccy = r.currency
-        total_pnl = 0
-        for idx, t in enumerate(r.trades, 1):
-            ed = t.entry_date.strftime('%Y-%m-%d') if hasattr(t.entry_date,'strftime') else str(t.entry_date)
-            xd = t.exit_date.strftime('%Y-%m-%d') if hasattr(t.exit_date,'strftime') else str(t.exit_date)
-            tag = 'win' if t.pnl>=0 else 'loss'
-            total_pnl += t.pnl
-            self._tree.insert('', 'end', values=(
-                str(idx), ed, xd,
-                f"{ccy}{t.entry_price:,.2f}", f"{ccy}{t.exit_price:,.2f}",
-                str(int(t.shares)),
-                f"{ccy}{t.pnl:+,.2f}", f"{t.pnl_pct:+.1f}%",
-                f"{ccy}{t.commission:,.2f}", t.exit_reason
-            ), tags=(tag,))
-        self._tree.tag_configure('win', foreground=C['green'])
-        self._tree.tag_configure('loss', foreground=C['red'])
-        self._trade_count_var.set(f"{len(r.trades)} trades")
-        clr = C['green'] if total_pnl >= 0 else C['red']
-        self._trade_summary_var.set(f"Net: {ccy}{total_pnl:+,.2f}")
+        self._book = TradeBook(r.trades, r.data.index, r.currency)
+        self._log_filter_cb.configure(values=TradeBook.FILTERS + tuple(self._book.reasons))
+        self._log_filter_var.set('All')
+        for c in TradeBook.COLS: self._tree.heading(c, text=self._log_hdrs[c])
+        self._log_top = 0; self._log_sel = None
+        self._log_shown = [None] * len(self._log_slots)
+        self._log_summary(); self._log_render()
+
+    def _log_summary(self):
+        b = self._book; n = len(b)
+        self._trade_count_var.set(f"{n} trades" if n == b.n else f"{n} / {b.n} trades")
+        self._trade_summary_var.set(f"Net: {b.ccy}{b.net:+,.2f}" if b.n else "")
+
+    def _log_resize(self):
+        """Keep exactly as many slot rows as fit in the widget."""
+        h = self._tree.winfo_height()
+        n = max(1, h // self._log_rowh - 1) if h > 1 else int(self._tree.cget('height'))
+        while len(self._log_slots) < n:
+            self._log_slots.append(self._tree.insert('', 'end', values=())); self._log_shown.append(None)
+        while len(self._log_slots) > n:
+            self._tree.delete(self._log_slots.pop()); self._log_shown.pop()
+        self._log_render()
+
+    def _log_render(self):
+        """Fill the slots from the visible window of the view; unchanged slots are not touched."""
+        b = self._book; n = len(self._log_slots); N = len(b)
+        self._log_top = top = max(0, min(self._log_top, N - n))
+        ks = b.order[top:top + n].tolist()
+        sel = None
+        for i, slot in enumerate(self._log_slots):
+            k = ks[i] if i < len(ks) else None
+            if k != self._log_shown[i]:
+                if k is None: self._tree.item(slot, values=(), tags=())
+                else:         self._tree.item(slot, values=b.row(k), tags=(b.tag(k),))
+                self._log_shown[i] = k
+            if k is not None and k == self._log_sel: sel = slot
+        cur = self._tree.selection()
+        if sel is None:
+            if cur: self._tree.selection_remove(*cur)
+        elif tuple(cur) != (sel,):
+            self._tree.selection_set(sel)
+        if N: self._log_vsb.set(top / N, (top + len(ks)) / N)
+        else: self._log_vsb.set(0, 1)
+
+    def _log_yview(self, *args):
+        if args[0] == 'moveto':
+            self._log_top = int(round(float(args[1]) * len(self._book)))
+        elif args[0] == 'scroll':
+            self._log_top += int(args[1]) * (len(self._log_slots) if args[2] == 'pages' else 1)
+        self._log_render()
+
+    def _log_scroll(self, rows):
+        self._log_top += rows; self._log_render()
+        return 'break'
+
+    def _log_step(self, step):
+        """Arrow / page keys move the selection through the whole view, not just the slots."""
+        b = self._book; N = len(b)
+        if N:
+            pos = b.position(self._log_sel) if self._log_sel is not None else -1
+            pos = min(max(pos + step if pos >= 0 else 0, 0), N - 1)
+            k = int(b.order[pos]); self._log_reveal(k, pos); self._jump_to_trade(k)
+        return 'break'
+
+    def _log_reveal(self, k, pos=None):
+        """Select trade ``k`` and scroll it into the window."""
+        pos = self._book.position(k) if pos is None else pos
+        if pos < 0: return
+        n = len(self._log_slots)
+        if pos < self._log_top: self._log_top = pos
+        elif pos >= self._log_top + n: self._log_top = pos - n + 1
+        self._log_sel = k; self._log_render()
+
+    def _log_on_select(self, event=None):
+        sel = self._tree.selection()
+        if not sel or sel[0] not in self._log_slots: return
+        k = self._log_shown[self._log_slots.index(sel[0])]
+        if k is None or k == self._log_sel: return     # echo of our own selection_set
+        self._log_sel = k; self._jump_to_trade(k)
+
+    def _log_sort(self, col):
+        b = self._book; cur, rev = b.sort_key
+        key = (col, not rev if cur == col else col in ('shares', 'pnl', 'pnl_pct', 'comm'))
+        for c in TradeBook.COLS:
+            arrow = (' ▼' if key[1] else ' ▲') if c == col else ''
+            self._tree.heading(c, text=self._log_hdrs[c] + arrow)
+        b.set_view(sort_key=key); self._log_top = 0; self._log_render()
+
+    def _log_set_filter(self):
+        self._book.set_view(filter=self._log_filter_var.get())
+        self._log_top = 0; self._log_summary(); self._log_render()
+
+    def _jump_to_trade(self, k):
+        """Zoom all chart panels onto trade ``k`` and shade its holding period."""
+        r = self.result; b = self._book
+        if r is None or getattr(self, '_ax_price', None) is None or not 0 <= k < b.n: return
+        n = len(r.data)
+        if self._frame_end < n:                  # still animating: finish the run first
+            self._stop_animation(); self._draw_frame(n); self._prog_var.set(n)
+        i0, i1 = int(b.entry_i[k]), int(b.exit_i[k])
+        pad = max(20, (i1 - i0) * 1.5)
+        x0, x1 = max(-0.5, i0 - pad), min(n - 0.5, i1 + pad)
+        for ax in (self._ax_price, self._ax_equity, self._ax_sub):
+            if ax is not None: ax.set_xlim(x0, x1)
+        lo, hi = int(max(x0, 0)), int(x1) + 1
+        d = r.data.iloc[lo:hi]; ylo, yhi = d['Low'].min(), d['High'].max(); yp = (yhi - ylo) * 0.06
+        self._ax_price.set_ylim(ylo - yp, yhi + yp * 4)
+        eq = r.equity_curve.values[lo:hi]; ep = (eq.max() - eq.min()) * 0.1 or abs(eq.max()) * 0.01 or 1
+        self._ax_equity.set_ylim(eq.min() - ep, eq.max() + ep)
+        tks = np.unique(np.linspace(lo, hi - 1, 8).astype(int))
+        self._ax_price.set_xticks(tks)
+        if hasattr(r.data.index[0], 'strftime'):
+            self._ax_price.set_xticklabels([r.data.index[i].strftime('%d %b %y') for i in tks],
+                                           rotation=45, ha='right', color=C['muted'], fontsize=6)
+        if self._trade_hl is not None and self._trade_hl.axes is not None: self._trade_hl.remove()
+        clr = C['green'] if b.cols['pnl'][k] >= 0 else C['red']
+        self._trade_hl = self._ax_price.axvspan(i0 - 0.5, i1 + 0.5, color=clr, alpha=0.12, lw=0, zorder=0)
+        row = b.row(k)
+        self._sim_status.set(f"Trade #{row[0]}  {row[1]} → {row[2]}  {row[6]} ({row[7]})  {row[9]}")
+        try: self._canvas.draw_idle()
+        except: pass
+
+    def _on_chart_click(self, event):
+        """Double-click on the price chart selects the trade at that bar in the trade book."""
+        if not event.dblclick or event.inaxes is not self._ax_price or event.xdata is None: return
+        k = self._book.at_bar(int(round(event.xdata)))
+        if k < 0: return
+        if self._book.position(k) < 0:
+            self._log_filter_var.set('All'); self._log_set_filter()
+        self._log_reveal(k); self._jump_to_trade(k)
 
     # ── ANIMATED SIMULATION ────────────────────────────────────
     def _start_animation(self):
@@ -900,6 +1352,7 @@ class BacktestTab:
 
         canvas = FigureCanvasTkAgg(self._fig, self._chart_frame)
         canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        canvas.mpl_connect('button_press_event', self._on_chart_click)
         self._canvas = canvas
 
         # toolbar
@@ -961,20 +1414,16 @@ class BacktestTab:
     def _draw_frame(self, bar_end):
         r = self.result; data = r.data; ccy = r.currency; s = r.strategy
         if bar_end < 1: return
+        self._frame_end = bar_end
         d = data.iloc[:bar_end]
         n_total = len(data)
 
         # ═══ PRICE CHART ══════════════════════════════════════
         ax = self._ax_price; ax.clear(); style_ax(ax)
+        lod = LODView(ax); ax.set_xlim(-0.5, n_total - 0.5)
         x = np.arange(len(d))
-        op=d['Open'].values; cl=d['Close'].values
-        hi=d['High'].values; lo=d['Low'].values
-        bull = cl >= op; w = 0.6
-        ax.vlines(x, lo, hi, color=C['muted'], linewidth=0.5, alpha=0.6)
-        body = np.abs(cl-op); body = np.where(body==0, (hi-lo)*0.01, body)
-        bot = np.minimum(op, cl)
-        if bull.any(): ax.bar(x[bull], body[bull], w, bottom=bot[bull], color=C['green'], edgecolor='none', alpha=0.9)
-        if (~bull).any(): ax.bar(x[~bull], body[~bull], w, bottom=bot[~bull], color=C['red'], edgecolor='none', alpha=0.9)
+        draw_candles(ax, d['Open'].values, d['High'].values, d['Low'].values, d['Close'].values,
+                     width=0.6, up=C['green'], down=C['red'], wick=C['muted'])
 
         # overlay indicators (MAs, BB, SAR)
         overlay_skip = {'RSI','MACD','SIGNAL','HISTOGRAM','STOCH_K','STOCH_D',
@@ -987,27 +1436,32 @@ class BacktestTab:
             vals = series.iloc[:bar_end].values
             clr = ma_colors.get(nm, C['muted'])
             ls = '--' if 'BB' in nm or nm in ('SMA','EMA','DEMA','TEMA') else '-.'
-            ax.plot(x, vals, lw=0.9, alpha=0.7, linestyle=ls, color=clr, label=nm)
+            lod.track(ax.plot(x, vals, lw=0.9, alpha=0.7, linestyle=ls, color=clr, label=nm)[0])
         # BB fill
         if 'BB_UPPER' in r.indicators and 'BB_LOWER' in r.indicators:
-            ax.fill_between(x,
-                            r.indicators['BB_UPPER'].iloc[:bar_end].values,
-                            r.indicators['BB_LOWER'].iloc[:bar_end].values,
-                            alpha=0.05, color=C['gold'])
-
-        # buy/sell markers with price labels
-        for bi in r.buy_signals:
-            if bi < bar_end:
-                ax.annotate(f'▲ BUY\n{ccy}{d["Close"].iloc[bi]:,.0f}',
-                            xy=(bi, d['Low'].iloc[bi]), fontsize=6,
+            fill_between(ax, x,
+                         r.indicators['BB_UPPER'].iloc[:bar_end].values,
+                         r.indicators['BB_LOWER'].iloc[:bar_end].values,
+                         alpha=0.05, color=C['gold'])
+
+        # buy/sell markers — price labels while they stay legible, plain markers beyond that
+        buys  = np.array([i for i in r.buy_signals if i < bar_end], dtype=int)
+        sells = np.array([min(i, len(d)-1) for i in r.sell_signals if i < bar_end], dtype=int)
+        cl, lo, hi = d['Close'].values, d['Low'].values, d['High'].values
+        if len(buys) + len(sells) <= 60:
+            for bi in buys:
+                ax.annotate(f'▲ BUY\n{ccy}{cl[bi]:,.0f}',
+                            xy=(bi, lo[bi]), fontsize=6,
                             color=C['green'], ha='center', va='top', fontweight='bold',
                             fontfamily='Consolas')
-        for si in r.sell_signals:
-            if si < bar_end:
-                ax.annotate(f'▼ SELL\n{ccy}{data["Close"].iloc[si]:,.0f}',
-                            xy=(si, d['High'].iloc[min(si, len(d)-1)]),
+            for si in sells:
+                ax.annotate(f'▼ SELL\n{ccy}{cl[si]:,.0f}',
+                            xy=(si, hi[si]),
                             fontsize=6, color=C['red'], ha='center', va='bottom',
                             fontweight='bold', fontfamily='Consolas')
+        else:
+            scatter(ax, buys, lo[buys], marker='^', s=16, color=C['green'], zorder=6)
+            scatter(ax, sells, hi[sells], marker='v', s=16, color=C['red'], zorder=6)
 
         # axes
         ax.set_xlim(-0.5, n_total - 0.5)
@@ -1030,12 +1484,13 @@ class BacktestTab:
 
         # ═══ EQUITY CURVE ═════════════════════════════════════
         ax2 = self._ax_equity; ax2.clear(); style_ax(ax2)
+        lod2 = LODView(ax2); ax2.set_xlim(-0.5, n_total-0.5)
         eq = r.equity_curve.iloc[:bar_end]; eq_x = np.arange(len(eq))
-        ax2.fill_between(eq_x, s.capital, eq.values,
-                         where=eq.values>=s.capital, alpha=0.25, color=C['green'])
-        ax2.fill_between(eq_x, s.capital, eq.values,
-                         where=eq.values<s.capital, alpha=0.25, color=C['red'])
-        ax2.plot(eq_x, eq.values, color=C['accent'], lw=1.5)
+        fill_between(ax2, eq_x, s.capital, eq.values,
+                     where=eq.values>=s.capital, alpha=0.25, color=C['green'])
+        fill_between(ax2, eq_x, s.capital, eq.values,
+                     where=eq.values<s.capital, alpha=0.25, color=C['red'])
+        lod2.track(ax2.plot(eq_x, eq.values, color=C['accent'], lw=1.5)[0], method='lttb')
         ax2.axhline(s.capital, color=C['muted'], lw=0.7, linestyle='--', alpha=0.5)
         # current equity label
         cur_eq = eq.values[-1]
@@ -1053,6 +1508,7 @@ class BacktestTab:
         # ═══ SUB INDICATOR ════════════════════════════════════
         if self._ax_sub and self._sub_name:
             ax3=self._ax_sub; ax3.clear(); style_ax(ax3)
+            lod3=LODView(ax3); ax3.set_xlim(-0.5,n_total-0.5)
             nm=self._sub_name
             if nm in r.indicators:
                 vals=r.indicators[nm].iloc[:bar_end].values
@@ -1061,8 +1517,8 @@ class BacktestTab:
                 if nm=='RSI':
                     ax3.axhline(70,color=C['red'],linestyle='--',lw=0.7,alpha=0.6)
                     ax3.axhline(30,color=C['green'],linestyle='--',lw=0.7,alpha=0.6)
-                    ax3.fill_between(sx,70,100,alpha=0.06,color=C['red'])
-                    ax3.fill_between(sx,0,30,alpha=0.06,color=C['green'])
+                    ax3.axhspan(70,100,alpha=0.06,color=C['red'],lw=0)
+                    ax3.axhspan(0,30,alpha=0.06,color=C['green'],lw=0)
                     ax3.set_ylim(0,100)
                 elif nm=='MACD':
                     if 'SIGNAL' in r.indicators:
@@ -1070,8 +1526,7 @@ class BacktestTab:
                                  color=C['accent'],lw=1,label='Signal')
                     if 'HISTOGRAM' in r.indicators:
                         h=r.indicators['HISTOGRAM'].iloc[:bar_end].values
-                        hc=[C['green'] if v>=0 else C['red'] for v in h]
-                        ax3.bar(sx,h,color=hc,alpha=0.5,width=0.8)
+                        draw_bars(ax3,sx,h,np.where(h>=0,C['green'],C['red']),width=0.8,alpha=0.5)
                     ax3.axhline(0,color=C['muted'],lw=0.5,alpha=0.4)
                 elif nm=='STOCH_K':
                     if 'STOCH_D' in r.indicators:
@@ -1086,6 +1541,7 @@ class BacktestTab:
                             ax3.plot(sx,r.indicators[snm].iloc[:bar_end].values,
                                      color=clr2,lw=0.8,linestyle='--',label=snm)
                     ax3.axhline(25,color=C['muted'],linestyle=':',lw=0.6,alpha=0.5)
+                lod3.track(ax3.lines)
                 ax3.set_xlim(-0.5,n_total-0.5)
                 ax3.set_ylabel(nm,color=C['purple'],fontsize=7)
                 hn2,_=ax3.get_legend_handles_labels()
@@ -1140,15 +1596,42 @@ class BacktestTab:
 
             w.writerow(['=== EQUITY CURVE ==='])
             w.writerow(['Date','Equity','Daily Return %'])
-            rets = r.equity_curve.pct_change().fillna(0)
-            for dt, eq in r.equity_curve.items():
-                d_str = dt.strftime('%Y-%m-%d') if hasattr(dt,'strftime') else str(dt)
-                dr = rets.loc[dt] * 100
-                w.writerow([d_str, f"{eq:.2f}", f"{dr:.4f}"])
+            eq = r.equity_curve
+            days = eq.index.strftime('%Y-%m-%d') if hasattr(eq.index,'strftime') else eq.index.astype(str)
+            w.writerows(zip(days, np.char.mod('%.2f', eq.to_numpy(float)),
+                            np.char.mod('%.4f', eq.pct_change().fillna(0).to_numpy(float) * 100)))
 
         self._set_status(f"Tradebook saved → {path}")
         messagebox.showinfo("Export CSV", f"Saved to:\n{path}")
 
+    # ── SAVE / OPEN RESULT ─────────────────────────────────────
+    def _save_result(self):
+        if not self.result:
+            messagebox.showwarning("Save", "Run a backtest first."); return
+        from .results_io import save_result, have_pyarrow
+        ext = '.parquet' if have_pyarrow() else '.npz'
+        path = filedialog.asksaveasfilename(
+            defaultextension=ext,
+            filetypes=[("Parquet bundle","*.parquet"),("Arrow bundle","*.arrow"),
+                       ("NumPy archive","*.npz"),("All","*.*")],
+            initialfile=f"backtest_{self.result.strategy.ticker}_{datetime.now():%Y%m%d_%H%M}{ext}")
+        if not path: return
+        self._set_status("Saving result…")
+        svc = get_service(); svc.attach_tk(self.parent)
+        svc.call(save_result, self.result, path,
+                 callback=lambda p: self._set_status(f"Result saved → {p}"),
+                 errback=lambda e: messagebox.showerror("Save", str(e)))
+
+    def _open_result(self):
+        from .results_io import load_result
+        path = filedialog.askopenfilename(
+            filetypes=[("Saved result","*.npz meta.json"),("All","*.*")])
+        if not path: return
+        self._stop_animation()
+        svc = get_service(); svc.attach_tk(self.parent)
+        svc.call(load_result, path, callback=self._on_result,
+                 errback=lambda e: self._on_error(f"{path}: {e}"))
+
     # ── PNG EXPORT ─────────────────────────────────────────────
     def _export_png(self):
         if not hasattr(self, '_fig') or not self._fig:
@@ -0,0 +1,348 @@
+"""
+QuantResearch Batch Backtest
+============================
+One strategy over many parameter sets in a single 2-D pass: every
+condition is evaluated as a bars × params boolean matrix and the position
+state machine advances all parameter columns together, one bar at a time.
+
+    grid = {'buy[0]': range(20, 41, 2), 'sell[0]': range(60, 81, 2), 'STOP_LOSS': [0, 3, 5]}
+    res = run_batch_backtest(src, grid)          # 11 × 11 × 3 = 363 backtests
+    res.best('sharpe', 5)                        # structured rows: params + metrics
+    res.run(j)                                   # column j as a full BacktestResult
+
+Grid keys (``param_slots(strategy)`` lists them with their current values):
+
+* ``buy[k]`` / ``sell[k]`` — the k-th number in the BUY / SELL condition
+* ``RSI[k]`` — the k-th parameter of an indicator (any ``_IND_REG`` key);
+  the registry defaults count when the script leaves them out
+* ``CAPITAL``, ``POSITION_SIZE``, ``STOP_LOSS``, ``TAKE_PROFIT``, ``COMMISSION``
+
+Every column reproduces ``BacktestEngine.run``: identical fills,
+commissions and equity, and metrics equal up to float summation order.
+Indicators are computed once per distinct parameter tuple; the sweep
+costs one Python loop over the bars per ``chunk`` columns, and metrics
+are reduced over the whole chunk at once.
+
+* ``points=[{slot: value}, ...]`` runs an explicit list instead of a grid
+* ``run(data, window=w)`` simulates only the last ``w`` bars
+* ``max_drawdown`` / ``max_trades`` stop a column as soon as it breaks
+  them; ``BatchResult.pruned`` holds the bar (``optimize`` builds on these)
+"""
+
+from __future__ import annotations
+import copy, inspect, itertools
+
+import numpy as np
+import pandas as pd
+
+from .backtest_engine import (
+    BacktestEngine, IndicatorDecl, Strategy, ValueNode, CompareNode,
+    CrossNode, LogicNode, NotNode, compile_strategy, normalize_ticker,
+    _IND_REG, _ALIAS, _PRICE_COL, _needed_indicators, _mask,
+)
+from .metrics import BacktestMetrics, batch_metrics
+
+FIELDS = {'CAPITAL': 'capital', 'POSITION_SIZE': 'position_pct', 'STOP_LOSS': 'stop_loss_pct',
+          'TAKE_PROFIT': 'take_profit_pct', 'COMMISSION': 'commission_pct'}
+CHUNK = 2048                                  # parameter columns simulated together …
+CHUNK_CELLS = 4_000_000                       # … capped at bars × columns cells per pass
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 1. PARAMETER SLOTS
+# ═══════════════════════════════════════════════════════════════════
+def _numbers(n, out):
+    """Number literals of a condition tree, left to right."""
+    if isinstance(n, ValueNode):
+        if n.kind == 'number': out.append(n)
+    elif isinstance(n, (CompareNode, CrossNode)): _numbers(n.left, out); _numbers(n.right, out)
+    elif isinstance(n, LogicNode):
+        for c in n.children: _numbers(c, out)
+    elif isinstance(n, NotNode): _numbers(n.child, out)
+    return out
+
+
+def _defaults(key):
+    sig = inspect.signature(_IND_REG[key])
+    return tuple(p.default for p in list(sig.parameters.values())[1:]
+                 if p.default is not inspect.Parameter.empty)
+
+
+def _ind_params(strat):
+    """Registry key → full parameter tuple (script values over registry defaults)."""
+    out = {}
+    for key, pr in _needed_indicators(strat).items():
+        d = _defaults(key); out[key] = tuple(pr) + d[len(pr):]
+    return out
+
+
+def param_slots(strat: Strategy) -> dict:
+    """Every sweepable slot of ``strat`` → its current value."""
+    slots = {}
+    for side, cond in (('buy', strat.buy_cond), ('sell', strat.sell_cond)):
+        for k, n in enumerate(_numbers(cond, [])): slots[f'{side}[{k}]'] = n.number
+    for key, pr in _ind_params(strat).items():
+        for k, v in enumerate(pr): slots[f'{key}[{k}]'] = v
+    for kw, f in FIELDS.items(): slots[kw] = getattr(strat, f)
+    return slots
+
+
+def apply_params(strat: Strategy, params: dict) -> Strategy:
+    """Copy of ``strat`` with the given slots set."""
+    s = copy.deepcopy(strat)
+    nums = {'buy': _numbers(s.buy_cond, []), 'sell': _numbers(s.sell_cond, [])}
+    ind = _ind_params(s)
+    for slot, v in params.items():
+        if slot in FIELDS: setattr(s, FIELDS[slot], float(v)); continue
+        name, k = slot[:-1].split('[')
+        if name in nums: nums[name][int(k)].number = float(v); continue
+        pr = list(ind[name]); pr[int(k)] = v; ind[name] = tuple(pr)
+        decl = next((d for d in s.indicators if _ALIAS.get(d.name, d.name) == name), None)
+        if decl is None: s.indicators.append(IndicatorDecl(name, tuple(pr)))
+        else:            decl.params = tuple(pr)
+    return s
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 2. RESULT
+# ═══════════════════════════════════════════════════════════════════
+class BatchResult:
+    """
+    Parameters and metrics of every column; ``equity`` (bars × columns) only
+    with ``keep_equity``; ``pruned`` is the bar a column was cut short on, or -1.
+    """
+
+    def __init__(self, strat, params, metrics, data, equity, currency, exchange, yf_ticker,
+                 pruned=None):
+        self.strat = strat; self.params = params; self.metrics = metrics
+        self.data = data; self.equity = equity
+        self.currency = currency; self.exchange = exchange; self.yf_ticker = yf_ticker
+        self.pruned = np.full(len(metrics), -1) if pruned is None else pruned
+
+    def __len__(self):
+        return len(self.metrics)
+
+    @property
+    def table(self) -> np.ndarray:
+        """One structured row per column: the grid slots, ``pruned``, then the metric fields."""
+        m = BacktestMetrics.array(self.metrics)
+        out = np.empty(len(m), np.dtype(self.params.dtype.descr + [('pruned', 'i8')] + m.dtype.descr))
+        for a in (self.params, m):
+            for f in a.dtype.names: out[f] = a[f]
+        out['pruned'] = self.pruned
+        return out
+
+    def best(self, by: str = 'sharpe', n: int = 10, ascending: bool = False) -> np.ndarray:
+        t = self.table; key = np.nan_to_num(t[by], nan=np.inf if ascending else -np.inf)
+        o = np.argsort(key, kind='stable')
+        return t[(o if ascending else o[::-1])[:n]]
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.table)
+
+    def strategy(self, j: int) -> Strategy:
+        return apply_params(self.strat, {f: self.params[f][j].item() for f in self.params.dtype.names})
+
+    def run(self, j: int, retain: str = 'full'):
+        """Column ``j`` re-run over the full history with ``BacktestEngine`` (trades, indicators, chart)."""
+        return BacktestEngine(self.strategy(j), retain=retain).run(self.data)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 3. ENGINE
+# ═══════════════════════════════════════════════════════════════════
+class BatchBacktestEngine:
+    """
+    ``grid`` is expanded as a product; ``points`` (a list of {slot: value})
+    runs exactly those parameter sets instead.  ``max_drawdown`` /
+    ``max_trades`` prune violating columns early (see ``simulate``).
+    """
+    def __init__(self, strat: Strategy, grid: dict = None, fetcher=None, chunk: int = CHUNK,
+                 keep_equity: bool = False, points: list = None,
+                 max_drawdown: float = None, max_trades: int = None):
+        if points is not None: keys = list(dict.fromkeys(k for p in points for k in p))
+        else:                  keys = list(grid or {})
+        slots = param_slots(strat)
+        bad = [k for k in keys if k not in slots]
+        if bad: raise KeyError(f"unknown slot(s) {bad}; available: {list(slots)}")
+        self.strat = strat; self.fetcher = fetcher
+        self.chunk = chunk; self.keep_equity = keep_equity
+        self.max_drawdown = max_drawdown; self.max_trades = max_trades
+        self.keys = keys
+        if points is not None: combos = [tuple(p.get(k, slots[k]) for k in keys) for p in points]
+        else:                  combos = list(itertools.product(*(list(grid[k]) for k in keys)))
+        self.params = np.array(combos, dtype=[(k, 'f8') for k in keys])
+
+    def run(self, data: pd.DataFrame = None, window: int = None, cache: dict = None) -> BatchResult:
+        """
+        ``window``: simulate only the last ``window`` bars (indicators still see
+        the whole history).  ``cache``: a dict reused across runs on the same
+        ``data`` to keep computed indicators.
+        """
+        s = self.strat
+        if data is None: data, yf_t, ccy, exch = BacktestEngine(s, self.fetcher).fetch_data()
+        else:            yf_t, ccy, exch, _ = normalize_ticker(s.ticker, s.market)
+        P = len(self.params); w = min(window or len(data), len(data))
+        metrics = []; pruned = np.full(P, -1); equity = np.empty((w, P)) if self.keep_equity else None
+        cache = {} if cache is None else cache
+        step = max(64, min(self.chunk, CHUNK_CELLS // max(len(data), 1)))
+        for a in range(0, P, step):
+            cols = np.arange(a, min(P, a + step))
+            eq, trades, pruned[cols] = self._simulate(data, cols, cache, w)
+            metrics += self._metrics(data.index[-w:], cols, eq, trades)
+            if equity is not None: equity[:, cols] = eq
+        return BatchResult(s, self.params, metrics, data, equity, ccy, exch, yf_t, pruned)
+
+    # ── per-column settings ───────────────────────────────────
+    def _column(self, slot, cols, default):
+        """Slot values for ``cols`` (broadcast ``default`` when the slot is not swept)."""
+        if slot in self.keys: return self.params[slot][cols]
+        return np.full(len(cols), float(default))
+
+    def _indicators(self, data, cols, cache):
+        """Output name → (bars × 1) or (bars × columns) array for the chunk."""
+        base = _ind_params(self.strat); out = {}
+        for key, pr in base.items():
+            swept = [f'{key}[{k}]' for k in range(len(pr)) if f'{key}[{k}]' in self.keys]
+            tups = [tuple(pr)] * len(cols) if not swept else [
+                tuple(self.params[f'{key}[{k}]'][j] if f'{key}[{k}]' in self.keys else v
+                      for k, v in enumerate(pr)) for j in cols]
+            uniq = list(dict.fromkeys(tups)); pick = [uniq.index(t) for t in tups]
+            series = []
+            for t in uniq:
+                if (key, t) not in cache:
+                    try: cache[key, t] = {nm: np.asarray(v, float)
+                                          for nm, v in _IND_REG[key](data, *t).items()}
+                    except Exception as e:
+                        print(f"[WARN] {key}{t}: {e}"); cache[key, t] = {}
+                series.append(cache[key, t])
+            for nm in set().union(*series):
+                st = np.stack([sr.get(nm, np.full(len(data), np.nan)) for sr in series], 1)
+                out[nm] = st if len(uniq) == 1 else st[:, pick]
+        return out
+
+    # ── 2-D simulation ────────────────────────────────────────
+    def _simulate(self, data, cols, cache, window):
+        s = self.strat; n = len(data); m = len(cols)
+        ind = self._indicators(data, cols, cache)
+        swept_num = {}
+        for side, cond in (('buy', s.buy_cond), ('sell', s.sell_cond)):
+            for k, node in enumerate(_numbers(cond, [])):
+                if f'{side}[{k}]' in self.keys: swept_num[id(node)] = self.params[f'{side}[{k}]'][cols][None, :]
+        nan = np.full((n, 1), np.nan)
+
+        def val(node):
+            if node.kind == 'number': return swept_num.get(id(node), node.number)
+            if node.kind == 'price': return data[_PRICE_COL.get(node.name, node.name)].to_numpy(float)[:, None]
+            return ind.get(node.name, nan)
+
+        buy = _mask(s.buy_cond, val, (n, m)); sell = _mask(s.sell_cond, val, (n, m))
+        return simulate(data['Close'].to_numpy(float)[-window:], buy[-window:], sell[-window:],
+                        self._column('CAPITAL', cols, s.capital),
+                        self._column('POSITION_SIZE', cols, s.position_pct),
+                        self._column('COMMISSION', cols, s.commission_pct),
+                        self._column('STOP_LOSS', cols, s.stop_loss_pct),
+                        self._column('TAKE_PROFIT', cols, s.take_profit_pct),
+                        self.max_drawdown, self.max_trades)
+
+    def _metrics(self, index, cols, eq, log):
+        return column_metrics(index, eq, log, self._column('CAPITAL', cols, self.strat.capital))
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 4. COLUMN STATE MACHINE  (shared with mining)
+# ═══════════════════════════════════════════════════════════════════
+def simulate(close, buy, sell, capital, position_pct, commission_pct, stop_loss_pct, take_profit_pct,
+             max_drawdown: float = None, max_trades: int = None):
+    """
+    ``BacktestEngine.run``'s position logic for every column of the bars ×
+    columns ``buy`` / ``sell`` masks at once; settings are per-column arrays.
+
+    ``max_drawdown`` (a fraction) and ``max_trades`` prune a column on the
+    bar its equity falls that far below its peak or it opens one trade too
+    many: any position is closed there and the column stops trading.  Once
+    half the columns still simulated are pruned, the rest are compacted so
+    pruned runs stop costing anything.
+
+    Returns (equity bars × columns, trade log, bar each column was pruned on or -1).
+    """
+    buy = np.ascontiguousarray(buy); sell = np.ascontiguousarray(sell)
+    n, m = buy.shape
+    cap = np.array(capital, float); pf = np.asarray(position_pct, float) / 100
+    cr = np.asarray(commission_pct, float) / 100
+    sl = np.asarray(stop_loss_pct, float); tp = np.asarray(take_profit_pct, float)
+    sl = np.where(sl > 0, -sl, -np.inf); tp = np.where(tp > 0, tp, np.inf)   # 0 = off
+    held = np.zeros(m, bool); sh = np.zeros(m); ep = np.full(m, np.nan)
+    ecm = np.zeros(m); ei = np.zeros(m, np.int64)
+    eq = np.empty((n, m)); eq[:] = cap
+    log = []                                     # (column, entry bar, exit bar, pnl, commission)
+    warmup = min(60, n // 4)
+    check = max_drawdown is not None or max_trades is not None
+    act = np.arange(m)                           # original column of each simulated column
+    alive = np.ones(m, bool); pruned = np.full(m, -1)
+    nt = np.zeros(m, np.int64); peak = cap.copy()
+    floor = 1 - max_drawdown if max_drawdown is not None else -np.inf
+    limit = max_trades if max_trades is not None else np.iinfo(np.int64).max
+
+    def close_out(k, i, price):
+        cm = price * sh[k] * cr[k]
+        pnl = (price - ep[k]) * sh[k] - cm - ecm[k]
+        cap[k] += ep[k] * sh[k] + pnl
+        log.append((act[k], ei[k], np.full(len(k), i), pnl, ecm[k] + cm))
+        held[k] = False; sh[k] = 0; ep[k] = np.nan
+
+    for i in range(warmup, n):
+        price = close[i]
+        if held.any():
+            pnl_p = (price / ep - 1) * 100
+            ex = held & ((pnl_p <= sl) | (pnl_p >= tp) | sell[i])
+            if ex.any(): close_out(np.flatnonzero(ex), i, price)
+        en = ~held & buy[i]
+        if check: en &= alive
+        if en.any() and price > 0:
+            k = np.flatnonzero(en)
+            shares = np.floor_divide(cap[k] * pf[k], price)
+            k = k[shares > 0]; shares = shares[shares > 0]
+            cm = price * shares * cr[k]
+            cap[k] -= price * shares + cm
+            held[k] = True; sh[k] = shares; ep[k] = price; ecm[k] = cm; ei[k] = i; nt[k] += 1
+        row = cap + price * sh if price == price else np.where(held, np.nan, cap)
+        if not check:
+            eq[i] = row; continue
+        peak = np.fmax(peak, row)
+        bad = alive & ((row < peak * floor) | (nt > limit))
+        if bad.any():
+            k = np.flatnonzero(bad & held)
+            if len(k): close_out(k, i, price); row[k] = cap[k]
+            k = np.flatnonzero(bad)
+            alive[k] = False; pruned[act[k]] = i; eq[i:, act[k]] = cap[k]
+        eq[i, act] = row
+        if alive.sum() * 2 <= len(alive):        # compact: drop pruned columns from the loop
+            keep = alive
+            if not keep.any(): break
+            act = act[keep]; buy = np.ascontiguousarray(buy[:, keep])
+            sell = np.ascontiguousarray(sell[:, keep])
+            cap, pf, cr, sl, tp, held, sh, ep, ecm, ei, nt, peak = (
+                a[keep] for a in (cap, pf, cr, sl, tp, held, sh, ep, ecm, ei, nt, peak))
+            alive = np.ones(len(act), bool)
+    if held.any():
+        close_out(np.flatnonzero(held), n - 1, close[-1]); eq[-1, act] = cap
+    if warmup < n: eq[:warmup] = eq[warmup]
+    return eq, log, pruned
+
+
+def column_metrics(index, eq, log, capital) -> list:
+    """``BacktestMetrics`` per column from ``simulate``'s output."""
+    if log:
+        k, e, x, pnl, cm = (np.concatenate(c) for c in zip(*log))
+        o = np.argsort(k, kind='stable'); k, e, x, pnl, cm = k[o], e[o], x[o], pnl[o], cm[o]
+    else:
+        k = e = x = np.zeros(0, np.int64); pnl = cm = np.zeros(0)
+    dates = pd.DatetimeIndex(index).values
+    hold = np.maximum((dates[x] - dates[e]) // np.timedelta64(1, 'D'), 1).astype(float)
+    return batch_metrics(k, pnl, cm, hold, eq, capital)
+
+
+def run_batch_backtest(src: str, grid: dict, fetcher=None, data: pd.DataFrame = None,
+                       **kw) -> BatchResult:
+    return BatchBacktestEngine(compile_strategy(src), grid, fetcher, **kw).run(data)
@@ -11,18 +11,25 @@ from matplotlib.figure import Figure
 import matplotlib.animation as animation
 import pandas as pd
 from datetime import datetime, timedelta
-import yfinance as yf
 import numpy as np
-import threading
 import platform
-import json, os, math
+import asyncio, json, os, math
+from functools import lru_cache
 
 from .indicators import (
-    Rsi, RVWAP, macd, bb_bands, atr, fetch_data,
+    Rsi, RVWAP, macd, bb_bands, atr,
     sma, temma, demma, ema,
     stochastic, williams_r, obv, parabolic_sar,
     adx, ichimoku, pivot_points, fibonacci_levels, slope
 )
+from .alerts import AlertEngine
+from .tick_archive import TickRecorder
+from .live_feed import LiveDataStore, WebSocketManager, TickBus
+from .data_service import get_service
+from .quotes import QuoteService
+from .metrics import QuantMetrics, compute_quant_metrics
+from .lod import LODView, draw_bars, fill_between, scatter, draw_candles as lod_candles
+from .tiles import TileGrid
 
 
 
@@ -115,10 +122,17 @@ DEFAULT_LIVE_TICKERS = ["RELIANCE.NS","TCS.NS","INFY.NS","HDFCBANK.NS",
                          "AAPL","MSFT","BTC-USD","ETH-USD"]
 
 WATCHLIST_FILE = os.path.join(os.path.expanduser("~"), ".quant_watchlist.json")
+TICK_ARCHIVE_DIR = os.path.join(os.path.expanduser("~"), ".quant_ticks")
+FEED_SOURCES = ("Yahoo", "Local GBM", "Local Replay")
+TICK_FRAME_MS  = 100          # live price labels / tick log redraw cadence
+TICK_LOG_LINES = 20
+WATCH_COLUMNS  = [('ticker','Ticker',150,'w'), ('exch','Exch',70,'w'), ('last','Last',120,'e'),
+                  ('chg','Chg%',90,'e'), ('high52','52W High',120,'e'), ('low52','52W Low',120,'e')]
 
 # ═══════════════════════════════════════════════════════════════════
 # TICKER NORMALIZATION  ← THE CORE FIX FOR INDIAN TICKERS
 # ═══════════════════════════════════════════════════════════════════
+@lru_cache(maxsize=4096)
 def normalize_ticker(raw: str, market: str = "Auto") -> tuple:
     """
     Returns (yf_ticker, currency_symbol, exchange_label, display_name)
@@ -202,82 +216,49 @@ def fmt_vol(v) -> str:
 
 
 # ═══════════════════════════════════════════════════════════════════
-# QUANT METRICS
+# CHART INDICATORS  (pure — computed off the Tk thread)
 # ═══════════════════════════════════════════════════════════════════
-def compute_quant_metrics(prices: pd.Series, benchmark_prices: pd.Series = None,
-                           risk_free: float = 0.065) -> dict:
-    """
-    Compute quant-grade performance metrics.
-    risk_free: annual rate (default 6.5% – Indian repo rate approximation)
-    """
-    ret = prices.pct_change().dropna()
-    if len(ret) < 5:
-        return {}
-
-    # Annualisation factor (trading days ≈ 252)
-    ann = 252
-    rf_daily = (1 + risk_free) ** (1/ann) - 1
-
-    total_ret   = (prices.iloc[-1] / prices.iloc[0]) - 1
-    cagr        = (1 + total_ret) ** (ann / len(prices)) - 1 if len(prices) > 1 else 0
-    vol         = ret.std() * np.sqrt(ann)
-    sharpe      = (ret.mean() - rf_daily) / ret.std() * np.sqrt(ann) if ret.std() > 0 else 0
-
-    # Sortino
-    down_ret    = ret[ret < rf_daily]
-    down_std    = down_ret.std() * np.sqrt(ann) if len(down_ret) > 0 else 1e-9
-    sortino     = (ret.mean() - rf_daily) / (down_ret.std() if len(down_ret) > 0 else 1e-9) * np.sqrt(ann)
-
-    # Max Drawdown
-    cum         = (1 + ret).cumprod()
-    roll_max    = cum.cummax()
-    dd          = (cum - roll_max) / roll_max
-    max_dd      = dd.min()
-    calmar      = cagr / abs(max_dd) if max_dd != 0 else 0
-
-    # VaR / CVaR (95%)
-    var_95      = np.percentile(ret, 5)
-    cvar_95     = ret[ret <= var_95].mean()
-
-    # Win rate
-    win_rate    = (ret > 0).mean()
-    avg_win     = ret[ret > 0].mean() if (ret > 0).any() else 0
-    avg_loss    = ret[ret < 0].mean() if (ret < 0).any() else 0
-    profit_factor = abs(avg_win / avg_loss) if avg_loss != 0 else 0
-
-    metrics = {
-        'Total Return':   f"{total_ret*100:+.2f}%",
-        'CAGR':           f"{cagr*100:.2f}%",
-        'Volatility':     f"{vol*100:.2f}%",
-        'Sharpe':         f"{sharpe:.2f}",
-        'Sortino':        f"{sortino:.2f}",
-        'Max Drawdown':   f"{max_dd*100:.2f}%",
-        'Calmar':         f"{calmar:.2f}",
-        'VaR 95%':        f"{var_95*100:.2f}%",
-        'CVaR 95%':       f"{cvar_95*100:.2f}%",
-        'Win Rate':       f"{win_rate*100:.1f}%",
-        'Profit Factor':  f"{profit_factor:.2f}",
-        'Bars':           str(len(prices)),
+SUB_PANEL_INDS = ['MACD','ATR','RSI','Stochastic','Williams %R','OBV','ADX','Slope']
+PLOT_PARAM_KEYS = {'RSI': 'rsi', 'MACD': 'macd', 'ATR': 'atr', 'Stochastic': 'stoch',
+                   'Williams %R': 'williams', 'OBV': None, 'ADX': 'adx', 'Slope': 'slope'}
+
+HOVER_LABELS = {'SMA': 'SMA', 'EMA': 'EMA', 'DEMA': 'DEMA', 'TEMA': 'TEMA', 'rvwap': 'RVWAP',
+                'RSI': 'RSI', 'MACD': 'MACD', 'ATR': 'ATR', 'Stochastic': '%K',
+                'Williams %R': '%R', 'OBV': 'OBV', 'ADX': 'ADX', 'Slope': 'Slope'}
+
+def _plot_jobs(data: pd.DataFrame, spec: dict) -> dict:
+    """{(name, params): thunk} for every series the current controls need."""
+    on, ex, P = spec['on'], spec['extra'], spec['p']
+    c    = data['Close']
+    jobs = {('up',): lambda: (c >= data['Open']).to_numpy()}
+    if on.get('Bollinger Bands'): jobs[('bb', P['bb'])] = lambda: bb_bands(c, period=P['bb'])
+    if on.get('Ichimoku'):        jobs[('ichimoku',)]    = lambda: ichimoku(data)
+    if on.get('Parabolic SAR'):   jobs[('sar',)]         = lambda: parabolic_sar(data)
+    if on.get('Pivot Points'):    jobs[('pivots',)]      = lambda: pivot_points(data)
+    if 'Volume' in data.columns and (ex.get('VWAP') or 'RVWAP' in spec['ma']):
+        jobs[('rvwap', P['rvwap'])] = lambda: RVWAP(data['High'], data['Low'], c, data['Volume'],
+                                                    period=P['rvwap'])
+    ma = {'SMA': sma, 'EMA': ema, 'DEMA': demma, 'TEMA': temma}
+    for n in spec['ma']:
+        if n in ma: jobs[(n, P['ma'])] = lambda f=ma[n]: f(c, P['ma'])
+    sub = {
+        'RSI':         lambda p: Rsi(c, period=p),
+        'MACD':        lambda p: macd(c, *p),
+        'ATR':         lambda p: atr(data, period=p),
+        'Stochastic':  lambda p: stochastic(data, k_period=p[0], d_period=p[1]),
+        'Williams %R': lambda p: williams_r(data, period=p),
+        'OBV':         lambda p: obv(data),
+        'ADX':         lambda p: adx(data, period=p),
+        'Slope':       lambda p: slope(c, period=p),
     }
+    for n in spec['sub']:
+        p = PLOT_PARAM_KEYS[n] and P[PLOT_PARAM_KEYS[n]]
+        jobs[(n, p)] = lambda f=sub[n], p=p: f(p)
+    return jobs
 
-    # Beta / Alpha vs benchmark
-    if benchmark_prices is not None and len(benchmark_prices) > 5:
-        bret = benchmark_prices.pct_change().dropna()
-        # Align
-        common = ret.index.intersection(bret.index)
-        if len(common) > 5:
-            r_a = ret.loc[common]
-            r_b = bret.loc[common]
-            cov  = np.cov(r_a, r_b)
-            beta = cov[0,1] / cov[1,1] if cov[1,1] != 0 else 0
-            alpha_daily = r_a.mean() - (rf_daily + beta * (r_b.mean() - rf_daily))
-            alpha_ann   = alpha_daily * ann
-            corr        = r_a.corr(r_b)
-            metrics['Beta']        = f"{beta:.2f}"
-            metrics['Alpha (ann)'] = f"{alpha_ann*100:+.2f}%"
-            metrics['Correlation'] = f"{corr:.2f}"
-
-    return metrics
+def compute_plot_indicators(data: pd.DataFrame, spec: dict, only=None) -> dict:
+    """Series the Historical chart draws (all, or just the keys in ``only``), off the Tk thread."""
+    return {k: f() for k, f in _plot_jobs(data, spec).items() if only is None or k in only}
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -294,102 +275,6 @@ def beep():
         pass
 
 
-# ═══════════════════════════════════════════════════════════════════
-# LIVE DATA STORE
-# ═══════════════════════════════════════════════════════════════════
-class LiveDataStore:
-    def __init__(self):
-        self._lock  = threading.Lock()
-        self._ticks: dict = {}
-        self._prev_prices: dict = {}
-
-    def add_tick(self, ticker: str, timestamp_ms, price: float):
-        ts = pd.to_datetime(int(timestamp_ms), unit='ms')
-        with self._lock:
-            prev = self._ticks.get(ticker, [{}])
-            if prev:
-                self._prev_prices[ticker] = float(prev[-1].get("price", price))
-            if ticker not in self._ticks:
-                self._ticks[ticker] = []
-            self._ticks[ticker].append({"time": ts, "price": price})
-            if len(self._ticks[ticker]) > 3000:
-                self._ticks[ticker] = self._ticks[ticker][-3000:]
-
-    def get_ohlc(self, ticker: str, resample: str = "1min") -> pd.DataFrame:
-        with self._lock:
-            ticks = list(self._ticks.get(ticker, []))
-        if not ticks:
-            return pd.DataFrame()
-        df = pd.DataFrame(ticks).set_index("time")
-        return df["price"].resample(resample).ohlc().dropna()
-
-    def get_latest_price(self, ticker: str):
-        with self._lock:
-            ticks = self._ticks.get(ticker, [])
-            return float(ticks[-1]["price"]) if ticks else None
-
-    def get_prev_price(self, ticker: str):
-        with self._lock:
-            return self._prev_prices.get(ticker)
-
-    def get_tick_log(self, ticker: str, n: int = 50):
-        with self._lock:
-            return list(self._ticks.get(ticker, []))[-n:]
-
-    def tickers(self):
-        with self._lock:
-            return list(self._ticks.keys())
-
-
-# ═══════════════════════════════════════════════════════════════════
-# WEBSOCKET MANAGER
-# ═══════════════════════════════════════════════════════════════════
-class WebSocketManager:
-    def __init__(self, store: LiveDataStore, tickers: list):
-        self.store   = store
-        self.tickers = tickers
-        self._thread = None
-        self._ws     = None
-        self.status_var = None
-
-    def _on_message(self, message: dict):
-        ticker = message.get("id", "")
-        price  = message.get("price")
-        ts     = message.get("time")
-        if ticker and price is not None and ts is not None:
-            self.store.add_tick(ticker, ts, float(price))
-
-    def _run(self):
-        self._set_status("🔴  Connecting…")
-        try:
-            with yf.WebSocket() as ws:
-                self._ws = ws
-                ws.subscribe(self.tickers)
-                self._set_status(f"🟢  Live — {len(self.tickers)} tickers")
-                ws.listen(self._on_message)
-        except Exception as exc:
-            self._set_status(f"⚠️  {exc}")
-
-    def _set_status(self, text: str):
-        if self.status_var:
-            try: self.status_var.set(text)
-            except Exception: pass
-
-    def start(self, tickers: list = None):
-        if tickers:
-            self.tickers = tickers
-        if self._thread and self._thread.is_alive():
-            return
-        self._thread = threading.Thread(target=self._run, daemon=True)
-        self._thread.start()
-
-    def reconnect(self, tickers: list = None):
-        if tickers:
-            self.tickers = tickers
-        self._thread = threading.Thread(target=self._run, daemon=True)
-        self._thread.start()
-
-
 # ═══════════════════════════════════════════════════════════════════
 # STYLE HELPERS
 # ═══════════════════════════════════════════════════════════════════
@@ -418,14 +303,8 @@ def set_x_date_ticks(ax, index, n=8, fmt='%Y-%m-%d'):
 
 def draw_candles(ax, data_df, width=0.6):
     d = data_df[['Open','High','Low','Close']].dropna()
-    for i, row in enumerate(d.itertuples()):
-        bull  = row.Close >= row.Open
-        color = C['green'] if bull else C['red']
-        ax.plot([i, i], [row.Low, row.High], color=C['muted'], linewidth=0.7, alpha=0.8)
-        body_h = abs(row.Close - row.Open) or (row.High - row.Low) * 0.01
-        ax.add_patch(plt.Rectangle(
-            (i - width/2, min(row.Open, row.Close)), width, body_h,
-            facecolor=color, edgecolor='none', alpha=0.92))
+    lod_candles(ax, *(d[k].to_numpy(float) for k in ('Open','High','Low','Close')),
+                width=width, up=C['green'], down=C['red'], wick=C['muted'])
     ax.set_xlim(-0.5, len(d) - 0.5)
 
     # ── Tight Y-axis: only show actual price range with 3% padding ──
@@ -437,6 +316,33 @@ def draw_candles(ax, data_df, width=0.6):
     return d.index
 
 
+class ArtistRegistry:
+    """
+    Artists on a persistent Axes grouped by layer key, so one overlay can
+    be removed or added without rebuilding the figure.  ``add`` records
+    whatever the draw function created on ``ax``.
+    """
+    def __init__(self):
+        self.layers: dict = {}
+
+    def keys(self):
+        return list(self.layers)
+
+    def __contains__(self, key):
+        return key in self.layers
+
+    def add(self, key, ax, draw):
+        before = set(ax.get_children())
+        draw(ax)
+        self.layers[key] = [a for a in ax.get_children() if a not in before and a is not ax.get_legend()]
+        return self.layers[key]
+
+    def remove(self, key):
+        for a in self.layers.pop(key, ()):
+            try: a.remove()
+            except (ValueError, NotImplementedError): pass
+
+
 def compute_volume_profile(data_df, n_bins=40):
     """
     Returns (price_levels, volumes) for a horizontal Volume Profile.
@@ -446,16 +352,13 @@ def compute_volume_profile(data_df, n_bins=40):
     hi  = data_df['High'].max()
     bins = np.linspace(lo, hi, n_bins + 1)
     mid  = (bins[:-1] + bins[1:]) / 2
-    vols = np.zeros(n_bins)
 
-    for row in data_df.itertuples():
-        # Distribute bar's volume proportionally across the bins it spans
-        bar_lo, bar_hi = row.Low, row.High
-        bar_range = bar_hi - bar_lo or 1e-9
-        for j in range(n_bins):
-            overlap = min(bins[j+1], bar_hi) - max(bins[j], bar_lo)
-            if overlap > 0:
-                vols[j] += row.Volume * overlap / bar_range
+    # Distribute each bar's volume proportionally across the bins it spans
+    bar_lo = data_df['Low'].to_numpy(float)[:, None]
+    bar_hi = data_df['High'].to_numpy(float)[:, None]
+    bar_range = np.where(bar_hi > bar_lo, bar_hi - bar_lo, 1e-9)
+    overlap = np.clip(np.minimum(bins[1:], bar_hi) - np.maximum(bins[:-1], bar_lo), 0, None)
+    vols = (data_df['Volume'].to_numpy(float)[:, None] * overlap / bar_range).sum(axis=0)
 
     return mid, vols
 
@@ -499,12 +402,10 @@ def draw_volume_profile(ax, data_df, fib_start_idx=None, fib_end_idx=None,
 
     # Draw horizontal bars from the right edge
     bar_h = (mid[1] - mid[0]) * 0.85 if len(mid) > 1 else 1
-    for j in range(n_bins):
-        x0 = x_max - norm_vols[j]
-        color = poc_color if j == poc_idx else (
-            '#1a3a2a' if j in va_set else '#1a1f2b')
-        ax.barh(mid[j], norm_vols[j], height=bar_h, left=x0,
-                color=color, alpha=0.75, zorder=2)
+    colors = [poc_color if j == poc_idx else ('#1a3a2a' if j in va_set else '#1a1f2b')
+              for j in range(n_bins)]
+    ax.barh(mid, norm_vols, height=bar_h, left=x_max - norm_vols,
+            color=colors, alpha=0.75, zorder=2)
 
     # POC line
     ax.axhline(mid[poc_idx], color=poc_color, lw=1.2, linestyle='-', alpha=0.9, zorder=3,
@@ -524,6 +425,83 @@ def draw_volume_profile(ax, data_df, fib_start_idx=None, fib_end_idx=None,
             fontsize=6, va='center', ha='right', fontfamily='Consolas', zorder=4)
 
 
+def draw_multi_tile(fig, payload):
+    """One Multi-Ticker tile: candles plus an optional indicator panel.  Runs on a worker thread."""
+    ticker, data, indicator = payload
+    yf_t, ccy, exch, disp = normalize_ticker(ticker, 'Auto')
+    show_ind = indicator not in ("None", "Bollinger Bands")
+    fig.set_facecolor(C['bg'])
+    if show_ind:
+        gs = fig.add_gridspec(2, 1, height_ratios=[3, 1], hspace=0.55,
+                              left=0.15, right=0.97, top=0.9, bottom=0.1)
+        ax_p = fig.add_subplot(gs[0]); ax_i = fig.add_subplot(gs[1])
+    else:
+        gs = fig.add_gridspec(1, 1, left=0.15, right=0.97, top=0.9, bottom=0.14)
+        ax_p = fig.add_subplot(gs[0]); ax_i = None
+    for ax in ([ax_p] + ([ax_i] if ax_i else [])):
+        style_ax(ax)
+
+    cfg = PERIOD_SETTINGS["1M"]
+    draw_candles(ax_p, data, width=0.6)
+    xr  = np.arange(len(data))
+
+    # Currency y-axis
+    ax_p.yaxis.set_major_formatter(
+        mticker.FuncFormatter(lambda x,_,c=ccy: f"{c}{x:,.0f}" if x>=1000 else f"{c}{x:.0f}"))
+
+    if indicator == "Bollinger Bands":
+        bu,bm,bl = bb_bands(data['Close'], period=cfg['bb'])
+        ax_p.plot(xr, bu.values, color=C['gold'], linestyle='--', lw=0.7, alpha=0.7)
+        ax_p.plot(xr, bm.values, color=C['cyan'], linestyle='-.', lw=0.6, alpha=0.6)
+        ax_p.plot(xr, bl.values, color=C['gold'], linestyle='--', lw=0.7, alpha=0.7)
+        ax_p.fill_between(xr, bu.values, bl.values, alpha=0.06, color=C['gold'])
+
+    last = data['Close'].iloc[-1]
+    pct  = ((data['Close'].iloc[-1]/data['Close'].iloc[0])-1)*100
+    clr  = C['green'] if pct >= 0 else C['red']
+    ax_p.set_title(f"{disp}  {fmt_price(last,ccy)}  ({pct:+.1f}%)",
+                   color=clr, fontsize=7, fontweight='bold', pad=3)
+
+    step = max(1, len(data)//4)
+    ax_p.set_xticks(range(0,len(data),step))
+    ax_p.set_xticklabels([data.index[i].strftime('%d/%m') for i in range(0,len(data),step)],
+                          rotation=30, ha='right', fontsize=5, color=C['muted'])
+
+    if ax_i is not None:
+        if indicator == 'RSI':
+            rv = Rsi(data['Close'], period=cfg['rsi'])
+            ax_i.plot(xr, rv.values, color=C['purple'], lw=1)
+            ax_i.axhline(70, color=C['red'],  linestyle='--', lw=0.7, alpha=0.6)
+            ax_i.axhline(30, color=C['green'], linestyle='--', lw=0.7, alpha=0.6)
+            ax_i.set_ylim(0,100); ax_i.set_title('RSI', color=C['purple'], fontsize=7)
+        elif indicator == 'MACD':
+            mc,sig,hist = macd(data['Close'])
+            ax_i.plot(xr, mc.values,  color=C['blue'],  lw=0.9)
+            ax_i.plot(xr, sig.values, color=C['accent'], lw=0.9)
+            draw_bars(ax_i, xr, hist.values, np.where(hist.values >= 0, C['green'], C['red']),
+                      width=0.8, alpha=0.6)
+            ax_i.axhline(0, color=C['muted'], lw=0.4, alpha=0.4)
+            ax_i.set_title('MACD', color=C['blue'], fontsize=7)
+        elif indicator == 'ATR':
+            av = atr(data, period=cfg['atr'])
+            ax_i.plot(xr, av.values, color=C['accent'], lw=0.9)
+            ax_i.fill_between(xr, 0, av.values, alpha=0.12, color=C['accent'])
+            ax_i.set_title('ATR', color=C['accent'], fontsize=7)
+        elif indicator == 'Stochastic':
+            k,d = stochastic(data, k_period=cfg['stoch'][0])
+            ax_i.plot(xr, k.values, color=C['cyan'],  lw=0.9, label='%K')
+            ax_i.plot(xr, d.values, color=C['accent'], lw=0.9, label='%D')
+            ax_i.axhline(80, color=C['red'],  linestyle='--', lw=0.7, alpha=0.6)
+            ax_i.axhline(20, color=C['green'], linestyle='--', lw=0.7, alpha=0.6)
+            ax_i.set_ylim(0,100); ax_i.set_title('Stoch', color=C['cyan'], fontsize=7)
+        elif indicator == 'ADX':
+            adx_v,_,_ = adx(data, period=cfg['adx'])
+            ax_i.plot(xr, adx_v.values, color=C['gold'], lw=0.9)
+            ax_i.axhline(25, color=C['muted'], linestyle=':', lw=0.6, alpha=0.6)
+            ax_i.set_title('ADX', color=C['gold'], fontsize=7)
+        style_ax(ax_i)
+
+
 # ═══════════════════════════════════════════════════════════════════
 # PERIOD SPINBOX WIDGET
 # ═══════════════════════════════════════════════════════════════════
@@ -561,39 +539,38 @@ class MetricsCard(tk.Frame):
         self._grid = tk.Frame(self, bg=C['bg2'])
         self._grid.pack(fill=tk.X, padx=6, pady=4)
 
-    def update(self, metrics: dict):
+    def update(self, m: QuantMetrics):
         for w in self._grid.winfo_children():
             w.destroy()
         self._labels = {}
+        if m is None: return
 
         COLOR_MAP = {
-            'Total Return': lambda v: C['green'] if '+' in v else C['red'],
-            'CAGR':         lambda v: C['green'] if float(v.rstrip('%')) > 0 else C['red'],
-            'Sharpe':       lambda v: C['green'] if float(v) >= 1 else (C['gold'] if float(v) >= 0 else C['red']),
-            'Sortino':      lambda v: C['green'] if float(v) >= 1.5 else (C['gold'] if float(v) >= 0.5 else C['red']),
-            'Max Drawdown': lambda v: C['red'] if float(v.rstrip('%')) < -20 else C['gold'],
-            'Alpha (ann)':  lambda v: C['green'] if '+' in v else C['red'],
-            'Beta':         lambda v: C['cyan'],
-            'Correlation':  lambda v: C['cyan'],
-            'Win Rate':     lambda v: C['green'] if float(v.rstrip('%')) >= 50 else C['red'],
+            'Total Return': lambda m: C['green'] if m.total_return >= 0 else C['red'],
+            'CAGR':         lambda m: C['green'] if m.cagr > 0 else C['red'],
+            'Sharpe':       lambda m: C['green'] if m.sharpe >= 1 else (C['gold'] if m.sharpe >= 0 else C['red']),
+            'Sortino':      lambda m: C['green'] if m.sortino >= 1.5 else (C['gold'] if m.sortino >= 0.5 else C['red']),
+            'Max Drawdown': lambda m: C['red'] if m.max_drawdown < -0.20 else C['gold'],
+            'Alpha (ann)':  lambda m: C['green'] if m.alpha_ann >= 0 else C['red'],
+            'Beta':         lambda m: C['cyan'],
+            'Correlation':  lambda m: C['cyan'],
+            'Win Rate':     lambda m: C['green'] if m.win_rate >= 0.5 else C['red'],
         }
 
         ROW_ORDER = ['Total Return','CAGR','Volatility','Sharpe','Sortino',
                      'Max Drawdown','Calmar','VaR 95%','CVaR 95%',
                      'Win Rate','Profit Factor','Beta','Alpha (ann)','Correlation','Bars']
 
-        keys = [k for k in ROW_ORDER if k in metrics] + \
-               [k for k in metrics if k not in ROW_ORDER]
+        labels = m.formatted()
+        keys = [k for k in ROW_ORDER if k in labels] + \
+               [k for k in labels if k not in ROW_ORDER]
 
         for i, key in enumerate(keys):
-            val = metrics[key]
+            val = labels[key]
             r   = i // 2
             c0  = (i % 2) * 2
             col_fn = COLOR_MAP.get(key)
-            try:
-                val_color = col_fn(val) if col_fn else C['white']
-            except Exception:
-                val_color = C['white']
+            val_color = col_fn(m) if col_fn else C['white']
 
             tk.Label(self._grid, text=key, font=('Consolas',7),
                      bg=C['bg2'], fg=C['muted'], anchor='w'
@@ -662,6 +639,9 @@ class QuantDashboard:
 
         # ── Live state ────────────────────────────────────────
         self.live_store  = LiveDataStore()
+        self.tick_bus    = TickBus(keep=TICK_LOG_LINES)
+        self.live_store.subscribe(self.tick_bus)
+        self._tick_log_ticker = None
         self.ws_manager  = WebSocketManager(self.live_store, list(DEFAULT_LIVE_TICKERS))
         self.live_ani    = None
         self.live_canvas_widget = None
@@ -672,15 +652,33 @@ class QuantDashboard:
         self.ws_manager.status_var = self.ws_status_var
         self.live_selected_ticker  = tk.StringVar(value=DEFAULT_LIVE_TICKERS[0])
         self.live_resample_var     = tk.StringVar(value="1min")
+        self.live_feed_var         = tk.StringVar(value=FEED_SOURCES[0])
+        self._feed_server          = None
+        self._feed_kind            = None
 
         self.live_indicator_states = {n: tk.BooleanVar(value=False)
                                       for n in ['RSI','MACD','Bollinger Bands',
                                                 'Stochastic','Volume']}
         self.live_ma_states = {n: tk.BooleanVar(value=False) for n in ['SMA','EMA']}
-        self.alert_thresholds: dict[str, tuple] = {}
+        self.data_service = get_service()
+        self.data_service.attach_tk(self.root)
+        self.quotes       = QuoteService(self.data_service)   # watchlist snapshots
+        self._multi_req   = []     # per-ticker fetches of the Multi-Ticker grid
+        self._fetch_gen   = 0;  self._fetch_req = None    # Historical: newest request wins
+        self._plot_gen    = 0;  self._plot_req  = None
+        self._ind_cache   = {}; self._ind_data  = None    # series for the loaded data, keyed by params
+        self._hist_fig    = None; self._hist_data = None  # persistent Historical figure
+        self._hover_cols  = []
+        self.alerts = AlertEngine()
+        self.alerts.attach(self.live_store)
+        self.alert_ids: dict[str, list] = {}       # ticker → alert ids set from the form
 
         # ── Watchlist ─────────────────────────────────────────
         self.watchlist: list[str] = self._load_watchlist()
+        self._watch_quotes: dict = {}          # ticker → {'last','prev','chg','high52','low52'}
+        self._watch_shown:  dict = {}          # ticker → (values, tag) currently in the tree
+        self._watch_yf:     dict = {}          # yf ticker → watchlist entries
+        self._watch_sort_by = (None, False)    # (column, descending)
 
         self._setup_ui()
 
@@ -739,6 +737,7 @@ class QuantDashboard:
         self._build_live_tab()
         self._build_multi_tab()
         self._build_watchlist_tab()
+        self.root.after(200, self._drain_alerts)
 
     def _set_status(self, msg):
         self.statusbar_var.set(msg)
@@ -1110,473 +1109,611 @@ class QuantDashboard:
         start = self.start_date.get_date().strftime('%Y-%m-%d')
         end   = self.end_date.get_date().strftime('%Y-%m-%d')
 
-        try:
-            for w in self.chart_container.winfo_children(): w.destroy()
-            tk.Label(self.chart_container,
-                     text=f"Loading {yf_ticker}…",
-                     font=('Consolas',15,'bold'), bg=C['bg2'], fg=C['accent']).pack(expand=True)
-            self.root.update()
-
-            self.data = fetch_data(yf_ticker, start, end)
-            if self.data is None or self.data.empty:
-                # Try alternative exchange suffix if Auto
-                if market == 'Auto' and '.' not in yf_ticker and not yf_ticker.startswith('^'):
-                    alt = f"{raw.upper()}.BO"
-                    self.data = fetch_data(alt, start, end)
-                    if self.data is not None and not self.data.empty:
-                        yf_ticker = alt; exchange = 'BSE'; currency = '₹'
-                        self.resolved_label_var.set(f"→ {yf_ticker}  [{exchange}]  {currency}  (BSE fallback)")
-                    else:
-                        messagebox.showerror("No Data",
-                            f"No data for '{raw}'.\n\n"
-                            f"Tried: {yf_ticker}, {alt}\n\n"
-                            f"Tips:\n"
-                            f"• NSE tickers need .NS  (e.g. RELIANCE.NS)\n"
-                            f"• BSE tickers need .BO  (e.g. RELIANCE.BO)\n"
-                            f"• Or select Market = NSE/BSE before fetching\n"
-                            f"• Indices: ^NSEI (Nifty), ^BSESN (Sensex)")
-                        return
-                else:
-                    messagebox.showerror("No Data",
-                        f"No data for '{yf_ticker}'.\n\n"
-                        f"Tips:\n"
-                        f"• NSE: RELIANCE.NS  or select Market=NSE\n"
-                        f"• BSE: RELIANCE.BO  or select Market=BSE\n"
-                        f"• Indices: ^NSEI, ^BSESN\n"
-                        f"• Crypto: BTC-USD, ETH-USD")
-                    return
-
-            self.current_ticker    = display_name
-            self.current_yf_ticker = yf_ticker
-            self.current_currency  = currency
-            self.current_exchange  = exchange
-            self.current_start     = start
-            self.current_end       = end
-
-            # Fetch benchmark if enabled
-            self.benchmark_data = None
-            if self.extra_overlay_states['Benchmark'].get():
-                bmk_ticker = self.benchmark_var.get().strip()
-                if bmk_ticker and bmk_ticker.upper() != 'CUSTOM':
-                    try:
-                        self.benchmark_data = fetch_data(bmk_ticker, start, end)
-                    except Exception:
-                        pass
-
-            # Quant metrics
-            metrics = compute_quant_metrics(
-                self.data['Close'],
-                self.benchmark_data['Close'] if self.benchmark_data is not None else None
-            )
-            self.metrics_card.update(metrics)
-
-            self._set_status(
-                f"✓ {yf_ticker}  [{exchange}]  {currency}  |  "
-                f"{len(self.data)} bars  |  {start} → {end}")
-            self.update_plot()
-
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
-            import traceback; traceback.print_exc()
+        # Try alternative exchange suffix if Auto
+        alt = (f"{raw.upper()}.BO" if market == 'Auto' and '.' not in yf_ticker
+               and not yf_ticker.startswith('^') else None)
+        bmk = None
+        if self.extra_overlay_states['Benchmark'].get():
+            bmk = self.benchmark_var.get().strip()
+            if not bmk or bmk.upper() == 'CUSTOM': bmk = None
+
+        for w in self.chart_container.winfo_children(): w.destroy()
+        tk.Label(self.chart_container,
+                 text=f"Loading {yf_ticker}…",
+                 font=('Consolas',15,'bold'), bg=C['bg2'], fg=C['accent']).pack(expand=True)
+
+        # main + benchmark fetched concurrently on the data service; a newer request supersedes this one
+        self._fetch_gen += 1; gen = self._fetch_gen
+        if self._fetch_req is not None: self._fetch_req.cancel()
+        req = dict(raw=raw, yf_ticker=yf_ticker, alt=alt, currency=currency, exchange=exchange,
+                   display_name=display_name, start=start, end=end)
+        self._fetch_req = self.data_service.submit(
+            self._load_historical(yf_ticker, alt, bmk, start, end),
+            callback=lambda res: self._on_historical(gen, req, *res),
+            errback=lambda e: self._on_historical_error(gen, e))
+
+    async def _load_historical(self, yf_ticker, alt, bmk, start, end):
+        """Runs on the data-service loop: (ticker used, data, benchmark, quant metrics)."""
+        svc  = self.data_service
+        jobs = [svc.afetch(yf_ticker, start, end)] + ([svc.afetch(bmk, start, end)] if bmk else [])
+        data, *bench = await asyncio.gather(*jobs, return_exceptions=True)
+        if isinstance(data, Exception): raise data
+        used = yf_ticker
+        if (data is None or data.empty) and alt:
+            data = await svc.afetch(alt, start, end); used = alt
+        if data is None or data.empty: return used, None, None, None
+        bench = bench[0] if bench and isinstance(bench[0], pd.DataFrame) and not bench[0].empty else None
+        metrics = await svc.acall(compute_quant_metrics, data['Close'],
+                                  bench['Close'] if bench is not None else None)
+        return used, data, bench, metrics
+
+    def _on_historical_error(self, gen, exc):
+        if gen != self._fetch_gen: return
+        self._fetch_req = None
+        messagebox.showerror("Error", str(exc))
+
+    def _on_historical(self, gen, req, used, data, bench, metrics):
+        if gen != self._fetch_gen: return
+        self._fetch_req = None
+        yf_ticker, alt = req['yf_ticker'], req['alt']
+        currency, exchange = req['currency'], req['exchange']
+        if data is None:
+            if alt:
+                messagebox.showerror("No Data",
+                    f"No data for '{req['raw']}'.\n\n"
+                    f"Tried: {yf_ticker}, {alt}\n\n"
+                    f"Tips:\n"
+                    f"• NSE tickers need .NS  (e.g. RELIANCE.NS)\n"
+                    f"• BSE tickers need .BO  (e.g. RELIANCE.BO)\n"
+                    f"• Or select Market = NSE/BSE before fetching\n"
+                    f"• Indices: ^NSEI (Nifty), ^BSESN (Sensex)")
+            else:
+                messagebox.showerror("No Data",
+                    f"No data for '{yf_ticker}'.\n\n"
+                    f"Tips:\n"
+                    f"• NSE: RELIANCE.NS  or select Market=NSE\n"
+                    f"• BSE: RELIANCE.BO  or select Market=BSE\n"
+                    f"• Indices: ^NSEI, ^BSESN\n"
+                    f"• Crypto: BTC-USD, ETH-USD")
+            return
+        if used != yf_ticker:
+            yf_ticker = used; exchange = 'BSE'; currency = '₹'
+            self.resolved_label_var.set(f"→ {yf_ticker}  [{exchange}]  {currency}  (BSE fallback)")
+
+        self.data              = data
+        self.benchmark_data    = bench
+        self.current_ticker    = req['display_name']
+        self.current_yf_ticker = yf_ticker
+        self.current_currency  = currency
+        self.current_exchange  = exchange
+        self.current_start     = req['start']
+        self.current_end       = req['end']
+
+        self.metrics_card.update(metrics)
+        self._set_status(
+            f"✓ {yf_ticker}  [{exchange}]  {currency}  |  "
+            f"{len(self.data)} bars  |  {req['start']} → {req['end']}")
+        self.update_plot()
 
     # ── MASTER PLOT BUILDER ───────────────────────────────────
     def update_plot(self):
+        """Snapshot the controls, compute missing series on the worker pool, sync the newest result."""
         if self.data is None or self.data.empty:
             return
+        spec = self._plot_spec(); data = self.data
+        self._plot_gen += 1; gen = self._plot_gen
+        if self._plot_req is not None: self._plot_req.cancel(); self._plot_req = None
+        if self._ind_data is not data: self._ind_cache = {}; self._ind_data = data
+        missing = set(_plot_jobs(data, spec)) - set(self._ind_cache)
+        if not missing:                            # toggles over cached series: no worker round-trip
+            self._render_plot(gen, data, spec, {}); return
+        self._plot_req = self.data_service.call(
+            compute_plot_indicators, data, spec, missing,
+            callback=lambda ind: self._render_plot(gen, data, spec, ind))
+
+    def _plot_spec(self) -> dict:
+        on = {k: v.get() for k, v in self.indicator_states.items()}
+        return {
+            'on':    on,
+            'extra': {k: v.get() for k, v in self.extra_overlay_states.items()},
+            'sub':   [k for k in SUB_PANEL_INDS if on.get(k)],
+            'ma':    [k for k, v in self.ma_states.items() if v.get()],
+            'p': {
+                'bb':       self._get_period('Bollinger Bands', 'bb'),
+                'rsi':      self._get_period('RSI', 'rsi'),
+                'atr':      self._get_period('ATR', 'atr'),
+                'williams': self._get_period('Williams %R', 'williams'),
+                'adx':      self._get_period('ADX', 'adx'),
+                'slope':    self._get_period('Slope', 'slope'),
+                'ma':       self._get_period('SMA', 'ma'),
+                'rvwap':    self.period_config.get('rvwap', 20),
+                'macd':     self.period_config.get('macd', (12,26,9)),
+                'stoch':    self.period_config.get('stoch', (14,3)),
+            },
+        }
+
+    def _render_plot(self, gen, data, spec, ind):
+        if data is self._ind_data: self._ind_cache.update(ind)
+        if gen != self._plot_gen: return          # superseded by a newer toggle / fetch
+        self._plot_req = None
+        if self._hist_fig is None or self._hist_data is not self.data:
+            self._build_hist_figure()
+        ind = self._ind_cache
+        ax  = self._hist_ax; reg = self._hist_layers
+
+        # overlays: drop layers no longer wanted, draw only the new ones
+        wanted = self._overlay_layers(spec, ind)
+        for k in [k for k in reg.keys() if k not in wanted]: reg.remove(k)
+        for k, draw in wanted.items():
+            if k not in reg: self._hist_lod.track(reg.add(k, ax, draw))
+
+        panels = self._panel_layers(spec, ind)
+        if list(panels) != list(self._hist_panels): self._layout_panels(panels)
+
+        # Re-lock tight Y after all overlays (overlays may push y to 0)
+        lo = self.data['Low'].min()
+        hi = self.data['High'].max()
+        pad = (hi - lo) * 0.03
+        ax.set_ylim(lo - pad, hi + pad * 3)
+        if ax.get_legend() is not None: ax.get_legend().remove()
+        handles, labels = ax.get_legend_handles_labels()
+        if handles:
+            ax.legend(loc='upper left', facecolor=C['bg3'], edgecolor=C['border'],
+                      labelcolor=C['white'], fontsize=6, framealpha=0.7)
+        self._hover_cols = self._hover_columns(spec)
+        self._hist_canvas.draw_idle()
+
+    def _build_hist_figure(self):
+        """Candles, axes, canvas and toolbar — once per loaded dataset."""
         for w in self.chart_container.winfo_children():
             w.destroy()
-
         ccy = self.current_currency
+        fig = Figure(figsize=(13,8), facecolor=C['bg'], dpi=100)
+        gs  = fig.add_gridspec(1, 1, hspace=0.08)
+        ax_main = fig.add_subplot(gs[0])
+        style_ax(ax_main)
+        lod = LODView(ax_main)            # candles / long lines follow toolbar zoom & pan
+        d_idx = draw_candles(ax_main, self.data)
+
+        # ── Y-axis: currency formatting ────────────────────────
+        ax_main.yaxis.set_major_formatter(
+            mticker.FuncFormatter(lambda x, _: f"{ccy}{x:,.0f}" if abs(x) >= 1000 else f"{ccy}{x:.2f}"))
+        ax_main.set_title(
+            f'{self.current_ticker}  ·  [{self.current_exchange}]  ·  '
+            f'{self.current_start} → {self.current_end}  ·  {self.current_timeframe}',
+            color=C['white'], fontsize=11, fontweight='bold', pad=8)
+        ax_main.set_ylabel(f'Price ({ccy})', color=C['muted'], fontsize=8)
+        set_x_date_ticks(ax_main, d_idx)
 
-        sub_panel_inds = ['MACD','ATR','RSI','Stochastic','Williams %R','OBV','ADX','Slope']
-        active_sub = [n for n in sub_panel_inds if self.indicator_states[n].get()]
-        n = len(active_sub)
-        show_vol = self.extra_overlay_states['Volume'].get()
+        canvas = FigureCanvasTkAgg(fig, self.chart_container)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+        toolbar_frame = tk.Frame(self.chart_container, bg=C['bg2'])
+        toolbar_frame.pack(fill=tk.X)
+        toolbar = NavigationToolbar2Tk(canvas, toolbar_frame)
+        toolbar.config(bg=C['bg2'])
+        toolbar.update()
 
-        n_rows  = 1 + (1 if show_vol else 0) + n
-        ratios  = [5] + ([1] if show_vol else []) + [1.5]*n
-        fig     = Figure(figsize=(13,8), facecolor=C['bg'], dpi=100)
-        gs      = fig.add_gridspec(n_rows, 1, height_ratios=ratios, hspace=0.08)
+        self._hist_fig, self._hist_ax, self._hist_canvas = fig, ax_main, canvas
+        self._hist_data, self._hist_d_idx = self.data, d_idx
+        self._hist_layers = ArtistRegistry(); self._hist_panels = {}; self._hist_lod = lod
+        self._attach_crosshair(canvas, fig, ax_main, d_idx)
 
-        row_idx = 0
-        ax_main = fig.add_subplot(gs[row_idx]); row_idx += 1
-        style_ax(ax_main)
+    def _layout_panels(self, panels):
+        """Re-grid volume / indicator panels; surviving panels keep their artists."""
+        fig, old = self._hist_fig, self._hist_panels
+        for k in [k for k in old if k not in panels]: fig.delaxes(old.pop(k))
+        ratios = [5] + [1 if k[0] == 'Volume' else 1.5 for k in panels]
+        gs = fig.add_gridspec(len(ratios), 1, height_ratios=ratios, hspace=0.08)
+        self._hist_ax.set_subplotspec(gs[0])
+        new = {}
+        for i, (k, draw) in enumerate(panels.items(), 1):
+            ax_i = old.get(k)
+            if ax_i is None:
+                ax_i = fig.add_subplot(gs[i])
+                style_ax(ax_i)
+                ax_i.set_xlim(-0.5, len(self.data)-0.5)
+                set_x_date_ticks(ax_i, self._hist_d_idx)
+                view = LODView(ax_i)
+                draw(ax_i)
+                view.track(ax_i.lines)
+            else:
+                ax_i.set_subplotspec(gs[i])
+            new[k] = ax_i
+        self._hist_panels = new
 
-        d_idx = draw_candles(ax_main, self.data)
-        x_idx = np.arange(len(d_idx))
+    def _overlay_layers(self, spec, ind) -> dict:
+        """Ordered {layer key: draw(ax)} for the main price axes; keys carry every parameter."""
+        on, ex, P = spec['on'], spec['extra'], spec['p']
+        data = self.data; ccy = self.current_currency
+        x_idx = np.arange(len(self._hist_d_idx))
+        out = {}
 
         # ── Benchmark overlay ─────────────────────────────────
-        if (self.extra_overlay_states['Benchmark'].get() and
+        if (ex['Benchmark'] and
                 self.benchmark_data is not None and not self.benchmark_data.empty):
-            bmk = self.benchmark_data['Close'].reindex(self.data.index, method='ffill')
-            # Normalise to same starting price
-            scale = self.data['Close'].iloc[0] / bmk.iloc[0]
-            bmk_scaled = bmk * scale
-            ax_main.plot(x_idx, bmk_scaled.values,
-                         color=C['muted'], lw=1, linestyle=':', alpha=0.6,
-                         label=f'Benchmark ({self.benchmark_var.get()})')
+            def _bmk(ax, name=self.benchmark_var.get()):
+                bmk = self.benchmark_data['Close'].reindex(data.index, method='ffill')
+                # Normalise to same starting price
+                scale = data['Close'].iloc[0] / bmk.iloc[0]
+                bmk_scaled = bmk * scale
+                ax.plot(x_idx, bmk_scaled.values,
+                        color=C['muted'], lw=1, linestyle=':', alpha=0.6,
+                        label=f'Benchmark ({name})')
+            out[('Benchmark', id(self.benchmark_data))] = _bmk
 
         # ── Bollinger Bands ───────────────────────────────────
-        if self.indicator_states['Bollinger Bands'].get():
-            p = self._get_period('Bollinger Bands', 'bb')
-            bu, bm, bl = bb_bands(self.data['Close'], period=p)
-            ax_main.plot(x_idx, bu.values, color=C['gold'],  linestyle='--', lw=1,   alpha=0.8, label=f'BB↑({p})')
-            ax_main.plot(x_idx, bm.values, color=C['cyan'],  linestyle='-.', lw=0.8, alpha=0.7, label='BB mid')
-            ax_main.plot(x_idx, bl.values, color=C['gold'],  linestyle='--', lw=1,   alpha=0.8, label=f'BB↓({p})')
-            ax_main.fill_between(x_idx, bu.values, bl.values, alpha=0.06, color=C['gold'])
-
-        if self.indicator_states['Ichimoku'].get():
-            t, k, sa, sb_l, ch = ichimoku(self.data)
-            ax_main.plot(x_idx, t.values,    color='#ff6b6b', lw=1,   label='Tenkan')
-            ax_main.plot(x_idx, k.values,    color='#4ecdc4', lw=1,   label='Kijun')
-            ax_main.plot(x_idx, sa.values,   color='#a8e6cf', lw=0.8, alpha=0.7, label='Senkou A')
-            ax_main.plot(x_idx, sb_l.values, color='#ff8b94', lw=0.8, alpha=0.7, label='Senkou B')
-            ax_main.fill_between(x_idx, sa.values, sb_l.values,
-                                  where=sa.values >= sb_l.values, alpha=0.12, color='#a8e6cf')
-            ax_main.fill_between(x_idx, sa.values, sb_l.values,
-                                  where=sa.values <  sb_l.values, alpha=0.12, color='#ff8b94')
-
-        if self.indicator_states['Parabolic SAR'].get():
-            sar_s, trend_s = parabolic_sar(self.data)
-            ax_main.scatter(x_idx[trend_s.values == 1],  sar_s.values[trend_s.values == 1],
-                            color=C['green'], s=8, marker='.', alpha=0.9, label='SAR↑', zorder=5)
-            ax_main.scatter(x_idx[trend_s.values == -1], sar_s.values[trend_s.values == -1],
-                            color=C['red'],   s=8, marker='.', alpha=0.9, label='SAR↓', zorder=5)
-
-        if self.indicator_states['Fibonacci'].get():
+        if on['Bollinger Bands']:
+            def _bb(ax, p=P['bb']):
+                bu, bm, bl = ind[('bb', p)]
+                ax.plot(x_idx, bu.values, color=C['gold'],  linestyle='--', lw=1,   alpha=0.8, label=f'BB↑({p})')
+                ax.plot(x_idx, bm.values, color=C['cyan'],  linestyle='-.', lw=0.8, alpha=0.7, label='BB mid')
+                ax.plot(x_idx, bl.values, color=C['gold'],  linestyle='--', lw=1,   alpha=0.8, label=f'BB↓({p})')
+                fill_between(ax, x_idx, bu.values, bl.values, alpha=0.06, color=C['gold'])
+            out[('bb', P['bb'])] = _bb
+
+        if on['Ichimoku']:
+            def _ichi(ax):
+                t, k, sa, sb_l, ch = ind[('ichimoku',)]
+                ax.plot(x_idx, t.values,    color='#ff6b6b', lw=1,   label='Tenkan')
+                ax.plot(x_idx, k.values,    color='#4ecdc4', lw=1,   label='Kijun')
+                ax.plot(x_idx, sa.values,   color='#a8e6cf', lw=0.8, alpha=0.7, label='Senkou A')
+                ax.plot(x_idx, sb_l.values, color='#ff8b94', lw=0.8, alpha=0.7, label='Senkou B')
+                fill_between(ax, x_idx, sa.values, sb_l.values,
+                             where=sa.values >= sb_l.values, alpha=0.12, color='#a8e6cf')
+                fill_between(ax, x_idx, sa.values, sb_l.values,
+                             where=sa.values <  sb_l.values, alpha=0.12, color='#ff8b94')
+            out[('ichimoku',)] = _ichi
+
+        if on['Parabolic SAR']:
+            def _sar(ax):
+                sar_s, trend_s = ind[('sar',)]
+                scatter(ax, x_idx[trend_s.values == 1],  sar_s.values[trend_s.values == 1],
+                        color=C['green'], s=8, marker='.', alpha=0.9, label='SAR↑', zorder=5)
+                scatter(ax, x_idx[trend_s.values == -1], sar_s.values[trend_s.values == -1],
+                        color=C['red'],   s=8, marker='.', alpha=0.9, label='SAR↓', zorder=5)
+            out[('sar',)] = _sar
+
+        if on['Fibonacci']:
             # Determine slice for Fib calculation
-            fib_data = self.data
-            fib_start_xi = 0
-            fib_end_xi   = len(self.data) - 1
-
+            fib_range = None
             if self.fib_use_range.get() and self.fib_start_var is not None:
-                fs = pd.Timestamp(self.fib_start_var.get_date())
-                fe = pd.Timestamp(self.fib_end_var.get_date())
-                mask = (self.data.index >= fs) & (self.data.index <= fe)
-                if mask.any():
-                    fib_data    = self.data.loc[mask]
-                    fib_start_xi = np.where(mask)[0][0]
-                    fib_end_xi   = np.where(mask)[0][-1]
-
-            # Find swing high and low in the selected range
+                fib_range = (pd.Timestamp(self.fib_start_var.get_date()),
+                             pd.Timestamp(self.fib_end_var.get_date()))
             mode     = getattr(self, 'fib_mode_var', None)
             mode_val = mode.get() if mode else "High→Low"
-            swing_h  = float(fib_data['High'].max())
-            swing_l  = float(fib_data['Low'].min())
-
-            # Fibonacci ratios
-            fib_ratios = [0, 0.236, 0.382, 0.5, 0.618, 0.786, 1.0,
-                          1.272, 1.618]
-            fib_labels = ['0%','23.6%','38.2%','50%','61.8%','78.6%','100%',
-                          '127.2%','161.8%']
-            fib_colors = ['#ff6b6b','#ffb347','#ffd700','#98fb98',
-                          '#00e5ff','#ce93d8','#4ecdc4','#ff6b6b','#ffb347']
-
-            if mode_val == "High→Low":
-                price_start, price_end = swing_h, swing_l
-            else:
-                price_start, price_end = swing_l, swing_h
-
-            diff = price_end - price_start
-
-            # Draw shaded zone between 38.2% and 61.8% (Golden Zone)
-            gz_lo = price_start + diff * 0.382
-            gz_hi = price_start + diff * 0.618
-            ax_main.axhspan(min(gz_lo,gz_hi), max(gz_lo,gz_hi),
-                            alpha=0.07, color='#ffd700', zorder=0,
-                            label='Golden Zone 38.2–61.8%')
-
-            for ratio, lbl, fc in zip(fib_ratios, fib_labels, fib_colors):
-                lvl = price_start + diff * ratio
-                ax_main.axhline(lvl, color=fc, linestyle=':', lw=0.9, alpha=0.75)
-
-                # Label at RIGHT edge showing price and ratio
-                ax_main.text(len(self.data) - 0.5, lvl,
-                             f'  {lbl}  {fmt_price(lvl, ccy)}',
-                             color=fc, fontsize=5.5, va='center',
-                             fontfamily='Consolas',
-                             bbox=dict(facecolor=C['bg'], alpha=0.5, pad=0.5,
-                                       edgecolor='none'))
-
-            # Mark the swing points on chart
-            h_xi = int(fib_data['High'].values.argmax()) + fib_start_xi
-            l_xi = int(fib_data['Low'].values.argmin())  + fib_start_xi
-            ax_main.annotate(f'⬆ {fmt_price(swing_h,ccy)}',
-                             xy=(h_xi, swing_h), fontsize=6, color='#ffd700',
-                             fontfamily='Consolas',
-                             xytext=(h_xi, swing_h + (swing_h-swing_l)*0.02),
-                             arrowprops=dict(arrowstyle='->', color='#ffd700', lw=0.8))
-            ax_main.annotate(f'⬇ {fmt_price(swing_l,ccy)}',
-                             xy=(l_xi, swing_l), fontsize=6, color='#ff6b6b',
-                             fontfamily='Consolas',
-                             xytext=(l_xi, swing_l - (swing_h-swing_l)*0.02),
-                             arrowprops=dict(arrowstyle='->', color='#ff6b6b', lw=0.8))
-
-            # Highlight the selected fib range with a vertical band
-            if self.fib_use_range.get():
-                ax_main.axvspan(fib_start_xi, fib_end_xi,
-                                alpha=0.05, color='#ffd700', zorder=0)
-
-        if self.indicator_states['Pivot Points'].get():
-            pp = pivot_points(self.data)
-            for lbl, lvl in pp.items():
-                fc = C['green'] if lbl.startswith('R') else (C['red'] if lbl.startswith('S') else C['gold'])
-                ax_main.axhline(lvl, color=fc, linestyle='--', lw=0.7, alpha=0.6)
-                ax_main.text(0, lvl, f' {lbl}:{fmt_price(lvl,ccy)}', color=fc, fontsize=5, va='center')
-
-        if self.extra_overlay_states['VWAP'].get() and 'Volume' in self.data.columns:
-            p  = self.period_config.get('rvwap', 20)
-            vw = RVWAP(self.data['High'], self.data['Low'],
-                       self.data['Close'], self.data['Volume'], period=p)
-            ax_main.plot(x_idx, vw.values, color='#ff6b81', lw=1.2,
-                         linestyle='-.', alpha=0.85, label=f'RVWAP({p})')
+            out[('Fibonacci', mode_val, fib_range)] = lambda ax: self._draw_fibonacci(ax, fib_range, mode_val)
+
+        if on['Pivot Points']:
+            def _pivots(ax):
+                for lbl, lvl in ind[('pivots',)].items():
+                    fc = C['green'] if lbl.startswith('R') else (C['red'] if lbl.startswith('S') else C['gold'])
+                    ax.axhline(lvl, color=fc, linestyle='--', lw=0.7, alpha=0.6)
+                    ax.text(0, lvl, f' {lbl}:{fmt_price(lvl,ccy)}', color=fc, fontsize=5, va='center')
+            out[('pivots',)] = _pivots
+
+        if ex['VWAP'] and 'Volume' in data.columns:
+            def _vwap(ax, p=P['rvwap']):
+                ax.plot(x_idx, ind[('rvwap', p)].values, color='#ff6b81', lw=1.2,
+                        linestyle='-.', alpha=0.85, label=f'RVWAP({p})')
+            out[('vwap', P['rvwap'])] = _vwap
 
         # ── Moving Averages ───────────────────────────────────
-        mp = self._get_period('SMA', 'ma')
-        ma_colors = {'SMA':'#29b6f6','EMA':'#ffb347','DEMA':'#ce93d8',
-                     'TEMA':'#ffd580','RVWAP':'#ff6b81'}
-        for n_ma, v_ma in self.ma_states.items():
-            if not v_ma.get(): continue
-            if n_ma == 'SMA':
-                ax_main.plot(x_idx, sma(self.data['Close'], mp).values,
-                             color=ma_colors['SMA'], lw=1.4, linestyle='--', alpha=0.85, label=f'SMA({mp})')
-            elif n_ma == 'EMA':
-                ax_main.plot(x_idx, ema(self.data['Close'], mp).values,
-                             color=ma_colors['EMA'], lw=1.4, linestyle='--', alpha=0.85, label=f'EMA({mp})')
-            elif n_ma == 'DEMA':
-                ax_main.plot(x_idx, demma(self.data['Close'], mp).values,
-                             color=ma_colors['DEMA'], lw=1.4, linestyle='-.', alpha=0.85, label=f'DEMA({mp})')
-            elif n_ma == 'TEMA':
-                ax_main.plot(x_idx, temma(self.data['Close'], mp).values,
-                             color=ma_colors['TEMA'], lw=1.4, linestyle='-.', alpha=0.85, label=f'TEMA({mp})')
-            elif n_ma == 'RVWAP' and 'Volume' in self.data.columns:
-                p_rv = self.period_config.get('rvwap', 20)
-                rv = RVWAP(self.data['High'], self.data['Low'],
-                           self.data['Close'], self.data['Volume'], period=p_rv)
-                ax_main.plot(x_idx, rv.values, color=ma_colors['RVWAP'], lw=1.4,
-                             linestyle='-.', alpha=0.85, label=f'RVWAP({p_rv})')
-
-        # ── Y-axis: currency formatting ────────────────────────
-        sym = ccy
-        ax_main.yaxis.set_major_formatter(
-            mticker.FuncFormatter(lambda x, _: f"{sym}{x:,.0f}" if abs(x) >= 1000 else f"{sym}{x:.2f}"))
+        mp = P['ma']
+        ma_style = {'SMA':  ('#29b6f6', '--'), 'EMA':  ('#ffb347', '--'),
+                    'DEMA': ('#ce93d8', '-.'), 'TEMA': ('#ffd580', '-.')}
+        for n_ma in spec['ma']:
+            if n_ma in ma_style:
+                def _ma(ax, n_ma=n_ma):
+                    clr, ls = ma_style[n_ma]
+                    ax.plot(x_idx, ind[(n_ma, mp)].values,
+                            color=clr, lw=1.4, linestyle=ls, alpha=0.85, label=f'{n_ma}({mp})')
+                out[('ma', n_ma, mp)] = _ma
+            elif n_ma == 'RVWAP' and 'Volume' in data.columns:
+                def _rv(ax, p_rv=P['rvwap']):
+                    ax.plot(x_idx, ind[('rvwap', p_rv)].values, color='#ff6b81', lw=1.4,
+                            linestyle='-.', alpha=0.85, label=f'RVWAP({p_rv})')
+                out[('ma', 'RVWAP', P['rvwap'])] = _rv
 
         # ── Volume Profile overlay ─────────────────────────────
-        if self.extra_overlay_states['Volume Profile'].get() and 'Volume' in self.data.columns:
+        if ex['Volume Profile'] and 'Volume' in data.columns:
             n_bins = self.vp_bins_sp.get() if hasattr(self, 'vp_bins_sp') else 40
             vp_start_xi, vp_end_xi = None, None
-
             if self.vp_use_range.get() and hasattr(self, 'vp_start_date'):
                 vs = pd.Timestamp(self.vp_start_date.get_date())
                 ve = pd.Timestamp(self.vp_end_date.get_date())
-                mask = (self.data.index >= vs) & (self.data.index <= ve)
+                mask = (data.index >= vs) & (data.index <= ve)
                 if mask.any():
                     vp_start_xi = int(np.where(mask)[0][0])
                     vp_end_xi   = int(np.where(mask)[0][-1])
-                    # Highlight VP range
-                    ax_main.axvspan(vp_start_xi, vp_end_xi,
-                                    alpha=0.04, color=C['teal'], zorder=0)
 
-            draw_volume_profile(ax_main, self.data,
-                                fib_start_idx=vp_start_xi, fib_end_idx=vp_end_xi,
-                                n_bins=n_bins)
-
-        # Re-lock tight Y after all overlays (overlays may push y to 0)
-        lo = self.data['Low'].min()
-        hi = self.data['High'].max()
-        pad = (hi - lo) * 0.03
-        ax_main.set_ylim(lo - pad, hi + pad * 3)
+            def _vp(ax):
+                if vp_start_xi is not None:
+                    # Highlight VP range
+                    ax.axvspan(vp_start_xi, vp_end_xi, alpha=0.04, color=C['teal'], zorder=0)
+                draw_volume_profile(ax, data, fib_start_idx=vp_start_xi, fib_end_idx=vp_end_xi,
+                                    n_bins=n_bins)
+            out[('vp', n_bins, vp_start_xi, vp_end_xi)] = _vp
+        return out
 
-        ax_main.set_title(
-            f'{self.current_ticker}  ·  [{self.current_exchange}]  ·  '
-            f'{self.current_start} → {self.current_end}  ·  {self.current_timeframe}',
-            color=C['white'], fontsize=11, fontweight='bold', pad=8)
-        ax_main.set_ylabel(f'Price ({ccy})', color=C['muted'], fontsize=8)
-        set_x_date_ticks(ax_main, d_idx)
-        handles, labels = ax_main.get_legend_handles_labels()
-        if handles:
-            ax_main.legend(loc='upper left', facecolor=C['bg3'], edgecolor=C['border'],
-                           labelcolor=C['white'], fontsize=6, framealpha=0.7)
+    def _draw_fibonacci(self, ax_main, fib_range, mode_val):
+        ccy = self.current_currency
+        fib_data = self.data
+        fib_start_xi = 0
+        fib_end_xi   = len(self.data) - 1
+
+        if fib_range is not None:
+            fs, fe = fib_range
+            mask = (self.data.index >= fs) & (self.data.index <= fe)
+            if mask.any():
+                fib_data    = self.data.loc[mask]
+                fib_start_xi = np.where(mask)[0][0]
+                fib_end_xi   = np.where(mask)[0][-1]
+
+        # Find swing high and low in the selected range
+        swing_h  = float(fib_data['High'].max())
+        swing_l  = float(fib_data['Low'].min())
+
+        # Fibonacci ratios
+        fib_ratios = [0, 0.236, 0.382, 0.5, 0.618, 0.786, 1.0,
+                      1.272, 1.618]
+        fib_labels = ['0%','23.6%','38.2%','50%','61.8%','78.6%','100%',
+                      '127.2%','161.8%']
+        fib_colors = ['#ff6b6b','#ffb347','#ffd700','#98fb98',
+                      '#00e5ff','#ce93d8','#4ecdc4','#ff6b6b','#ffb347']
+
+        if mode_val == "High→Low":
+            price_start, price_end = swing_h, swing_l
+        else:
+            price_start, price_end = swing_l, swing_h
+
+        diff = price_end - price_start
+
+        # Draw shaded zone between 38.2% and 61.8% (Golden Zone)
+        gz_lo = price_start + diff * 0.382
+        gz_hi = price_start + diff * 0.618
+        ax_main.axhspan(min(gz_lo,gz_hi), max(gz_lo,gz_hi),
+                        alpha=0.07, color='#ffd700', zorder=0,
+                        label='Golden Zone 38.2–61.8%')
+
+        for ratio, lbl, fc in zip(fib_ratios, fib_labels, fib_colors):
+            lvl = price_start + diff * ratio
+            ax_main.axhline(lvl, color=fc, linestyle=':', lw=0.9, alpha=0.75)
+
+            # Label at RIGHT edge showing price and ratio
+            ax_main.text(len(self.data) - 0.5, lvl,
+                         f'  {lbl}  {fmt_price(lvl, ccy)}',
+                         color=fc, fontsize=5.5, va='center',
+                         fontfamily='Consolas',
+                         bbox=dict(facecolor=C['bg'], alpha=0.5, pad=0.5,
+                                   edgecolor='none'))
+
+        # Mark the swing points on chart
+        h_xi = int(fib_data['High'].values.argmax()) + fib_start_xi
+        l_xi = int(fib_data['Low'].values.argmin())  + fib_start_xi
+        ax_main.annotate(f'⬆ {fmt_price(swing_h,ccy)}',
+                         xy=(h_xi, swing_h), fontsize=6, color='#ffd700',
+                         fontfamily='Consolas',
+                         xytext=(h_xi, swing_h + (swing_h-swing_l)*0.02),
+                         arrowprops=dict(arrowstyle='->', color='#ffd700', lw=0.8))
+        ax_main.annotate(f'⬇ {fmt_price(swing_l,ccy)}',
+                         xy=(l_xi, swing_l), fontsize=6, color='#ff6b6b',
+                         fontfamily='Consolas',
+                         xytext=(l_xi, swing_l - (swing_h-swing_l)*0.02),
+                         arrowprops=dict(arrowstyle='->', color='#ff6b6b', lw=0.8))
+
+        # Highlight the selected fib range with a vertical band
+        if fib_range is not None:
+            ax_main.axvspan(fib_start_xi, fib_end_xi,
+                            alpha=0.05, color='#ffd700', zorder=0)
+
+    def _panel_layers(self, spec, ind) -> dict:
+        """Ordered {panel key: draw(ax)} below the price axes."""
+        P = spec['p']; data = self.data; sym = self.current_currency
+        x_idx = np.arange(len(self._hist_d_idx))
+        indian = self.current_exchange in ('NSE','BSE')
+        out = {}
 
         # ── Volume subplot ────────────────────────────────────
-        if show_vol and 'Volume' in self.data.columns:
-            ax_vol = fig.add_subplot(gs[row_idx]); row_idx += 1
-            style_ax(ax_vol, ylabel='Vol')
-            vol      = self.data['Volume'].values
-            colors_v = [C['green'] if self.data['Close'].iloc[i] >= self.data['Open'].iloc[i]
-                        else C['red'] for i in range(len(self.data))]
-            ax_vol.bar(x_idx, vol, color=colors_v, alpha=0.7, width=0.8)
-            ax_vol.set_xlim(-0.5, len(self.data)-0.5)
-            ax_vol.tick_params(labelbottom=False)
-            # Indian-aware formatting
-            if self.current_exchange in ('NSE','BSE'):
-                ax_vol.yaxis.set_major_formatter(
-                    mticker.FuncFormatter(lambda x,_: f'{x/1e7:.1f}Cr' if x>=1e7 else
-                                                       f'{x/1e5:.1f}L'  if x>=1e5 else
-                                                       f'{x/1e3:.0f}K'))
-            else:
-                ax_vol.yaxis.set_major_formatter(
-                    mticker.FuncFormatter(lambda x,_: f'{x/1e6:.1f}M' if x>=1e6 else f'{x/1e3:.0f}K'))
+        if spec['extra']['Volume'] and 'Volume' in data.columns:
+            def _vol(ax_vol):
+                ax_vol.set_ylabel('Vol', color=C['muted'], fontsize=7)
+                colors_v = np.where(ind[('up',)], C['green'], C['red'])
+                draw_bars(ax_vol, x_idx, data['Volume'].values, colors_v, alpha=0.7)
+                ax_vol.tick_params(labelbottom=False)
+                # Indian-aware formatting
+                if indian:
+                    ax_vol.yaxis.set_major_formatter(
+                        mticker.FuncFormatter(lambda x,_: f'{x/1e7:.1f}Cr' if x>=1e7 else
+                                                           f'{x/1e5:.1f}L'  if x>=1e5 else
+                                                           f'{x/1e3:.0f}K'))
+                else:
+                    ax_vol.yaxis.set_major_formatter(
+                        mticker.FuncFormatter(lambda x,_: f'{x/1e6:.1f}M' if x>=1e6 else f'{x/1e3:.0f}K'))
+            out[('Volume',)] = _vol
 
         # ── Sub-panel indicators ──────────────────────────────
-        for ind_name in active_sub:
-            ax_i = fig.add_subplot(gs[row_idx]); row_idx += 1
-            style_ax(ax_i)
-            ax_i.set_xlim(-0.5, len(self.data)-0.5)
-
-            if ind_name == 'RSI':
-                p = self._get_period('RSI', 'rsi')
-                v = Rsi(self.data['Close'], period=p)
-                ax_i.plot(x_idx, v.values, color=C['purple'], lw=1.5)
-                ax_i.axhline(70, color=C['red'],   linestyle='--', lw=1, alpha=0.7)
-                ax_i.axhline(30, color=C['green'],  linestyle='--', lw=1, alpha=0.7)
-                ax_i.fill_between(x_idx, 70, 100, alpha=0.08, color=C['red'])
-                ax_i.fill_between(x_idx, 0,  30,  alpha=0.08, color=C['green'])
-                ax_i.set_ylim(0, 100)
-                ax_i.set_ylabel(f'RSI({p})', color=C['purple'], fontsize=7)
-
-            elif ind_name == 'MACD':
-                s, l, sp = self.period_config.get('macd', (12,26,9))
-                mc, sig, hist = macd(self.data['Close'], s, l, sp)
-                ax_i.plot(x_idx, mc.values,  color=C['blue'],   lw=1.2, label='MACD')
-                ax_i.plot(x_idx, sig.values, color=C['accent'],  lw=1.2, label='Signal')
-                colors_h = [C['green'] if v >= 0 else C['red'] for v in hist.values]
-                ax_i.bar(x_idx, hist.values, color=colors_h, alpha=0.6, width=0.8)
-                ax_i.axhline(0, color=C['muted'], lw=0.6, alpha=0.4)
-                ax_i.set_ylabel('MACD', color=C['blue'], fontsize=7)
-                ax_i.legend(loc='upper left', fontsize=5, facecolor=C['bg3'],
-                            edgecolor=C['border'], labelcolor=C['white'])
-
-            elif ind_name == 'ATR':
-                p = self._get_period('ATR', 'atr')
-                v = atr(self.data, period=p)
-                ax_i.plot(x_idx, v.values, color=C['accent'], lw=1.5)
-                ax_i.fill_between(x_idx, 0, v.values, alpha=0.15, color=C['accent'])
-                ax_i.set_ylabel(f'ATR({p})', color=C['accent'], fontsize=7)
-                # Format ATR in currency
-                ax_i.yaxis.set_major_formatter(
-                    mticker.FuncFormatter(lambda x,_: f"{sym}{x:,.0f}" if x>=1000 else f"{sym}{x:.2f}"))
-
-            elif ind_name == 'Stochastic':
-                kp, dp = self.period_config.get('stoch', (14,3))
-                k, d = stochastic(self.data, k_period=kp, d_period=dp)
-                ax_i.plot(x_idx, k.values, color=C['cyan'],   lw=1.2, label='%K')
-                ax_i.plot(x_idx, d.values, color=C['accent'],  lw=1.2, label='%D')
-                ax_i.axhline(80, color=C['red'],  linestyle='--', lw=0.8, alpha=0.7)
-                ax_i.axhline(20, color=C['green'], linestyle='--', lw=0.8, alpha=0.7)
-                ax_i.fill_between(x_idx, 80, 100, alpha=0.07, color=C['red'])
-                ax_i.fill_between(x_idx, 0,  20,  alpha=0.07, color=C['green'])
-                ax_i.set_ylim(0, 100)
-                ax_i.set_ylabel(f'Stoch({kp},{dp})', color=C['cyan'], fontsize=7)
-                ax_i.legend(fontsize=5, facecolor=C['bg3'], edgecolor=C['border'], labelcolor=C['white'])
-
-            elif ind_name == 'Williams %R':
-                p = self._get_period('Williams %R', 'williams')
-                v = williams_r(self.data, period=p)
-                ax_i.plot(x_idx, v.values, color='#ff6b6b', lw=1.5)
-                ax_i.axhline(-20, color=C['red'],   linestyle='--', lw=0.8, alpha=0.7)
-                ax_i.axhline(-80, color=C['green'],  linestyle='--', lw=0.8, alpha=0.7)
-                ax_i.set_ylim(-100, 0)
-                ax_i.set_ylabel(f'%R({p})', color='#ff6b6b', fontsize=7)
-
-            elif ind_name == 'OBV':
-                v = obv(self.data)
-                ax_i.plot(x_idx, v.values, color='#69d2e7', lw=1.2)
-                ax_i.fill_between(x_idx, 0, v.values, alpha=0.1, color='#69d2e7')
-                ax_i.set_ylabel('OBV', color='#69d2e7', fontsize=7)
-                if self.current_exchange in ('NSE','BSE'):
-                    ax_i.yaxis.set_major_formatter(
-                        mticker.FuncFormatter(lambda x,_: f'{x/1e7:.1f}Cr' if abs(x)>=1e7 else
-                                                           f'{x/1e5:.1f}L'  if abs(x)>=1e5 else str(int(x))))
-                else:
+        for ind_name in spec['sub']:
+            key = (ind_name, PLOT_PARAM_KEYS[ind_name] and P[PLOT_PARAM_KEYS[ind_name]])
+
+            def _draw(ax_i, ind_name=ind_name, key=key):
+                p = key[1]
+                if ind_name == 'RSI':
+                    v = ind[key]
+                    ax_i.plot(x_idx, v.values, color=C['purple'], lw=1.5)
+                    ax_i.axhline(70, color=C['red'],   linestyle='--', lw=1, alpha=0.7)
+                    ax_i.axhline(30, color=C['green'],  linestyle='--', lw=1, alpha=0.7)
+                    ax_i.axhspan(70, 100, alpha=0.08, color=C['red'], lw=0)
+                    ax_i.axhspan(0,  30,  alpha=0.08, color=C['green'], lw=0)
+                    ax_i.set_ylim(0, 100)
+                    ax_i.set_ylabel(f'RSI({p})', color=C['purple'], fontsize=7)
+
+                elif ind_name == 'MACD':
+                    mc, sig, hist = ind[key]
+                    ax_i.plot(x_idx, mc.values,  color=C['blue'],   lw=1.2, label='MACD')
+                    ax_i.plot(x_idx, sig.values, color=C['accent'],  lw=1.2, label='Signal')
+                    colors_h = np.where(hist.values >= 0, C['green'], C['red'])
+                    draw_bars(ax_i, x_idx, hist.values, colors_h, alpha=0.6)
+                    ax_i.axhline(0, color=C['muted'], lw=0.6, alpha=0.4)
+                    ax_i.set_ylabel('MACD', color=C['blue'], fontsize=7)
+                    ax_i.legend(loc='upper left', fontsize=5, facecolor=C['bg3'],
+                                edgecolor=C['border'], labelcolor=C['white'])
+
+                elif ind_name == 'ATR':
+                    v = ind[key]
+                    ax_i.plot(x_idx, v.values, color=C['accent'], lw=1.5)
+                    fill_between(ax_i, x_idx, 0, v.values, alpha=0.15, color=C['accent'])
+                    ax_i.set_ylabel(f'ATR({p})', color=C['accent'], fontsize=7)
+                    # Format ATR in currency
                     ax_i.yaxis.set_major_formatter(
-                        mticker.FuncFormatter(lambda x,_: f'{x/1e6:.1f}M' if abs(x)>=1e6 else f'{x/1e3:.0f}K'))
-
-            elif ind_name == 'ADX':
-                p = self._get_period('ADX', 'adx')
-                adx_v, plus_di, minus_di = adx(self.data, period=p)
-                ax_i.plot(x_idx, adx_v.values,   color=C['gold'],  lw=1.5, label=f'ADX({p})')
-                ax_i.plot(x_idx, plus_di.values,  color=C['green'], lw=1,   label='+DI', linestyle='--')
-                ax_i.plot(x_idx, minus_di.values, color=C['red'],   lw=1,   label='-DI', linestyle='--')
-                ax_i.axhline(25, color=C['muted'], linestyle=':', lw=0.7, alpha=0.6)
-                ax_i.set_ylabel('ADX', color=C['gold'], fontsize=7)
-                ax_i.legend(fontsize=5, facecolor=C['bg3'], edgecolor=C['border'], labelcolor=C['white'])
-
-            elif ind_name == 'Slope':
-                p = self._get_period('Slope', 'slope')
-                v = slope(self.data['Close'], period=p)
-                colors_sl = [C['green'] if x >= 0 else C['red'] for x in v.fillna(0).values]
-                ax_i.bar(x_idx, v.values, color=colors_sl, alpha=0.8, width=0.8)
-                ax_i.axhline(0, color=C['muted'], lw=0.7, alpha=0.5)
-                ax_i.set_ylabel(f'Slope({p})', color=C['white'], fontsize=7)
-
-            set_x_date_ticks(ax_i, d_idx)
-
-        fig.tight_layout(pad=1.2)
+                        mticker.FuncFormatter(lambda x,_: f"{sym}{x:,.0f}" if x>=1000 else f"{sym}{x:.2f}"))
 
-        canvas = FigureCanvasTkAgg(fig, self.chart_container)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+                elif ind_name == 'Stochastic':
+                    kp, dp = p
+                    k, d = ind[key]
+                    ax_i.plot(x_idx, k.values, color=C['cyan'],   lw=1.2, label='%K')
+                    ax_i.plot(x_idx, d.values, color=C['accent'],  lw=1.2, label='%D')
+                    ax_i.axhline(80, color=C['red'],  linestyle='--', lw=0.8, alpha=0.7)
+                    ax_i.axhline(20, color=C['green'], linestyle='--', lw=0.8, alpha=0.7)
+                    ax_i.axhspan(80, 100, alpha=0.07, color=C['red'], lw=0)
+                    ax_i.axhspan(0,  20,  alpha=0.07, color=C['green'], lw=0)
+                    ax_i.set_ylim(0, 100)
+                    ax_i.set_ylabel(f'Stoch({kp},{dp})', color=C['cyan'], fontsize=7)
+                    ax_i.legend(fontsize=5, facecolor=C['bg3'], edgecolor=C['border'], labelcolor=C['white'])
 
-        toolbar_frame = tk.Frame(self.chart_container, bg=C['bg2'])
-        toolbar_frame.pack(fill=tk.X)
-        toolbar = NavigationToolbar2Tk(canvas, toolbar_frame)
-        toolbar.config(bg=C['bg2'])
-        toolbar.update()
+                elif ind_name == 'Williams %R':
+                    v = ind[key]
+                    ax_i.plot(x_idx, v.values, color='#ff6b6b', lw=1.5)
+                    ax_i.axhline(-20, color=C['red'],   linestyle='--', lw=0.8, alpha=0.7)
+                    ax_i.axhline(-80, color=C['green'],  linestyle='--', lw=0.8, alpha=0.7)
+                    ax_i.set_ylim(-100, 0)
+                    ax_i.set_ylabel(f'%R({p})', color='#ff6b6b', fontsize=7)
+
+                elif ind_name == 'OBV':
+                    v = ind[key]
+                    ax_i.plot(x_idx, v.values, color='#69d2e7', lw=1.2)
+                    fill_between(ax_i, x_idx, 0, v.values, alpha=0.1, color='#69d2e7')
+                    ax_i.set_ylabel('OBV', color='#69d2e7', fontsize=7)
+                    if indian:
+                        ax_i.yaxis.set_major_formatter(
+                            mticker.FuncFormatter(lambda x,_: f'{x/1e7:.1f}Cr' if abs(x)>=1e7 else
+                                                               f'{x/1e5:.1f}L'  if abs(x)>=1e5 else str(int(x))))
+                    else:
+                        ax_i.yaxis.set_major_formatter(
+                            mticker.FuncFormatter(lambda x,_: f'{x/1e6:.1f}M' if abs(x)>=1e6 else f'{x/1e3:.0f}K'))
+
+                elif ind_name == 'ADX':
+                    adx_v, plus_di, minus_di = ind[key]
+                    ax_i.plot(x_idx, adx_v.values,   color=C['gold'],  lw=1.5, label=f'ADX({p})')
+                    ax_i.plot(x_idx, plus_di.values,  color=C['green'], lw=1,   label='+DI', linestyle='--')
+                    ax_i.plot(x_idx, minus_di.values, color=C['red'],   lw=1,   label='-DI', linestyle='--')
+                    ax_i.axhline(25, color=C['muted'], linestyle=':', lw=0.7, alpha=0.6)
+                    ax_i.set_ylabel('ADX', color=C['gold'], fontsize=7)
+                    ax_i.legend(fontsize=5, facecolor=C['bg3'], edgecolor=C['border'], labelcolor=C['white'])
 
-        self._attach_crosshair(canvas, fig, ax_main, d_idx)
+                elif ind_name == 'Slope':
+                    v = ind[key]
+                    colors_sl = np.where(v.fillna(0).values >= 0, C['green'], C['red'])
+                    draw_bars(ax_i, x_idx, v.values, colors_sl, alpha=0.8)
+                    ax_i.axhline(0, color=C['muted'], lw=0.7, alpha=0.5)
+                    ax_i.set_ylabel(f'Slope({p})', color=C['white'], fontsize=7)
+            out[key] = _draw
+        return out
 
     # ── CROSSHAIR ─────────────────────────────────────────────
     def _attach_crosshair(self, canvas, fig, ax, index):
-        vline     = ax.axvline(x=0, color=C['muted'], lw=0.7, linestyle='--', alpha=0.6)
-        hline     = ax.axhline(y=0, color=C['muted'], lw=0.7, linestyle='--', alpha=0.6)
-        info_text = ax.text(0.01, 0.98, '', transform=ax.transAxes,
-                            color=C['accent'], fontsize=7, va='top',
-                            fontfamily='Consolas',
-                            bbox=dict(facecolor=C['bg3'], alpha=0.75,
-                                      edgecolor=C['border'], boxstyle='round,pad=0.3'))
-        ccy = self.current_currency
+        """
+        Blitted crosshair: every full render caches the background, mouse
+        motion restores it and redraws only the crosshair lines.  The
+        OHLC / indicator readout is a Tk label over the canvas (no glyph
+        rendering per frame) filled from arrays by bar index.
+        """
+        widget = canvas.get_tk_widget()
+        tip  = tk.Label(widget, font=('Consolas', 8), bg=C['bg3'], fg=C['accent'],
+                        justify='left', anchor='w', bd=1, relief=tk.SOLID, padx=4, pady=2)
+        ccy  = self.current_currency
+        d    = self.data
+        o, h, l, c = (d[k].to_numpy(float) for k in ('Open','High','Low','Close'))
+        vol  = d['Volume'].to_numpy(float) if 'Volume' in d.columns else np.zeros(len(d))
+        chg  = (c / np.r_[c[:1], c[:-1]] - 1) * 100
+        lines: dict = {}                     # axes → (vline, hline), created on first hover
+        state = {'bg': None, 'last': None, 'tip_at': (0, 0)}
+
+        def _lines(a):
+            if a not in lines:
+                kw = dict(color=C['muted'], lw=0.7, linestyle='--', alpha=0.6, animated=True)
+                lines[a] = (a.axvline(x=0, **kw), a.axhline(y=a.get_ylim()[0], **kw))
+            return lines[a]
+
+        def _blit(xi=None, hover_ax=None, y=None):
+            if state['bg'] is None: return
+            canvas.restore_region(state['bg'])
+            if xi is not None:
+                for a in fig.axes:
+                    vline, hline = _lines(a)
+                    vline.set_xdata([xi]); a.draw_artist(vline)
+                    if a is hover_ax:
+                        hline.set_ydata([y]); a.draw_artist(hline)
+            canvas.blit(fig.bbox)
+
+        def on_draw(event):
+            state['bg'] = canvas.copy_from_bbox(fig.bbox); state['last'] = None
+            state['tip_at'] = (int(ax.bbox.x0) + 6, int(fig.bbox.height - ax.bbox.y1) + 6)
+            tip.place_forget()
 
         def on_move(event):
-            if event.inaxes != ax:
+            a = event.inaxes
+            if a is None or a not in fig.axes or event.xdata is None:
+                if state['last'] is not None:
+                    state['last'] = None; tip.place_forget(); _blit()
                 return
             xi = int(round(event.xdata))
-            if xi < 0 or xi >= len(self.data):
+            if xi < 0 or xi >= len(c):
                 return
-            row = self.data.iloc[xi]
-            vline.set_xdata([xi])
-            hline.set_ydata([event.ydata])
-            o  = fmt_price(row['Open'],  ccy)
-            h  = fmt_price(row['High'],  ccy)
-            l  = fmt_price(row['Low'],   ccy)
-            cl = fmt_price(row['Close'], ccy)
-            chg = ((row['Close']/self.data['Close'].iloc[max(0,xi-1)])-1)*100
-            vol = fmt_vol(row.get('Volume', 0))
-            txt = (f"{self.data.index[xi].strftime('%d %b %Y')}  "
-                   f"O:{o}  H:{h}  L:{l}  C:{cl}  "
-                   f"Δ:{chg:+.2f}%  Vol:{vol}")
-            info_text.set_text(txt)
-            canvas.draw_idle()
+            key = (xi, a, int(event.y))
+            if key == state['last']: return
+            if state['last'] is None or state['last'][0] != xi:
+                txt = (f"{index[xi].strftime('%d %b %Y')}  "
+                       f"O:{fmt_price(o[xi], ccy)}  H:{fmt_price(h[xi], ccy)}  "
+                       f"L:{fmt_price(l[xi], ccy)}  C:{fmt_price(c[xi], ccy)}  "
+                       f"Δ:{chg[xi]:+.2f}%  Vol:{fmt_vol(vol[xi])}")
+                extra = '  '.join(f"{lbl}:{arr[xi]:,.2f}" for lbl, arr in self._hover_cols
+                                  if xi < len(arr) and arr[xi] == arr[xi])
+                tip.config(text=txt + (f"\n{extra}" if extra else ''))
+                if state['last'] is None: tip.place(x=state['tip_at'][0], y=state['tip_at'][1])
+            state['last'] = key
+            _blit(xi, a, event.ydata)
 
         if self._crosshair_cid:
-            try: fig.canvas.mpl_disconnect(self._crosshair_cid)
-            except Exception: pass
-        self._crosshair_cid = fig.canvas.mpl_connect('motion_notify_event', on_move)
+            old_canvas, cids = self._crosshair_cid
+            for cid in cids:
+                try: old_canvas.mpl_disconnect(cid)
+                except Exception: pass
+        self._crosshair_cid = (canvas, [canvas.mpl_connect('draw_event', on_draw),
+                                        canvas.mpl_connect('motion_notify_event', on_move),
+                                        canvas.mpl_connect('figure_leave_event', on_move)])
+
+    def _hover_columns(self, spec) -> list:
+        """[(label, ndarray)] of the active single-line series, for the crosshair tooltip."""
+        out = []
+        for key in _plot_jobs(self.data, spec):
+            name = HOVER_LABELS.get(key[0])
+            v = self._ind_cache.get(key)
+            if name is None or v is None: continue
+            if isinstance(v, tuple): v = v[0]
+            p = key[1] if len(key) > 1 else None
+            out.append((f"{name}({p})" if p is not None and not isinstance(p, tuple) else name,
+                        np.asarray(v, float)))
+        return out
 
     # ── EXPORT HELPERS ─────────────────────────────────────────
     def _save_chart_png(self):
         path = filedialog.asksaveasfilename(defaultextension='.png',
                                             filetypes=[("PNG","*.png"),("All","*.*")])
-        if path:
-            for w in self.chart_container.winfo_children():
-                try:
-                    fig = getattr(w, 'figure', None)
-                    if fig:
-                        fig.savefig(path, dpi=150, facecolor=C['bg'])
-                        self._set_status(f"Chart saved → {path}")
-                        return
-                except Exception:
-                    pass
+        if path and self._hist_fig is not None:
+            self._hist_fig.savefig(path, dpi=150, facecolor=C['bg'])
+            self._set_status(f"Chart saved → {path}")
 
     def _export_csv(self):
         if self.data is None:
@@ -1623,6 +1760,16 @@ class QuantDashboard:
         tk.Button(top, text="↺ RECONNECT", command=lambda: self.ws_manager.reconnect(),
                   bg=C['bg3'], fg=C['muted'], font=('Consolas',8,'bold'),
                   relief=tk.FLAT, cursor='hand2').pack(side=tk.LEFT, padx=3, ipady=3)
+        self._rec_btn = tk.Button(top, text="● REC", command=self._toggle_recording,
+                                  bg=C['bg3'], fg=C['muted'], font=('Consolas',8,'bold'),
+                                  relief=tk.FLAT, cursor='hand2')
+        self._rec_btn.pack(side=tk.LEFT, padx=3, ipady=3)
+        tk.Label(top, text="FEED:", font=('Consolas',8,'bold'),
+                 bg=C['bg2'], fg=C['muted']).pack(side=tk.LEFT, padx=(8,4))
+        feed_box = ttk.Combobox(top, textvariable=self.live_feed_var, values=list(FEED_SOURCES),
+                                width=12, state='readonly', font=('Consolas',9))
+        feed_box.pack(side=tk.LEFT, ipady=3)
+        feed_box.bind('<<ComboboxSelected>>', lambda e: self._on_feed_change())
 
         tk.Frame(top, width=1, bg=C['border']).pack(side=tk.LEFT, fill=tk.Y, padx=6)
         tk.Label(top, text="PLOT:", font=('Consolas',8,'bold'),
@@ -1671,6 +1818,11 @@ class QuantDashboard:
         tk.Entry(alert_row, textvariable=self.alert_high_var, width=8,
                  bg=C['bg3'], fg=C['green'], relief=tk.FLAT, font=('Consolas',8)
                  ).pack(side=tk.LEFT, padx=3, ipady=2)
+        tk.Label(alert_row, text="Expr:", font=('Consolas',8), bg=C['bg2'], fg=C['muted']).pack(side=tk.LEFT)
+        self.alert_expr_var = tk.StringVar(value="")
+        tk.Entry(alert_row, textvariable=self.alert_expr_var, width=28,
+                 bg=C['bg3'], fg=C['accent2'], relief=tk.FLAT, font=('Consolas',8)
+                 ).pack(side=tk.LEFT, padx=3, ipady=2)
         tk.Button(alert_row, text="Set Alert", command=self._set_alert,
                   bg=C['bg3'], fg=C['accent'], font=('Consolas',8,'bold'),
                   relief=tk.FLAT, cursor='hand2').pack(side=tk.LEFT, padx=6, ipady=2)
@@ -1699,7 +1851,7 @@ class QuantDashboard:
         rp = tk.Frame(content, bg=C['bg2'])
         rp.grid(row=0, column=1, sticky='nsew')
         self._build_live_right_panel(rp)
-        self._refresh_price_labels()
+        self._pump_ticks()
 
     def _build_live_right_panel(self, parent):
         tk.Label(parent, text="LIVE PRICES", font=('Consolas',9,'bold'),
@@ -1741,28 +1893,58 @@ class QuantDashboard:
         self._tick_log_text.pack(fill=tk.BOTH, expand=True, padx=6, pady=4)
 
     def _set_alert(self):
+        """Low/High accept a price level or a move such as ``-2%`` / ``+3%``."""
         ticker = self.alert_ticker_var.get().strip().upper()
+        lo_s, hi_s = self.alert_low_var.get().strip(), self.alert_high_var.get().strip()
+        expr = self.alert_expr_var.get().strip()
         try:
-            lo = float(self.alert_low_var.get())  if self.alert_low_var.get().strip()  else None
-            hi = float(self.alert_high_var.get()) if self.alert_high_var.get().strip() else None
+            lo = float(lo_s.rstrip('%')) if lo_s else None
+            hi = float(hi_s.rstrip('%')) if hi_s else None
         except ValueError:
             messagebox.showwarning("Alert", "Invalid price values"); return
-        self.alert_thresholds[ticker] = (lo, hi)
-        self.alert_status_var.set(f"{ticker}: lo={lo} hi={hi}")
-
-    def _check_alerts(self):
-        for ticker, (lo, hi) in list(self.alert_thresholds.items()):
-            price = self.live_store.get_latest_price(ticker)
-            if price is None: continue
-            _, ccy, _, _ = normalize_ticker(ticker, 'Auto')
-            if lo is not None and price <= lo:
-                beep()
-                messagebox.showinfo("⚠️  ALERT", f"{ticker} BELOW {fmt_price(lo,ccy)}\nCurrent: {fmt_price(price,ccy)}")
-                self.alert_thresholds[ticker] = (None, hi)
-            if hi is not None and price >= hi:
-                beep()
-                messagebox.showinfo("⚠️  ALERT", f"{ticker} ABOVE {fmt_price(hi,ccy)}\nCurrent: {fmt_price(price,ccy)}")
-                self.alert_thresholds[ticker] = (lo, None)
+        ids = []
+        try:
+            if expr: ids.append(self.alerts.add_expr(ticker, expr))
+        except SyntaxError as e:
+            messagebox.showwarning("Alert", f"Invalid expression: {e}"); return
+        for aid in self.alert_ids.pop(ticker, []): self.alerts.remove(aid)
+        if lo is not None:
+            ids.append(self.alerts.add_pct(ticker, -abs(lo)) if lo_s.endswith('%')
+                       else self.alerts.add_below(ticker, lo))
+        if hi is not None:
+            ids.append(self.alerts.add_pct(ticker, abs(hi)) if hi_s.endswith('%')
+                       else self.alerts.add_above(ticker, hi))
+        self.alert_ids[ticker] = ids
+        self.alert_status_var.set(f"{ticker}: lo={lo_s or None} hi={hi_s or None}"
+                                  + (f"  expr={expr}" if expr else ''))
+
+    def _drain_alerts(self):
+        """Pull fired alerts off the engine queue; never blocks the Tk loop."""
+        events = self.alerts.drain()
+        if events:
+            beep()
+            ev = events[-1]
+            _, ccy, _, _ = normalize_ticker(ev.ticker, 'Auto')
+            msg = f"⚠️  ALERT  {ev.alert.describe()}  —  current {fmt_price(ev.price, ccy)}"
+            if len(events) > 1: msg += f"  (+{len(events)-1} more)"
+            self.alert_status_var.set(msg)
+            self._set_status(msg)
+            for e in events:
+                ids = self.alert_ids.get(e.ticker)
+                if ids and e.alert.once and e.alert.id in ids: ids.remove(e.alert.id)
+        self.root.after(200, self._drain_alerts)
+
+    def _toggle_recording(self):
+        rec = self.ws_manager.recorder
+        if rec is None:
+            self.ws_manager.recorder = TickRecorder(TICK_ARCHIVE_DIR)
+            self._rec_btn.config(bg=C['red'], fg=C['white'])
+            self._set_status(f"Recording ticks → {TICK_ARCHIVE_DIR}")
+        else:
+            self.ws_manager.recorder = None
+            rec.close()
+            self._rec_btn.config(bg=C['bg3'], fg=C['muted'])
+            self._set_status(f"Recorded {rec.ticks:,} ticks ({rec.bytes/1e6:.1f} MB) → {TICK_ARCHIVE_DIR}")
 
     def _toggle_live_btn(self, var, btn):
         var.set(not var.get())
@@ -1776,9 +1958,36 @@ class QuantDashboard:
         self._live_ticker_menu['values'] = tickers
         if self.live_selected_ticker.get() not in tickers:
             self.live_selected_ticker.set(tickers[0])
+        self._apply_feed_source()
         self.ws_manager.start(tickers)
         self._init_live_chart()
 
+    def _on_feed_change(self):
+        """Switch a running connection to the newly selected feed."""
+        if not self.ws_manager.running: return      # not connected: CONNECT applies it
+        self._apply_feed_source()
+        self.ws_manager.start()                     # reopens the shards when the URL changed
+
+    def _apply_feed_source(self):
+        """Point the WebSocket manager at Yahoo or at a local FeedServer."""
+        src = self.live_feed_var.get()
+        srv = self._feed_server
+        if srv is not None and src != self._feed_kind:
+            srv.stop(); self._feed_server = srv = None
+        if src == "Yahoo":
+            self.ws_manager.url = None; return
+        if srv is None:
+            from .feeds import FeedServer, GBMSource, ArchiveSource
+            try:
+                source = (GBMSource(rate=200) if src == "Local GBM"
+                          else ArchiveSource(TICK_ARCHIVE_DIR, speed=1.0))
+                srv = FeedServer(source).start()
+            except Exception as exc:
+                messagebox.showwarning("Live", f"Local feed unavailable: {exc}")
+                self.live_feed_var.set("Yahoo"); self.ws_manager.url = None; return
+            self._feed_server, self._feed_kind = srv, src
+        self.ws_manager.url = srv.url
+
     def _init_live_chart(self):
         if self.live_ani:
             try: self.live_ani.event_source.stop()
@@ -1793,7 +2002,6 @@ class QuantDashboard:
 
     def _update_live_chart(self, frame):
         if self.live_fig is None: return
-        self._check_alerts()
 
         ticker   = self.live_selected_ticker.get().strip()
         resample = self.live_resample_var.get()
@@ -1915,7 +2123,6 @@ class QuantDashboard:
         except Exception: pass
 
         self._update_sparklines()
-        self._update_tick_log(ticker, ccy)
 
     def _update_sparklines(self):
         for ticker, ax in self.price_spark_axes.items():
@@ -1929,24 +2136,36 @@ class QuantDashboard:
         try: self._spark_canvas.draw_idle()
         except Exception: pass
 
-    def _update_tick_log(self, ticker, ccy='$'):
-        ticks = self.live_store.get_tick_log(ticker, n=20)
-        self._tick_log_text.config(state=tk.NORMAL)
-        self._tick_log_text.delete('1.0', tk.END)
-        for t in reversed(ticks):
-            self._tick_log_text.insert(tk.END,
-                f"{t['time'].strftime('%H:%M:%S')}  {fmt_price(t['price'], ccy)}\n")
-        self._tick_log_text.config(state=tk.DISABLED)
-
-    def _refresh_price_labels(self):
-        for ticker, lbl in self.price_labels.items():
-            price = self.live_store.get_latest_price(ticker)
-            prev  = self.live_store.get_prev_price(ticker)
-            _, ccy, _, _ = normalize_ticker(ticker, 'Auto')
-            if price is not None:
+    def _update_tick_log(self, ticker, ccy='$', new=None):
+        """Prepend ``new`` [(ts_ms, price)] ticks; rebuild only when the plotted ticker changes."""
+        txt = self._tick_log_text
+        txt.config(state=tk.NORMAL)
+        if ticker != self._tick_log_ticker or new is None:
+            self._tick_log_ticker = ticker
+            txt.delete('1.0', tk.END)
+            new = [(t['time'], t['price']) for t in self.live_store.get_tick_log(ticker, n=TICK_LOG_LINES)]
+        else:
+            new = [(pd.to_datetime(int(ts), unit='ms'), p) for ts, p in new]
+        for t, p in new:
+            txt.insert('1.0', f"{t.strftime('%H:%M:%S')}  {fmt_price(p, ccy)}\n")
+        txt.delete(f'{TICK_LOG_LINES + 1}.0', tk.END)
+        txt.config(state=tk.DISABLED)
+
+    def _pump_ticks(self):
+        """Drain the coalesced tick bus once per frame; touch only widgets whose symbol changed."""
+        changed = self.tick_bus.drain()
+        for ticker, (price, prev, _, recent) in changed.items():
+            lbl = self.price_labels.get(ticker)
+            if lbl is not None:
+                _, ccy, _, _ = normalize_ticker(ticker, 'Auto')
                 color = C['green'] if (prev is None or price >= prev) else C['red']
                 lbl.config(text=fmt_price(price, ccy, decimals=2), fg=color)
-        self.root.after(1500, self._refresh_price_labels)
+        if changed: self._watch_live(changed)
+        sel = self.live_selected_ticker.get().strip()
+        if sel != self._tick_log_ticker or sel in changed:
+            _, ccy, _, _ = normalize_ticker(sel, 'Auto')
+            self._update_tick_log(sel, ccy, changed[sel][3] if sel in changed else None)
+        self.root.after(TICK_FRAME_MS, self._pump_ticks)
 
     # ═══════════════════════════════════════════════════════════
     # TAB 3  ─  MULTI-TICKER
@@ -2001,123 +2220,28 @@ class QuantDashboard:
         end       = datetime.now()
         start     = end - timedelta(days=days)
 
+        # one tile per ticker; each is fetched and rendered on its own, only visible tiles are drawn
+        for f in self._multi_req: f.cancel()
         for w in self.multi_chart_frame.winfo_children(): w.destroy()
-        loading = tk.Label(self.multi_chart_frame, text="Fetching all tickers…",
-                           font=('Consolas',13,'bold'), bg=C['bg'], fg=C['accent'])
-        loading.pack(expand=True); self.root.update(); loading.destroy()
-
-        n        = len(tickers)
-        cols     = min(4, n)
-        rows     = (n + cols - 1) // cols
-        show_ind = indicator not in ("None","Bollinger Bands")
-        fig_h    = max(4, rows * (5 if show_ind else 3.5))
-
-        fig = Figure(figsize=(cols*4.2, fig_h), facecolor=C['bg'], dpi=90)
-
-        for idx, ticker in enumerate(tickers):
-            # Normalize each ticker
-            yf_t, ccy, exch, disp = normalize_ticker(ticker, 'Auto')
-            try:   data = fetch_data(yf_t, start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'))
-            except Exception: data = None
-
-            row_i = idx // cols
-            col_i = idx %  cols
-
-            if show_ind:
-                gs  = fig.add_gridspec(rows*2, cols, hspace=0.55, wspace=0.35,
-                                       height_ratios=([3,1]*rows))
-                ax_p = fig.add_subplot(gs[row_i*2,   col_i])
-                ax_i = fig.add_subplot(gs[row_i*2+1, col_i])
-            else:
-                gs   = fig.add_gridspec(rows, cols, hspace=0.5, wspace=0.35)
-                ax_p = fig.add_subplot(gs[row_i, col_i])
-                ax_i = None
-
-            for ax in ([ax_p] + ([ax_i] if ax_i else [])):
-                style_ax(ax)
-
-            if data is None or data.empty:
-                ax_p.text(0.5,0.5,"No data",ha='center',va='center',
-                          color=C['red'],transform=ax_p.transAxes,fontsize=9)
-                ax_p.set_title(f"{disp} [{exch}]", color=C['white'], fontsize=8, fontweight='bold')
-                continue
-
-            cfg   = PERIOD_SETTINGS["1M"]
-            d_idx = draw_candles(ax_p, data, width=0.6)
-            xr    = list(range(len(data)))
-
-            # Currency y-axis
-            ax_p.yaxis.set_major_formatter(
-                mticker.FuncFormatter(lambda x,_,c=ccy: f"{c}{x:,.0f}" if x>=1000 else f"{c}{x:.0f}"))
-
-            if indicator == "Bollinger Bands":
-                bu,bm,bl = bb_bands(data['Close'], period=cfg['bb'])
-                ax_p.plot(xr, bu.values, color=C['gold'], linestyle='--', lw=0.7, alpha=0.7)
-                ax_p.plot(xr, bm.values, color=C['cyan'], linestyle='-.', lw=0.6, alpha=0.6)
-                ax_p.plot(xr, bl.values, color=C['gold'], linestyle='--', lw=0.7, alpha=0.7)
-                ax_p.fill_between(xr, bu.values, bl.values, alpha=0.06, color=C['gold'])
-
-            last = data['Close'].iloc[-1]
-            pct  = ((data['Close'].iloc[-1]/data['Close'].iloc[0])-1)*100
-            clr  = C['green'] if pct >= 0 else C['red']
-            ax_p.set_title(f"{disp}  {fmt_price(last,ccy)}  ({pct:+.1f}%)",
-                           color=clr, fontsize=7, fontweight='bold', pad=3)
-
-            step = max(1, len(data)//4)
-            ax_p.set_xticks(range(0,len(data),step))
-            ax_p.set_xticklabels([data.index[i].strftime('%d/%m') for i in range(0,len(data),step)],
-                                  rotation=30, ha='right', fontsize=5, color=C['muted'])
-
-            if ax_i is not None:
-                if indicator == 'RSI':
-                    rv = Rsi(data['Close'], period=cfg['rsi'])
-                    ax_i.plot(xr, rv.values, color=C['purple'], lw=1)
-                    ax_i.axhline(70, color=C['red'],  linestyle='--', lw=0.7, alpha=0.6)
-                    ax_i.axhline(30, color=C['green'], linestyle='--', lw=0.7, alpha=0.6)
-                    ax_i.set_ylim(0,100); ax_i.set_title('RSI', color=C['purple'], fontsize=7)
-                elif indicator == 'MACD':
-                    mc,sig,hist = macd(data['Close'])
-                    ax_i.plot(xr, mc.values,  color=C['blue'],  lw=0.9)
-                    ax_i.plot(xr, sig.values, color=C['accent'], lw=0.9)
-                    ax_i.bar(xr, hist.values,
-                             color=[C['green'] if v>=0 else C['red'] for v in hist.values],
-                             alpha=0.6, width=0.8)
-                    ax_i.axhline(0, color=C['muted'], lw=0.4, alpha=0.4)
-                    ax_i.set_title('MACD', color=C['blue'], fontsize=7)
-                elif indicator == 'ATR':
-                    av = atr(data, period=cfg['atr'])
-                    ax_i.plot(xr, av.values, color=C['accent'], lw=0.9)
-                    ax_i.fill_between(xr, 0, av.values, alpha=0.12, color=C['accent'])
-                    ax_i.set_title('ATR', color=C['accent'], fontsize=7)
-                elif indicator == 'Stochastic':
-                    k,d = stochastic(data, k_period=cfg['stoch'][0])
-                    ax_i.plot(xr, k.values, color=C['cyan'],  lw=0.9, label='%K')
-                    ax_i.plot(xr, d.values, color=C['accent'], lw=0.9, label='%D')
-                    ax_i.axhline(80, color=C['red'],  linestyle='--', lw=0.7, alpha=0.6)
-                    ax_i.axhline(20, color=C['green'], linestyle='--', lw=0.7, alpha=0.6)
-                    ax_i.set_ylim(0,100); ax_i.set_title('Stoch', color=C['cyan'], fontsize=7)
-                elif indicator == 'ADX':
-                    adx_v,_,_ = adx(data, period=cfg['adx'])
-                    ax_i.plot(xr, adx_v.values, color=C['gold'], lw=0.9)
-                    ax_i.axhline(25, color=C['muted'], linestyle=':', lw=0.6, alpha=0.6)
-                    ax_i.set_title('ADX', color=C['gold'], fontsize=7)
-                style_ax(ax_i)
-
-        scroll_frame = tk.Frame(self.multi_chart_frame, bg=C['bg'])
-        scroll_frame.pack(fill=tk.BOTH, expand=True)
-        vs = tk.Scrollbar(scroll_frame, orient=tk.VERTICAL,   bg=C['bg3'], troughcolor=C['bg2'])
-        hs = tk.Scrollbar(scroll_frame, orient=tk.HORIZONTAL, bg=C['bg3'], troughcolor=C['bg2'])
-        vs.pack(side=tk.RIGHT,  fill=tk.Y)
-        hs.pack(side=tk.BOTTOM, fill=tk.X)
-        cv = tk.Canvas(scroll_frame, bg=C['bg'],
-                       yscrollcommand=vs.set, xscrollcommand=hs.set)
-        cv.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        vs.config(command=cv.yview); hs.config(command=cv.xview)
-        cw = FigureCanvasTkAgg(fig, cv)
-        cw.draw()
-        wid = cw.get_tk_widget()
-        cv.create_window((0,0), window=wid, anchor='nw')
-        wid.bind("<Configure>", lambda e: cv.configure(scrollregion=cv.bbox("all")))
+        show_ind = indicator not in ("None", "Bollinger Bands")
+        norm = [normalize_ticker(t, 'Auto') for t in tickers]          # (yf, ccy, exch, disp)
+        grid = TileGrid(self.multi_chart_frame, len(tickers), draw_multi_tile, self.data_service,
+                        aspect=1.1 if show_ind else 0.8, bg=C['bg'], fg=C['muted'],
+                        on_open=lambda i: self._load_from_watchlist(norm[i][0], norm[i][2]))
+        s, e = start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+        self._multi_req = [
+            self.data_service.fetch(
+                nt[0], s, e,
+                callback=lambda df, i=i: self._on_multi_data(grid, i, tickers[i], df, indicator),
+                errback=lambda exc, i=i: self._on_multi_data(grid, i, tickers[i], None, indicator))
+            for i, nt in enumerate(norm)]
+
+    def _on_multi_data(self, grid, i, ticker, data, indicator):
+        if data is None or data.empty:
+            _, _, exch, disp = normalize_ticker(ticker, 'Auto')
+            grid.set_data(i, None, f"{disp} [{exch}]\nNo data")
+        else:
+            grid.set_data(i, (ticker, data, indicator))
 
     # ═══════════════════════════════════════════════════════════
     # TAB 4  ─  WATCHLIST
@@ -2131,6 +2255,12 @@ class QuantDashboard:
         tk.Button(top, text="↺ Refresh Prices", command=self._refresh_watchlist_prices,
                   bg=C['bg3'], fg=C['cyan'], font=('Consolas',8,'bold'),
                   relief=tk.FLAT, cursor='hand2').pack(side=tk.LEFT, padx=8, ipady=3)
+        tk.Button(top, text="→ Chart", command=self._watch_open_selected,
+                  bg=C['bg3'], fg=C['cyan'], font=('Consolas',8,'bold'),
+                  relief=tk.FLAT, cursor='hand2').pack(side=tk.LEFT, padx=4, ipady=3)
+        tk.Button(top, text="✕ Remove", command=self._watch_remove_selected,
+                  bg=C['bg3'], fg=C['red'], font=('Consolas',8,'bold'),
+                  relief=tk.FLAT, cursor='hand2').pack(side=tk.LEFT, padx=4, ipady=3)
         tk.Button(top, text="🗑 Clear All", command=self._clear_watchlist,
                   bg=C['bg3'], fg=C['red'], font=('Consolas',8,'bold'),
                   relief=tk.FLAT, cursor='hand2').pack(side=tk.LEFT, padx=4, ipady=3)
@@ -2142,8 +2272,42 @@ class QuantDashboard:
                   bg=C['bg3'], fg=C['teal'], font=('Consolas',8,'bold'),
                   relief=tk.FLAT, cursor='hand2').pack(side=tk.LEFT, padx=4, ipady=3)
 
+        tk.Label(top, text="FILTER:", font=('Consolas',8,'bold'),
+                 bg=C['bg2'], fg=C['muted']).pack(side=tk.LEFT, padx=(12,4))
+        self.watch_filter_var = tk.StringVar()
+        tk.Entry(top, textvariable=self.watch_filter_var, font=('Consolas',9),
+                 bg=C['bg3'], fg=C['white'], insertbackground=C['accent'],
+                 relief=tk.FLAT, width=14).pack(side=tk.LEFT, ipady=3)
+        self.watch_filter_var.trace_add('write', lambda *_: self._watch_sync())
+        self._watch_count_var = tk.StringVar(value="")
+        tk.Label(top, textvariable=self._watch_count_var, font=('Consolas',8),
+                 bg=C['bg2'], fg=C['muted']).pack(side=tk.RIGHT, padx=10)
+
+        # Treeview only materialises visible rows, so thousands of symbols stay cheap
         self.watch_list_frame = tk.Frame(self.watch_tab, bg=C['bg'])
         self.watch_list_frame.pack(fill=tk.BOTH, expand=True, padx=4, pady=4)
+        tree = ttk.Treeview(self.watch_list_frame, columns=[c[0] for c in WATCH_COLUMNS],
+                            show='headings', style='Watch.Treeview', selectmode='extended')
+        for key, txt, w, anc in WATCH_COLUMNS:
+            tree.heading(key, text=txt, command=lambda k=key: self._watch_sort(k))
+            tree.column(key, width=w, anchor=anc, minwidth=40)
+        tree.tag_configure('up',   foreground=C['green'])
+        tree.tag_configure('down', foreground=C['red'])
+        vsb = ttk.Scrollbar(self.watch_list_frame, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=vsb.set)
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        vsb.pack(side=tk.RIGHT, fill=tk.Y)
+        tree.bind('<Double-1>', lambda e: self._watch_open_selected())
+        tree.bind('<Return>',   lambda e: self._watch_open_selected())
+        tree.bind('<Delete>',   lambda e: self._watch_remove_selected())
+
+        sty = ttk.Style()
+        sty.configure('Watch.Treeview', background=C['bg2'], foreground=C['white'],
+                      fieldbackground=C['bg2'], font=('Consolas',9), rowheight=24)
+        sty.configure('Watch.Treeview.Heading', background=C['bg3'],
+                      foreground=C['accent'], font=('Consolas',9,'bold'))
+        sty.map('Watch.Treeview', background=[('selected', C['bg3'])])
+        self.watch_tree = tree
         self._refresh_watchlist_panel()
 
     def _add_nifty_defaults(self):
@@ -2157,67 +2321,132 @@ class QuantDashboard:
         self._set_status("Added Nifty50 top-10 to watchlist")
 
     def _refresh_watchlist_panel(self):
-        for w in self.watch_list_frame.winfo_children(): w.destroy()
-
-        hdr = tk.Frame(self.watch_list_frame, bg=C['bg3'])
-        hdr.pack(fill=tk.X, padx=2, pady=(0,2))
-        for txt, w in [("Ticker",14),("Exch",6),("Last",12),("Chg%",10),("52W High",12),("52W Low",12),("",12)]:
-            tk.Label(hdr, text=txt, font=('Consolas',9,'bold'),
-                     bg=C['bg3'], fg=C['accent'], width=w, anchor='w').pack(side=tk.LEFT, padx=4, pady=4)
-
-        self._watch_rows = {}
-        for ticker in self.watchlist:
-            _, ccy, exch, disp = normalize_ticker(ticker, 'Auto')
-            row_f = tk.Frame(self.watch_list_frame, bg=C['bg2'])
-            row_f.pack(fill=tk.X, padx=2, pady=1)
-            labels = {}
-            tk.Label(row_f, text=disp, font=('Consolas',9,'bold'),
-                     bg=C['bg2'], fg=C['white'], width=14, anchor='w').pack(side=tk.LEFT, padx=4, pady=3)
-            tk.Label(row_f, text=exch, font=('Consolas',8),
-                     bg=C['bg2'], fg=C['teal'], width=6, anchor='w').pack(side=tk.LEFT, padx=2)
-            for key, wd in [("last",12),("chg",10),("high52",12),("low52",12)]:
-                lbl = tk.Label(row_f, text="—", font=('Consolas',9),
-                               bg=C['bg2'], fg=C['white'], width=wd, anchor='w')
-                lbl.pack(side=tk.LEFT, padx=4, pady=3)
-                labels[key] = lbl
-            labels['ccy'] = ccy
-            tk.Button(row_f, text="✕", font=('Consolas',8), bg=C['bg2'], fg=C['red'],
-                      relief=tk.FLAT, cursor='hand2',
-                      command=lambda t=ticker: self._remove_from_watchlist(t)
-                      ).pack(side=tk.LEFT, padx=4)
-            tk.Button(row_f, text="→ Chart", font=('Consolas',8), bg=C['bg2'], fg=C['cyan'],
-                      relief=tk.FLAT, cursor='hand2',
-                      command=lambda t=ticker, e=exch: self._load_from_watchlist(t, e)
-                      ).pack(side=tk.LEFT, padx=4)
-            self._watch_rows[ticker] = labels
+        """Re-sync the grid after the symbol list changed (add / remove / clear)."""
+        self._watch_yf = {}
+        for t in self.watchlist:
+            self._watch_yf.setdefault(normalize_ticker(t, 'Auto')[0], []).append(t)
+        listed = set(self.watchlist)
+        for t in [t for t in self._watch_quotes if t not in listed]: del self._watch_quotes[t]
+        self._watch_sync()
+
+    # ── grid model → Treeview diff ─────────────────────────────
+    def _watch_cells(self, ticker):
+        """(values, tag) for one row; the tag colours the row by day change."""
+        _, ccy, exch, disp = normalize_ticker(ticker, 'Auto')
+        q = self._watch_quotes.get(ticker)
+        if not q: return (disp, exch, "—", "—", "—", "—"), ''
+        chg = q.get('chg')
+        return (disp, exch, fmt_price(q['last'], ccy),
+                "—" if chg is None else f"{chg:+.2f}%",
+                fmt_price(q['high52'], ccy) if q.get('high52') is not None else "—",
+                fmt_price(q['low52'], ccy) if q.get('low52') is not None else "—"), \
+               '' if chg is None else ('up' if chg >= 0 else 'down')
+
+    def _watch_row(self, ticker):
+        """Push one row's cells into the tree only if they differ from what is shown."""
+        cells = self._watch_cells(ticker)
+        if self._watch_shown.get(ticker) != cells:
+            self.watch_tree.item(ticker, values=cells[0], tags=(cells[1],))
+            self._watch_shown[ticker] = cells
+
+    def _watch_sort_value(self, ticker, col):
+        if col in ('ticker', 'exch'):
+            _, _, exch, disp = normalize_ticker(ticker, 'Auto')
+            return disp if col == 'ticker' else exch
+        return (self._watch_quotes.get(ticker) or {}).get(col)
+
+    def _watch_sync(self):
+        """Filter + sort the watchlist into the tree: delete / insert / move only what changed."""
+        tree, shown = self.watch_tree, self._watch_shown
+        f = self.watch_filter_var.get().strip().upper()
+        rows = [t for t in dict.fromkeys(self.watchlist)
+                if not f or f in t.upper() or f in normalize_ticker(t, 'Auto')[2].upper()]
+        col, rev = self._watch_sort_by
+        if col:
+            keyed = [(self._watch_sort_value(t, col), t) for t in rows]
+            rows = ([t for v, t in sorted((p for p in keyed if p[0] is not None), reverse=rev)]
+                    + [t for v, t in keyed if v is None])          # unpriced rows always last
+        keep = set(rows)
+        gone = [t for t in shown if t not in keep]
+        if gone:
+            tree.delete(*gone)
+            for t in gone: del shown[t]
+        for pos, t in enumerate(rows):
+            if t in shown: self._watch_row(t); continue
+            shown[t] = cells = self._watch_cells(t)
+            tree.insert('', pos, iid=t, values=cells[0], tags=(cells[1],))
+        if list(tree.get_children()) != rows:
+            for pos, t in enumerate(rows): tree.move(t, '', pos)
+        self._watch_count_var.set(f"{len(rows)} / {len(self.watchlist)} symbols")
+
+    def _watch_sort(self, col):
+        cur, rev = self._watch_sort_by
+        self._watch_sort_by = (col, not rev if cur == col else col in ('last', 'chg', 'high52', 'low52'))
+        for key, txt, _, _ in WATCH_COLUMNS:
+            arrow = (' ▼' if self._watch_sort_by[1] else ' ▲') if key == col else ''
+            self.watch_tree.heading(key, text=txt + arrow)
+        self._watch_sync()
+
+    def _watch_apply(self, quotes: dict, resort: bool = False):
+        """
+        Merge {ticker: quote fields} and update just those rows.  Live ticks
+        keep the current order (rows do not jump under the cursor); snapshot
+        refreshes pass ``resort`` to re-apply a price sort.
+        """
+        listed = set(self.watchlist)
+        for t, q in quotes.items():
+            if t in listed: self._watch_quotes.setdefault(t, {}).update(q)
+        if resort and self._watch_sort_by[0] in ('last', 'chg', 'high52', 'low52'):
+            self._watch_sync(); return
+        for t in quotes:
+            if t in self._watch_shown: self._watch_row(t)
+
+    def _watch_live(self, changed: dict):
+        """Tick-bus drain → watchlist rows: last price, change vs previous close, 52-week range."""
+        out = {}
+        for yf_t, (price, *_rest) in changed.items():
+            for t in self._watch_yf.get(yf_t, ()):
+                q = self._watch_quotes.get(t)
+                if q is None: continue                      # no snapshot yet: nothing to compare with
+                prev = q.get('prev')
+                out[t] = {'last': price,
+                          'chg': (price / prev - 1) * 100 if prev else q.get('chg'),
+                          'high52': max(q.get('high52') or price, price),
+                          'low52':  min(q.get('low52') or price, price)}
+        if out: self._watch_apply(out)
+
+    def _watch_selected(self):
+        return [t for t in self.watch_tree.selection() if t in self.watchlist]
+
+    def _watch_open_selected(self):
+        sel = self._watch_selected()
+        if sel: self._load_from_watchlist(sel[0], normalize_ticker(sel[0], 'Auto')[2])
+
+    def _watch_remove_selected(self):
+        sel = set(self._watch_selected())
+        if not sel: return
+        self.watchlist = [t for t in self.watchlist if t not in sel]
+        self._save_watchlist()
+        self._refresh_watchlist_panel()
 
     def _refresh_watchlist_prices(self):
-        def _fetch():
-            for ticker in list(self.watchlist):
-                yf_t, ccy, exch, _ = normalize_ticker(ticker, 'Auto')
-                try:
-                    d = fetch_data(yf_t,
-                                   (datetime.now()-timedelta(days=365)).strftime('%Y-%m-%d'),
-                                   datetime.now().strftime('%Y-%m-%d'))
-                    if d is None or d.empty: continue
-                    last  = float(d['Close'].iloc[-1])
-                    prev  = float(d['Close'].iloc[-2]) if len(d) > 1 else last
-                    chg   = (last/prev-1)*100
-                    h52   = float(d['High'].max())
-                    l52   = float(d['Low'].min())
-                    if ticker in self._watch_rows:
-                        lab = self._watch_rows[ticker]
-                        clr = C['green'] if chg >= 0 else C['red']
-                        c   = lab.get('ccy', '$')
-                        self.root.after(0, lambda l=lab,la=last,ch=chg,h=h52,lo=l52,cl2=clr,cy=c: (
-                            l['last'].config(text=fmt_price(la,cy), fg=C['white']),
-                            l['chg'].config(text=f"{ch:+.2f}%", fg=cl2),
-                            l['high52'].config(text=fmt_price(h,cy), fg=C['muted']),
-                            l['low52'].config(text=fmt_price(lo,cy), fg=C['muted']),
-                        ))
-                except Exception:
-                    pass
-        threading.Thread(target=_fetch, daemon=True).start()
+        tickers = list(self.watchlist)
+        if not tickers: return
+        yf_ts = {t: normalize_ticker(t, 'Auto')[0] for t in tickers}
+        self.quotes.refresh(sorted(set(yf_ts.values())),
+                            callback=lambda quotes: self._apply_watch_prices(yf_ts, quotes))
+
+    def _apply_watch_prices(self, yf_ts, quotes):
+        out = {}
+        for ticker, yf_t in yf_ts.items():
+            q = quotes.get(yf_t)
+            if q is None: continue
+            live = self.live_store.get_latest_price(yf_t)        # streamed price beats the snapshot
+            last = live if live is not None else q.last
+            out[ticker] = {'last': last, 'prev': q.prev,
+                           'chg': (last/q.prev-1)*100 if q.prev else None,
+                           'high52': max(q.high52, last), 'low52': min(q.low52, last)}
+        self._watch_apply(out, resort=True)
 
     def _remove_from_watchlist(self, ticker):
         if ticker in self.watchlist:
@@ -0,0 +1,241 @@
+"""
+QuantResearch Data Service
+==========================
+One asyncio event loop on a background thread owns network and disk I/O
+for every tab.
+
+    svc = get_service()
+    svc.attach_tk(root)                               # deliver callbacks on the Tk thread
+    svc.fetch('TCS.NS', '2024-01-01', '2024-12-31', callback=plot, errback=show_error)
+    svc.fetch_many(['AAPL', 'MSFT'], start, end, callback=render_all)
+    fut = svc.call(run_backtest, src, callback=on_result)   # blocking compute off the Tk thread
+    fut.cancel()
+
+* bounded concurrency: at most ``max_concurrency`` downloads at once
+* in-flight dedupe: identical (ticker, start, end) requests share one
+  download, e.g. the Historical and Multi tabs asking for the same symbol
+* cancellation: ``Future.cancel()``; a shared download is only cancelled
+  once every waiter has gone
+* results come back through ``ui_queue`` and are dispatched by ``pump``
+  (scheduled on the Tk loop by ``attach_tk``), never from the I/O thread
+* ``DataCache`` keeps fetched frames on disk; ranges that end before
+  today never expire, ranges touching today expire after ``ttl`` seconds
+"""
+
+from __future__ import annotations
+import asyncio, hashlib, os, queue, threading, time, traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date
+from typing import Callable
+
+import pandas as pd
+
+from .indicators import fetch_data
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".quant_cache")
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 1. DISK CACHE
+# ═══════════════════════════════════════════════════════════════════
+class DataCache:
+    VERSION = 1                            # bump to invalidate every cached frame
+
+    def __init__(self, root: str = CACHE_DIR, ttl: float = 900):
+        self.root = os.path.expanduser(root); self.ttl = ttl
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, key) -> str:
+        h = hashlib.sha1(repr((self.VERSION,) + tuple(key)).encode()).hexdigest()[:20]
+        return os.path.join(self.root, f"{key[0].replace('^', '_')}_{h}.pkl")
+
+    def get(self, key):
+        p = self._path(key)
+        try:
+            age = time.time() - os.path.getmtime(p)
+        except OSError:
+            return None
+        if str(key[2]) >= date.today().isoformat() and age > self.ttl: return None
+        try: return pd.read_pickle(p)
+        except Exception: return None
+
+    def put(self, key, df):
+        if df is None or df.empty: return
+        p = self._path(key); tmp = p + '.tmp'
+        try:
+            df.to_pickle(tmp); os.replace(tmp, p)
+        except Exception as exc:
+            print(f"[WARN] cache write {key[0]}: {exc}")
+
+    def clear(self):
+        for f in os.listdir(self.root):
+            if f.endswith('.pkl'):
+                try: os.remove(os.path.join(self.root, f))
+                except OSError: pass
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 2. SERVICE
+# ═══════════════════════════════════════════════════════════════════
+class DataService:
+    def __init__(self, max_concurrency: int = 4, cache: DataCache = None,
+                 compute_workers: int = 2, fetcher: Callable = None):
+        self.cache = cache if cache is not None else DataCache()
+        self.fetcher = fetcher or fetch_data
+        self.ui_queue: queue.Queue = queue.Queue()
+        self.counts = {'requests': 0, 'deduped': 0, 'cache_hits': 0, 'downloads': 0, 'cancelled': 0}
+        self._io = ThreadPoolExecutor(max_concurrency, thread_name_prefix='qr-io')
+        self._compute = ThreadPoolExecutor(compute_workers, thread_name_prefix='qr-compute')
+        self._inflight: dict = {}             # key → [task, waiters]
+        self._tk_widgets: set = set()
+        self._loop = asyncio.new_event_loop()
+        self._sem = asyncio.Semaphore(max_concurrency)
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True, name='qr-data')
+        self._thread.start()
+
+    # ── async API (runs on the service loop) ───────────────────
+    @staticmethod
+    def _key(ticker, start, end):
+        return (ticker.strip().upper(), str(start)[:10], str(end)[:10])
+
+    async def afetch(self, ticker: str, start, end) -> pd.DataFrame:
+        key = self._key(ticker, start, end)
+        self.counts['requests'] += 1
+        slot = self._inflight.get(key)
+        if slot is None:
+            task = self._loop.create_task(self._load(key))
+            slot = self._inflight[key] = [task, 0]
+            task.add_done_callback(lambda _t, k=key: self._inflight.pop(k, None))
+        else:
+            self.counts['deduped'] += 1
+        slot[1] += 1
+        try:
+            df = await asyncio.shield(slot[0])
+        except asyncio.CancelledError:
+            if not slot[0].done() and slot[1] == 1:
+                slot[0].cancel(); self.counts['cancelled'] += 1
+            raise
+        finally:
+            slot[1] -= 1
+        return df.copy() if df is not None else df
+
+    async def _load(self, key):
+        loop = self._loop
+        df = await loop.run_in_executor(self._io, self.cache.get, key)
+        if df is not None:
+            self.counts['cache_hits'] += 1; return df
+        async with self._sem:
+            self.counts['downloads'] += 1
+            df = await loop.run_in_executor(self._io, self.fetcher, *key)
+        if df is not None and not df.empty:
+            await loop.run_in_executor(self._io, self.cache.put, key, df)
+        return df
+
+    async def afetch_many(self, tickers, start, end) -> dict:
+        """{ticker: DataFrame | Exception}, fetched concurrently."""
+        res = await asyncio.gather(*(self.afetch(t, start, end) for t in tickers),
+                                   return_exceptions=True)
+        return dict(zip(tickers, res))
+
+    async def acall(self, fn: Callable, *args, **kw):
+        """Await blocking compute on the worker pool from a coroutine."""
+        return await self._loop.run_in_executor(self._compute, lambda: fn(*args, **kw))
+
+    async def aio(self, fn: Callable, *args, **kw):
+        """Await a blocking network / disk call on the I/O pool, within the download limit."""
+        async with self._sem:
+            return await self._loop.run_in_executor(self._io, lambda: fn(*args, **kw))
+
+    async def astream(self, tickers, on_message: Callable, url: str = None,
+                      backoff: float = 1.0, max_backoff: float = 60.0):
+        """Yahoo price stream on the service loop; reconnects with backoff until cancelled."""
+        import yfinance as yf
+        fails = 0
+        while True:
+            ws = yf.AsyncWebSocket(url, verbose=False) if url else yf.AsyncWebSocket(verbose=False)
+            t0 = time.monotonic()
+            try:
+                await ws.subscribe(list(tickers))
+                await ws.listen(on_message)
+            except asyncio.CancelledError:
+                await ws.close(); raise
+            except Exception as exc:
+                print(f"[WARN] stream: {exc}")
+            try: await ws.close()
+            except Exception: pass
+            fails = 0 if time.monotonic() - t0 > 30 else fails + 1
+            await asyncio.sleep(min(max_backoff, backoff * 2 ** max(fails - 1, 0)))
+
+    # ── thread-safe API ────────────────────────────────────────
+    def submit(self, coro, callback: Callable = None, errback: Callable = None) -> Future:
+        fut = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        if callback or errback:
+            fut.add_done_callback(lambda f: self._deliver(f, callback, errback))
+        return fut
+
+    def fetch(self, ticker, start, end, callback=None, errback=None) -> Future:
+        return self.submit(self.afetch(ticker, start, end), callback, errback)
+
+    def fetch_many(self, tickers, start, end, callback=None, errback=None) -> Future:
+        return self.submit(self.afetch_many(list(tickers), start, end), callback, errback)
+
+    def fetch_sync(self, ticker, start, end) -> pd.DataFrame:
+        """Blocking variant for worker threads (never call it on the Tk thread)."""
+        return self.fetch(ticker, start, end).result()
+
+    def stream(self, tickers, on_message, url=None) -> Future:
+        return self.submit(self.astream(tickers, on_message, url))
+
+    def call(self, fn: Callable, *args, callback=None, errback=None, **kw) -> Future:
+        """Run blocking compute on the worker pool; cancellable until it starts."""
+        return self.submit(self.acall(fn, *args, **kw), callback, errback)
+
+    # ── delivery to Tk ─────────────────────────────────────────
+    def _deliver(self, fut: Future, callback, errback):
+        if fut.cancelled(): return
+        exc = fut.exception()
+        if exc is None:
+            if callback: self.ui_queue.put((callback, fut.result()))
+        elif errback:
+            self.ui_queue.put((errback, exc))
+        else:
+            print(f"[WARN] data service: {exc}")
+
+    def pump(self, limit: int = 100) -> int:
+        """Run up to ``limit`` queued callbacks on the calling (Tk) thread."""
+        n = 0
+        while n < limit:
+            try: cb, arg = self.ui_queue.get_nowait()
+            except queue.Empty: break
+            try: cb(arg)
+            except Exception:
+                traceback.print_exc()
+            n += 1
+        return n
+
+    def attach_tk(self, widget, interval: int = 30):
+        """Schedule ``pump`` on ``widget``'s Tk loop (idempotent per Tk interpreter)."""
+        tk_id = str(widget.winfo_toplevel())
+        if tk_id in self._tk_widgets: return
+        self._tk_widgets.add(tk_id)
+        def _tick():
+            self.pump()
+            try: widget.after(interval, _tick)
+            except Exception: self._tk_widgets.discard(tk_id)
+        widget.after(interval, _tick)
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._io.shutdown(wait=False, cancel_futures=True)
+        self._compute.shutdown(wait=False, cancel_futures=True)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+def get_service() -> DataService:
+    """The process-wide DataService shared by all tabs."""
+    global _service
+    with _service_lock:
+        if _service is None: _service = DataService()
+        return _service
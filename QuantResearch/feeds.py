@@ -0,0 +1,266 @@
+"""
+QuantResearch Local Feeds
+=========================
+A local stand-in for the Yahoo streamer so the live pipeline can be
+exercised and profiled offline.
+
+``FeedServer`` speaks the same wire protocol as
+``wss://streamer.finance.yahoo.com`` (JSON ``{"subscribe": [...]}`` in,
+``{"message": base64(PricingData)}`` out), so the unchanged
+``yf.WebSocket`` client — and therefore ``WebSocketManager`` — connects to
+it just by switching ``url``.  Ticks come from a pluggable source:
+
+    GBMSource      geometric random walk, configurable rate / symbol count
+    ArchiveSource  recorded ``tick_archive`` data at 1x, Nx or max speed
+
+Every message is stamped with the send time, so ``FeedStats`` (a
+``LiveDataStore`` listener) measures end-to-end latency; the server
+counts updates it had to drop because a client fell behind.
+
+    srv = FeedServer(GBMSource(rate=5000, n_symbols=50)).start()
+    ws_manager.url = srv.url
+    ...
+    python -m QuantResearch.feeds --rate 20000 --symbols 100 --seconds 15
+"""
+
+from __future__ import annotations
+import argparse, asyncio, base64, itertools, json, threading, time
+
+import numpy as np
+
+from .live_feed import LiveDataStore, WebSocketManager
+from .tick_archive import TickArchive, _group_undelta
+
+try:
+    from websockets.asyncio.server import serve as _ws_serve
+except ImportError:                                   # websockets < 13
+    from websockets import serve as _ws_serve
+
+try:
+    from yfinance.live import PricingData
+except ImportError:
+    PricingData = None
+
+
+def encode_tick(symbol: str, price: float, ts_ms: int, size: float = 0.0) -> str:
+    """One Yahoo-format frame: ``{"message": base64(PricingData)}``."""
+    p = PricingData(id=symbol, price=price, time=int(ts_ms), last_size=int(size))
+    return json.dumps({"message": base64.b64encode(p.SerializeToString()).decode('ascii')})
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 1. SOURCES   —  batch(symbols, dt) → [(symbol, price, size), ...]
+# ═══════════════════════════════════════════════════════════════════
+class GBMSource:
+    """
+    Geometric random walk per symbol.  Emits ``rate`` ticks/s in total,
+    spread uniformly over ``symbols`` (or ``n_symbols`` generated names, or
+    whatever clients subscribe to when neither is given).
+    """
+    def __init__(self, rate: float = 1000, symbols: list = None, n_symbols: int = 0,
+                 step: float = 2e-4, start_price: float = 100.0, seed: int = None):
+        self.rate = float(rate); self.step = step; self.start_price = start_price
+        self.symbols = list(symbols or [f"SYM{i:04d}" for i in range(n_symbols)])
+        self._rng = np.random.default_rng(seed)
+        self._px: dict = {}; self._acc = 0.0
+
+    def batch(self, subscribed, dt):
+        syms = self.symbols or sorted(subscribed)
+        self._acc += self.rate * dt; n = int(self._acc); self._acc -= n
+        if not syms or n <= 0: return []
+        pick = self._rng.integers(0, len(syms), n).astype(np.uint16)
+        logp = _group_undelta(pick, self._rng.normal(0.0, self.step, n))   # per-symbol cumsum
+        base = np.array([self._px.get(s, self.start_price) for s in syms])
+        px = base[pick] * np.exp(logp)
+        for i, p in zip(pick.tolist(), px.tolist()): self._px[syms[i]] = p
+        return [(syms[i], p, 1.0) for i, p in zip(pick.tolist(), np.round(px, 2).tolist())]
+
+
+class ArchiveSource:
+    """Replays a tick archive with its original spacing ÷ ``speed`` (``None`` = max speed)."""
+    def __init__(self, root, start=None, end=None, symbols=None, speed: float = 1.0,
+                 loop: bool = True, max_batch: int = 5000):
+        self.arc = TickArchive(root) if isinstance(root, str) else root
+        self.args = (start, end, symbols); self.speed = speed
+        self.symbols = list(symbols) if symbols else sorted(
+            {s for blk in itertools.islice(self.arc.blocks(start, end), 16) for s in blk.symbols})
+        self.loop = loop; self.max_batch = max_batch
+        self._it = None; self._blk = None; self._i = 0
+        self._t0 = None; self._elapsed = 0.0
+
+    def _next_block(self):
+        while True:
+            if self._it is None: self._it = self.arc.blocks(*self.args)
+            blk = next(self._it, None)
+            if blk is not None: return blk
+            if not self.loop or self._t0 is None: return None
+            self._it = None; self._t0 = None; self._elapsed = 0.0
+
+    def batch(self, subscribed, dt):
+        out = []
+        self._elapsed += dt * (self.speed or 0)
+        while len(out) < self.max_batch:
+            if self._blk is None or self._i >= len(self._blk.ticks):
+                self._blk = self._next_block(); self._i = 0
+                if self._blk is None: break
+            t = self._blk.ticks[self._i]
+            if self._t0 is None: self._t0 = int(t['ts'])
+            if self.speed and (int(t['ts']) - self._t0) / 1000 > self._elapsed: break
+            out.append((self._blk.symbols[t['sym']], float(t['price']), float(t['size'])))
+            self._i += 1
+        return out
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 2. SERVER
+# ═══════════════════════════════════════════════════════════════════
+class FeedServer:
+    """
+    Asyncio WebSocket server on a daemon thread.  Each client gets a
+    bounded send queue; when it is full the update is dropped and counted
+    rather than letting one slow consumer stall the feed.
+    """
+    def __init__(self, source, host: str = '127.0.0.1', port: int = 0,
+                 interval: float = 0.005, queue_size: int = 10_000):
+        if PricingData is None:
+            raise RuntimeError("yfinance with live streaming support is required for FeedServer")
+        self.source = source; self.host = host; self.port = port
+        self.interval = interval; self.queue_size = queue_size
+        self._clients: dict = {}              # websocket → (subscriptions, queue)
+        self._loop = None; self._stop = None
+        self._ready = threading.Event(); self._thread = None
+        self.generated = self.sent = self.dropped = 0
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._main()), daemon=True)
+        self._thread.start()
+        if not self._ready.wait(5): raise RuntimeError("FeedServer did not start")
+        return self
+
+    def stop(self):
+        if self._loop and self._stop: self._loop.call_soon_threadsafe(self._stop.set)
+        if self._thread: self._thread.join(2)
+
+    def stats(self) -> dict:
+        return {'clients': len(self._clients), 'generated': self.generated,
+                'sent': self.sent, 'dropped': self.dropped}
+
+    async def _main(self):
+        self._loop = asyncio.get_running_loop(); self._stop = asyncio.Event()
+        async with _ws_serve(self._handler, self.host, self.port) as server:
+            self.port = next(iter(server.sockets)).getsockname()[1]
+            self._ready.set()
+            pump = asyncio.create_task(self._pump())
+            await self._stop.wait()
+            pump.cancel()
+
+    async def _handler(self, ws):
+        subs: set = set(); q: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self._clients[ws] = (subs, q)
+        writer = asyncio.create_task(self._writer(ws, q))
+        try:
+            async for raw in ws:
+                try: msg = json.loads(raw)
+                except ValueError: continue
+                subs.update(msg.get('subscribe', ()))
+                subs.difference_update(msg.get('unsubscribe', ()))
+        except Exception:
+            pass
+        finally:
+            writer.cancel(); self._clients.pop(ws, None)
+
+    async def _writer(self, ws, q):
+        while True:
+            msg = await q.get()
+            await ws.send(msg)
+            self.sent += 1
+
+    async def _pump(self):
+        last = time.monotonic()
+        while True:
+            await asyncio.sleep(self.interval)
+            now = time.monotonic(); dt = now - last; last = now
+            clients = list(self._clients.values())
+            if not clients: continue
+            subscribed = set().union(*(s for s, _ in clients))
+            ticks = self.source.batch(subscribed, dt)
+            ts = int(time.time() * 1000)
+            self.generated += len(ticks)
+            for sym, price, size in ticks:
+                frame = None
+                for subs, q in clients:
+                    if sym not in subs: continue
+                    if frame is None: frame = encode_tick(sym, price, ts, size)
+                    try: q.put_nowait(frame)
+                    except asyncio.QueueFull: self.dropped += 1
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 3. MEASUREMENT
+# ═══════════════════════════════════════════════════════════════════
+class FeedStats:
+    """LiveDataStore listener: received count, rate and send→store latency percentiles."""
+    def __init__(self, window: int = 65_536):
+        self._lat = np.zeros(window); self._n = 0
+        self._t0 = time.monotonic()
+
+    def __call__(self, ticker, ts_ms, price):
+        self._lat[self._n % len(self._lat)] = time.time() * 1000 - int(ts_ms)
+        self._n += 1
+
+    def reset(self):
+        self._n = 0; self._t0 = time.monotonic()
+
+    def report(self) -> dict:
+        n = self._n; lat = self._lat[:min(n, len(self._lat))]
+        el = max(time.monotonic() - self._t0, 1e-9)
+        if not len(lat): return {'received': 0, 'rate': 0.0}
+        p50, p99 = np.percentile(lat, [50, 99])
+        return {'received': n, 'rate': n / el, 'lat_p50_ms': float(p50),
+                'lat_p99_ms': float(p99), 'lat_max_ms': float(lat.max())}
+
+
+def load_test(rate: float = 2000, n_symbols: int = 20, seconds: float = 10,
+              refresh: float = 2.0, resample: str = '1min', source=None) -> dict:
+    """
+    Drive LiveDataStore through the real WebSocketManager from a local
+    server, calling ``get_ohlc`` for every symbol each ``refresh`` seconds
+    like the Live tab does.  Returns feed, latency and refresh timings.
+    """
+    src = source or GBMSource(rate=rate, n_symbols=n_symbols, seed=0)
+    srv = FeedServer(src).start()
+    store = LiveDataStore(); stats = FeedStats(); store.subscribe(stats)
+    syms = getattr(src, 'symbols', None) or [f"SYM{i:04d}" for i in range(n_symbols)]
+    ws = WebSocketManager(store, list(syms), url=srv.url); ws.start()
+    refresh_ms = []; t_end = time.monotonic() + seconds
+    try:
+        while time.monotonic() < t_end:
+            time.sleep(refresh)
+            t = time.perf_counter()
+            for s in store.tickers(): store.get_ohlc(s, resample)
+            refresh_ms.append((time.perf_counter() - t) * 1000)
+        out = {**srv.stats(), **stats.report()}
+    finally:
+        srv.stop()
+    out['lost'] = max(out['sent'] - out['received'], 0)
+    if refresh_ms:
+        out['refresh_ms_avg'] = float(np.mean(refresh_ms)); out['refresh_ms_max'] = float(np.max(refresh_ms))
+    return out
+
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description="Load-test the live feed path against a local server")
+    ap.add_argument('--rate', type=float, default=2000, help="ticks per second (all symbols)")
+    ap.add_argument('--symbols', type=int, default=20)
+    ap.add_argument('--seconds', type=float, default=10)
+    ap.add_argument('--refresh', type=float, default=2.0, help="seconds between get_ohlc sweeps")
+    ap.add_argument('--archive', help="replay this tick archive instead of GBM")
+    ap.add_argument('--speed', type=float, default=1.0, help="archive replay speed (0 = max)")
+    a = ap.parse_args()
+    src = ArchiveSource(a.archive, speed=a.speed or None) if a.archive else None
+    for k, v in load_test(a.rate, a.symbols, a.seconds, a.refresh, source=src).items():
+        print(f"{k:>16}: {v:,.2f}" if isinstance(v, float) else f"{k:>16}: {v:,}")
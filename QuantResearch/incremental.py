@@ -0,0 +1,312 @@
+"""
+QuantResearch Incremental Indicators
+====================================
+Streaming counterparts of the QuantQL indicator registry.  Each indicator
+keeps only the state it needs (a window deque or an EWM accumulator) and
+is advanced one bar at a time, so live consumers never recompute whole
+series.  Outputs use the same names as ``backtest_engine._IND_REG`` and
+follow the vectorised functions in ``indicators.py`` bar for bar,
+including their NaN warm-up.
+
+Also here: a tick → bar builder and a row-wise QuantQL condition
+evaluator that works on the current and previous bar only.
+"""
+
+from __future__ import annotations
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+import pandas as pd
+
+from .backtest_engine import (
+    CompareNode, CrossNode, LogicNode, NotNode, _needed_indicators,
+)
+
+NAN = float('nan')
+
+
+def _div(a, b):
+    """a / b with pandas semantics: x/0 → ±inf, 0/0 → NaN."""
+    if b == 0:
+        if a == 0 or a != a: return NAN
+        return math.copysign(math.inf, a)
+    return a / b
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 1. BUILDING BLOCKS
+# ═══════════════════════════════════════════════════════════════════
+class _Ewm:
+    """``Series.ewm(alpha=a, adjust=False).mean()`` one value at a time."""
+    __slots__ = ('a', 'y')
+    def __init__(self, alpha): self.a = alpha; self.y = NAN
+    def __call__(self, x):
+        if x != x: return self.y
+        self.y = x if self.y != self.y else self.a * x + (1 - self.a) * self.y
+        return self.y
+
+def _span(p): return _Ewm(2.0 / (int(p) + 1))
+
+
+class _Window:
+    """Fixed-length window; ``full`` once ``p`` values have been pushed."""
+    __slots__ = ('p', 'q')
+    def __init__(self, p): self.p = int(p); self.q = deque(maxlen=self.p)
+    def push(self, x): self.q.append(x); return self
+    @property
+    def full(self): return len(self.q) == self.p
+    def mean(self):
+        if not self.full: return NAN
+        return sum(self.q) / self.p
+    def std(self):
+        if not self.full or self.p < 2: return NAN
+        m = sum(self.q) / self.p
+        return math.sqrt(sum((x - m) ** 2 for x in self.q) / (self.p - 1))
+    def sum(self): return sum(self.q) if self.full else NAN
+    def min(self): return min(self.q) if self.full else NAN
+    def max(self): return max(self.q) if self.full else NAN
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 2. INDICATORS  —  update(o, h, l, c, v) → {output name: value}
+# ═══════════════════════════════════════════════════════════════════
+class _RSI:
+    def __init__(self, p=14): self.g = _Window(p); self.l = _Window(p); self.pc = NAN
+    def update(self, o, h, l, c, v):
+        d = c - self.pc; self.pc = c
+        g = self.g.push(d if d > 0 else 0.0).mean()
+        ls = self.l.push(-d if d < 0 else 0.0).mean()
+        return {'RSI': 100 - 100 / (1 + _div(g, ls))}
+
+class _MACD:
+    def __init__(self, s=12, l=26, sg=9): self.s = _span(s); self.l = _span(l); self.sg = _span(sg)
+    def update(self, o, h, l, c, v):
+        m = self.s(c) - self.l(c); si = self.sg(m)
+        return {'MACD': m, 'SIGNAL': si, 'HISTOGRAM': m - si}
+
+class _SMA:
+    def __init__(self, p=20): self.w = _Window(p)
+    def update(self, o, h, l, c, v): return {'SMA': self.w.push(c).mean()}
+
+class _EMA:
+    def __init__(self, p=20): self.e = _span(p)
+    def update(self, o, h, l, c, v): return {'EMA': self.e(c)}
+
+class _DEMA:
+    def __init__(self, p=20): self.e1 = _span(p); self.e2 = _span(p)
+    def update(self, o, h, l, c, v):
+        a = self.e1(c); return {'DEMA': 2 * a - self.e2(a)}
+
+class _TEMA:
+    def __init__(self, p=20): self.e1 = _span(p); self.e2 = _span(p); self.e3 = _span(p)
+    def update(self, o, h, l, c, v):
+        a = self.e1(c); b = self.e2(a)
+        return {'TEMA': 3 * a - 3 * b + self.e3(b)}
+
+class _BB:
+    def __init__(self, p=20, k=2): self.w = _Window(p); self.k = k
+    def update(self, o, h, l, c, v):
+        self.w.push(c); m = self.w.mean(); sd = self.w.std()
+        return {'BB_UPPER': m + sd * self.k, 'BB_MID': m, 'BB_LOWER': m - sd * self.k}
+
+def _true_range(h, l, pc):
+    if pc != pc: return h - l
+    return max(h - l, abs(h - pc), abs(l - pc))
+
+class _ATR:
+    def __init__(self, p=14): self.e = _Ewm(1.0 / int(p)); self.pc = NAN
+    def update(self, o, h, l, c, v):
+        tr = _true_range(h, l, self.pc); self.pc = c
+        return {'ATR': self.e(tr)}
+
+class _STOCH:
+    def __init__(self, kp=14, dp=3):
+        self.lo = _Window(kp); self.hi = _Window(kp); self.d = _Window(dp)
+    def update(self, o, h, l, c, v):
+        lmin = self.lo.push(l).min(); hmax = self.hi.push(h).max()
+        k = 100 * (c - lmin) / (hmax - lmin + 1e-9)
+        return {'STOCH_K': k, 'STOCH_D': self.d.push(k).mean()}
+
+class _WILLIAMS:
+    def __init__(self, p=14): self.lo = _Window(p); self.hi = _Window(p)
+    def update(self, o, h, l, c, v):
+        lmin = self.lo.push(l).min(); hmax = self.hi.push(h).max()
+        return {'WILLIAMS': -100 * (hmax - c) / (hmax - lmin + 1e-9)}
+
+class _ADX:
+    def __init__(self, p=14):
+        self.tr = _span(p); self.pd = _span(p); self.md = _span(p); self.dx = _span(p)
+        self.ph = self.pl = self.pc = NAN
+    def update(self, o, h, l, c, v):
+        up = h - self.ph; dn = self.pl - l
+        pdm = max(up, 0.0) if up == up else NAN
+        mdm = max(dn, 0.0) if dn == dn else NAN
+        if pdm <= mdm: pdm = 0.0
+        if mdm <= pdm: mdm = 0.0
+        a = self.tr(_true_range(h, l, self.pc))
+        self.ph, self.pl, self.pc = h, l, c
+        pdi = 100 * self.pd(pdm) / (a + 1e-9)
+        mdi = 100 * self.md(mdm) / (a + 1e-9)
+        dx = 100 * abs(pdi - mdi) / (pdi + mdi + 1e-9)
+        return {'ADX': self.dx(dx), 'PLUS_DI': pdi, 'MINUS_DI': mdi}
+
+class _SLOPE:
+    def __init__(self, p=14):
+        self.w = _Window(p); n = self.w.p
+        self.xm = (n - 1) / 2; self.sxx = sum((x - self.xm) ** 2 for x in range(n))
+    def update(self, o, h, l, c, v):
+        self.w.push(c)
+        if not self.w.full or self.sxx == 0: return {'SLOPE': NAN}
+        y = self.w.q; ym = sum(y) / self.w.p
+        if ym != ym: return {'SLOPE': NAN}
+        m = sum((x - self.xm) * (yy - ym) for x, yy in enumerate(y)) / self.sxx
+        return {'SLOPE': m / (ym or 1) * 100}
+
+class _SAR:
+    def __init__(self, af_start=0.02, af_step=0.02, af_max=0.2):
+        self.a0, self.st, self.mx = af_start, af_step, af_max
+        self.n = 0; self.sar = self.ep = self.af = NAN; self.tr = 1
+        self.h1 = self.l1 = self.h2 = self.l2 = NAN          # bars i-1, i-2
+    def update(self, o, h, l, c, v):
+        if self.n == 0:
+            self.sar, self.ep, self.af, self.tr = l, h, self.a0, 1
+        else:
+            l2 = self.l2 if self.n > 1 else self.l1
+            h2 = self.h2 if self.n > 1 else self.h1
+            sar = self.sar + self.af * (self.ep - self.sar)
+            if self.tr == 1:
+                sar = min(sar, self.l1, l2)
+                if l < sar:
+                    self.tr, sar, self.ep, self.af = -1, self.ep, l, self.a0
+                else:
+                    ep = max(self.ep, h)
+                    if ep > self.ep: self.af = min(self.af + self.st, self.mx)
+                    self.ep = ep
+            else:
+                sar = max(sar, self.h1, h2)
+                if h > sar:
+                    self.tr, sar, self.ep, self.af = 1, self.ep, h, self.a0
+                else:
+                    ep = min(self.ep, l)
+                    if ep < self.ep: self.af = min(self.af + self.st, self.mx)
+                    self.ep = ep
+            self.sar = sar
+        self.h2, self.l2, self.h1, self.l1 = self.h1, self.l1, h, l
+        self.n += 1
+        return {'SAR': self.sar, 'SAR_TREND': float(self.tr)}
+
+class _OBV:
+    def __init__(self): self.pc = NAN; self.v = 0.0
+    def update(self, o, h, l, c, v):
+        if c > self.pc: self.v += v
+        elif c < self.pc: self.v -= v
+        self.pc = c
+        return {'OBV': self.v}
+
+class _VWAP:
+    def __init__(self, p=20): self.pv = _Window(p); self.vv = _Window(p)
+    def update(self, o, h, l, c, v):
+        tp = (h + l + c) / 3
+        return {'VWAP': _div(self.pv.push(tp * v).sum(), self.vv.push(v).sum())}
+
+# positional params mirror the _c_* wrappers in backtest_engine
+_INC_REG = {
+    'RSI':_RSI,'MACD':_MACD,'SMA':_SMA,'EMA':_EMA,
+    'DEMA':_DEMA,'TEMA':_TEMA,'BB':_BB,'ATR':_ATR,
+    'STOCH':_STOCH,'STOCHASTIC':_STOCH,'WILLIAMS':_WILLIAMS,
+    'ADX':_ADX,'SLOPE':_SLOPE,'SAR':lambda *_: _SAR(),'PARABOLIC_SAR':lambda *_: _SAR(),
+    'OBV':lambda *_: _OBV(),'VWAP':_VWAP,'RVWAP':_VWAP,
+}
+
+
+class IndicatorSet:
+    """Incremental state for every indicator a Strategy needs."""
+    def __init__(self, strat):
+        self._ind = []
+        for key, pr in _needed_indicators(strat).items():
+            if key not in _INC_REG: continue
+            try: self._ind.append(_INC_REG[key](*[int(p) for p in pr]))
+            except Exception as e: print(f"[WARN] {key}: {e}")
+
+    def update(self, o, h, l, c, v=0.0) -> dict:
+        """Advance one bar; returns the row used by :func:`eval_row`."""
+        row = {'OPEN': o, 'HIGH': h, 'LOW': l, 'CLOSE': c, 'VOLUME': v}
+        for ind in self._ind: row.update(ind.update(o, h, l, c, v))
+        return row
+
+    def update_bar(self, bar) -> dict:
+        return self.update(bar.open, bar.high, bar.low, bar.close, bar.volume)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 3. ROW-WISE CONDITION EVALUATOR  (same semantics as backtest_engine._ec)
+# ═══════════════════════════════════════════════════════════════════
+def _rv_row(n, row):
+    if n.kind == 'number': return n.number
+    v = row.get(n.name, NAN)
+    return NAN if v is None else float(v)
+
+def eval_row(n, cur: dict, prev: dict = None) -> bool:
+    if n is None: return False
+    if isinstance(n, CompareNode):
+        lv, rv = _rv_row(n.left, cur), _rv_row(n.right, cur)
+        if math.isnan(lv) or math.isnan(rv): return False
+        return {'>':lv>rv,'<':lv<rv,'>=':lv>=rv,'<=':lv<=rv,'==':lv==rv,'!=':lv!=rv}.get(n.op, False)
+    if isinstance(n, CrossNode):
+        if prev is None: return False
+        ln2, rn = _rv_row(n.left, cur), _rv_row(n.right, cur)
+        lp, rp = _rv_row(n.left, prev), _rv_row(n.right, prev)
+        if any(math.isnan(x) for x in (ln2, rn, lp, rp)): return False
+        return (lp <= rp and ln2 > rn) if n.direction == 'above' else (lp >= rp and ln2 < rn)
+    if isinstance(n, LogicNode):
+        rs = [eval_row(c, cur, prev) for c in n.children]
+        return all(rs) if n.op == 'AND' else any(rs)
+    if isinstance(n, NotNode): return not eval_row(n.child, cur, prev)
+    return False
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 4. TICK → BAR BUILDER
+# ═══════════════════════════════════════════════════════════════════
+@dataclass
+class Bar:
+    start_ms: int; open: float; high: float; low: float; close: float
+    volume: float = 0.0; ticks: int = 0
+
+    @property
+    def time(self) -> Any:
+        return pd.Timestamp(self.start_ms, unit='ms')
+
+
+def interval_ms(interval) -> int:
+    """'1min', '5s', '15min' … (pandas offset strings) or seconds → milliseconds."""
+    if isinstance(interval, (int, float)): return int(interval * 1000)
+    return int(pd.Timedelta(interval).total_seconds() * 1000)
+
+
+class BarBuilder:
+    """
+    Buckets ticks into fixed-interval bars.  ``add`` returns the bar that a
+    tick *closes* (the first tick of a new bucket), otherwise None.  Late
+    ticks from an earlier bucket are folded into the forming bar.
+    """
+    def __init__(self, interval='1min'):
+        self.ms = interval_ms(interval)
+        self.bar: Bar = None
+
+    def add(self, ts_ms, price, size=0.0):
+        b = int(ts_ms) // self.ms * self.ms
+        cur = self.bar
+        if cur is None or b > cur.start_ms:
+            self.bar = Bar(b, price, price, price, price, size, 1)
+            return cur
+        if price > cur.high: cur.high = price
+        if price < cur.low: cur.low = price
+        cur.close = price; cur.volume += size; cur.ticks += 1
+        return None
+
+    def flush(self):
+        cur, self.bar = self.bar, None
+        return cur
@@ -0,0 +1,303 @@
+"""
+QuantResearch Live Feed
+=======================
+Tick store and WebSocket client behind the dashboard's Live tab.  Kept
+free of Tk so the feed path can run headless (``feeds`` load tests,
+paper trading, alerts).
+"""
+
+import logging, random, threading, time, zlib
+from collections import deque
+
+import pandas as pd
+import yfinance as yf
+
+try:
+    from websockets.exceptions import ConnectionClosed
+except ImportError:
+    ConnectionClosed = None
+
+
+# ═══════════════════════════════════════════════════════════════════
+# LIVE DATA STORE
+# ═══════════════════════════════════════════════════════════════════
+MAX_TICKS = 3000                    # per-symbol ring buffer
+class LiveDataStore:
+    def __init__(self):
+        self._lock  = threading.Lock()
+        self._ticks: dict = {}
+        self._prev_prices: dict = {}
+        self._listeners: list = []
+
+    def subscribe(self, callback):
+        """callback(ticker, timestamp_ms, price) runs on the feed thread for every tick."""
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners = self._listeners + [callback]
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._listeners = [c for c in self._listeners if c != callback]
+
+    def add_tick(self, ticker: str, timestamp_ms, price: float):
+        with self._lock:
+            buf = self._ticks.get(ticker)
+            if buf is None:
+                buf = self._ticks[ticker] = deque(maxlen=MAX_TICKS)
+            else:
+                self._prev_prices[ticker] = buf[-1][1]
+            buf.append((int(timestamp_ms), price))
+            listeners = self._listeners
+        for cb in listeners:
+            try: cb(ticker, timestamp_ms, price)
+            except Exception as exc: print(f"[WARN] tick listener: {exc}")
+
+    def get_ohlc(self, ticker: str, resample: str = "1min") -> pd.DataFrame:
+        with self._lock:
+            ticks = list(self._ticks.get(ticker, ()))
+        if not ticks:
+            return pd.DataFrame()
+        ts, px = zip(*ticks)
+        s = pd.Series(px, index=pd.DatetimeIndex(pd.to_datetime(ts, unit='ms'), name='time'),
+                      name='price', dtype=float)
+        return s.resample(resample).ohlc().dropna()
+
+    def get_latest_price(self, ticker: str):
+        with self._lock:
+            ticks = self._ticks.get(ticker)
+            return float(ticks[-1][1]) if ticks else None
+
+    def get_prev_price(self, ticker: str):
+        with self._lock:
+            return self._prev_prices.get(ticker)
+
+    def get_tick_log(self, ticker: str, n: int = 50):
+        with self._lock:
+            buf = self._ticks.get(ticker, ())
+            last = [buf[i] for i in range(max(len(buf) - n, 0), len(buf))]
+        return [{"time": pd.Timestamp(ts, unit='ms'), "price": p} for ts, p in last]
+
+    def tickers(self):
+        with self._lock:
+            return list(self._ticks.keys())
+
+
+# ═══════════════════════════════════════════════════════════════════
+# TICK BUS  (feed thread → Tk main loop)
+# ═══════════════════════════════════════════════════════════════════
+class TickBus:
+    """
+    Coalesces ticks per symbol between UI frames.  Subscribe it to a
+    LiveDataStore; the feed thread only overwrites the symbol's latest
+    value and marks it dirty.  The Tk side calls ``drain()`` once per
+    frame and gets ``{symbol: (price, prev_price, ts_ms, recent)}`` for the
+    symbols that changed, where ``recent`` holds at most ``keep`` of the
+    ticks that arrived since the previous drain (oldest first).
+    """
+    def __init__(self, keep: int = 20):
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._last: dict = {}            # symbol → price of the last drained / seen tick
+        self._dirty: dict = {}           # symbol → [price, prev, ts_ms, recent]
+        self.received = 0
+
+    def __call__(self, ticker, ts_ms, price):
+        with self._lock:
+            self.received += 1
+            d = self._dirty.get(ticker)
+            if d is None:
+                d = self._dirty[ticker] = [price, self._last.get(ticker), ts_ms, deque(maxlen=self.keep)]
+            else:
+                d[1] = d[0]; d[0] = price; d[2] = ts_ms
+            d[3].append((ts_ms, price))
+            self._last[ticker] = price
+
+    def drain(self) -> dict:
+        with self._lock:
+            out, self._dirty = self._dirty, {}
+        return {k: (v[0], v[1], v[2], list(v[3])) for k, v in out.items()}
+
+
+# ═══════════════════════════════════════════════════════════════════
+# WEBSOCKET MANAGER
+# ═══════════════════════════════════════════════════════════════════
+class _QuietClose(logging.Filter):
+    """yfinance logs a traceback whenever a socket closes; the supervisor already tracks that."""
+    def filter(self, rec):
+        exc = rec.exc_info[1] if rec.exc_info else None
+        return not (ConnectionClosed is not None and isinstance(exc, ConnectionClosed))
+
+_QUIET = _QuietClose()
+
+
+class _Shard:
+    """One WebSocket connection carrying a slice of the subscription list."""
+    def __init__(self, idx: int, tickers: list):
+        self.idx = idx; self.tickers = tickers
+        self.ws = None; self.thread = None
+        self.state = 'idle'; self.error = ''
+        self.msgs = 0; self.dups = 0; self.reconnects = 0
+        self.fresh: set = set()         # symbols with no tick since the last (re)subscribe
+        self.last_rx = 0.0; self.lag_ms = 0.0
+        self._rate_n = 0; self._rate_t = time.monotonic(); self.rate = 0.0
+
+
+class WebSocketManager:
+    """
+    Supervises ``shards`` WebSocket connections, each subscribed to a
+    stable hash-partition of ``tickers``.  A shard whose connection drops
+    is restarted with exponential backoff (``backoff`` … ``max_backoff``
+    seconds, with jitter); ``reconnect``/``stop`` close the old sockets
+    before anything new is opened, so connections never pile up.  A
+    symbol's first tick after a (re)subscribe is dropped when it exactly
+    repeats its previous one (timestamp, price and size) — that is the
+    replayed last quote — and per-shard throughput / lag is available from
+    ``stats()``.  ``shards=0`` picks one shard per ``per_shard`` symbols.
+    """
+    def __init__(self, store: LiveDataStore, tickers: list, url: str = None,
+                 shards: int = 0, per_shard: int = 100,
+                 backoff: float = 1.0, max_backoff: float = 60.0):
+        self.store   = store
+        self.tickers = tickers
+        self.url     = url              # None → Yahoo; e.g. FeedServer(...).url for a local feed
+        self.status_var = None
+        self.recorder   = None          # TickRecorder — every received tick is archived
+        self.n_shards, self.per_shard = shards, per_shard
+        self.backoff, self.max_backoff = backoff, max_backoff
+        self._shards: list = []
+        self._url    = url              # the URL the running shards were opened with
+        self._stop   = threading.Event()
+        self._lock   = threading.Lock()
+        self._last_tick: dict = {}      # symbol → (ts, price, size) of its last tick (dedupe)
+        logging.getLogger('yfinance').addFilter(_QUIET)
+
+    # ── message path (shard threads) ────────────────────────────
+    def _on_message(self, message: dict, shard: _Shard = None):
+        ticker = message.get("id", "")
+        price  = message.get("price")
+        ts     = message.get("time")
+        if ticker and price is not None and ts is not None:
+            ts = int(ts); size = message.get("last_size") or 0.0
+            key = (ts, price, size)
+            replay = shard is None or ticker in shard.fresh
+            if shard: shard.fresh.discard(ticker)
+            if replay and self._last_tick.get(ticker) == key:
+                if shard: shard.dups += 1
+                return
+            self._last_tick[ticker] = key
+            if shard:
+                shard.msgs += 1; shard.last_rx = time.monotonic()
+                shard.lag_ms = time.time() * 1000 - ts
+            rec = self.recorder
+            if rec is not None: rec.on_tick(ticker, ts, float(price), size)
+            self.store.add_tick(ticker, ts, float(price))
+
+    def _connect(self):
+        return yf.WebSocket(self.url, verbose=False) if self.url else yf.WebSocket(verbose=False)
+
+    def _supervise(self, sh: _Shard, stop: threading.Event):
+        fails = 0
+        while not stop.is_set():
+            sh.state = 'connecting'; self._update_status()
+            t0 = time.monotonic()
+            try:
+                with self._connect() as ws:
+                    sh.ws = ws
+                    if stop.is_set(): break
+                    sh.fresh = set(sh.tickers); ws.subscribe(sh.tickers)
+                    sh.state = 'live'; sh.error = ''; self._update_status()
+                    ws.listen(lambda m: self._on_message(m, sh))
+            except Exception as exc:
+                sh.error = str(exc)
+            finally:
+                sh.ws = None
+            if stop.is_set(): break
+            # a connection that stayed up for a while resets the backoff
+            fails = 0 if time.monotonic() - t0 > 30 else fails + 1
+            delay = min(self.max_backoff, self.backoff * 2 ** max(fails - 1, 0))
+            delay *= random.uniform(0.8, 1.2)
+            sh.state = f'retry in {delay:.0f}s'; sh.reconnects += 1; self._update_status()
+            stop.wait(delay)
+        sh.state = 'stopped'
+
+    # ── control ─────────────────────────────────────────────────
+    def _partition(self, tickers):
+        n = self.n_shards or max(1, -(-len(tickers) // self.per_shard))
+        parts = [[] for _ in range(min(n, max(len(tickers), 1)))]
+        for t in tickers: parts[zlib.crc32(t.encode()) % len(parts)].append(t)
+        return [p for p in parts if p]
+
+    def start(self, tickers: list = None):
+        with self._lock:
+            if tickers: self.tickers = tickers
+            if self._shards and any(sh.thread.is_alive() for sh in self._shards):
+                if (self._url == self.url and
+                        sorted(t for sh in self._shards for t in sh.tickers) == sorted(self.tickers)):
+                    return
+                self._shutdown()
+            if self._url != self.url: self._last_tick.clear()   # another feed's ticks
+            self._url = self.url
+            self._stop = stop = threading.Event()
+            self._shards = [_Shard(i, part) for i, part in enumerate(self._partition(self.tickers))]
+            for sh in self._shards:
+                sh.thread = threading.Thread(target=self._supervise, args=(sh, stop), daemon=True)
+                sh.thread.start()
+        self._update_status()
+
+    def reconnect(self, tickers: list = None):
+        """Close every shard, then start fresh (new subscription list if given)."""
+        with self._lock:
+            if tickers: self.tickers = tickers
+            self._shutdown()
+        self.start()
+
+    def stop(self):
+        with self._lock: self._shutdown()
+        self._set_status("⚫  Disconnected")
+
+    def _shutdown(self, timeout: float = 5.0):
+        self._stop.set()
+        for sh in self._shards:
+            ws = sh.ws
+            if ws is not None:
+                try: ws.close()
+                except Exception: pass
+        for sh in self._shards:
+            if sh.thread: sh.thread.join(timeout)
+        self._shards = []
+
+    # ── observability ──────────────────────────────────────────
+    @property
+    def running(self) -> bool:
+        return bool(self._shards)
+
+    def stats(self) -> list:
+        """Per shard: state, symbols, messages, msgs/s since last call, dups, reconnects, lag."""
+        now = time.monotonic(); out = []
+        for sh in list(self._shards):
+            dt = now - sh._rate_t
+            if dt >= 0.5:
+                sh.rate = (sh.msgs - sh._rate_n) / dt; sh._rate_n = sh.msgs; sh._rate_t = now
+            out.append({'shard': sh.idx, 'state': sh.state, 'symbols': len(sh.tickers),
+                        'msgs': sh.msgs, 'rate': sh.rate, 'dups': sh.dups,
+                        'reconnects': sh.reconnects, 'lag_ms': sh.lag_ms,
+                        'idle_s': now - sh.last_rx if sh.last_rx else None, 'error': sh.error})
+        return out
+
+    def _update_status(self):
+        shards = list(self._shards)
+        if not shards: return
+        live = sum(sh.state == 'live' for sh in shards)
+        if live == len(shards):
+            self._set_status(f"🟢  Live — {len(self.tickers)} tickers" +
+                             (f" · {live} shards" if live > 1 else ""))
+        elif live:
+            self._set_status(f"🟡  {live}/{len(shards)} shards live")
+        else:
+            err = next((sh.error for sh in shards if sh.error), '')
+            self._set_status(f"⚠️  {err}" if err else "🔴  Connecting…")
+
+    def _set_status(self, text: str):
+        if self.status_var:
+            try: self.status_var.set(text)
+            except Exception: pass
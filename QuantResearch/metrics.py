@@ -0,0 +1,306 @@
+"""
+QuantResearch Metrics
+=====================
+Typed performance records, computed with numpy from trade arrays and
+equity / price curves.
+
+    m = backtest_metrics(pnl, commission, hold_days, equity, capital=100_000)
+    m.sharpe, m.max_drawdown                      # plain floats (fractions, not percents)
+    m['Sharpe Ratio']                             # '1.23' — the formatted report view
+    table = BacktestMetrics.array(results)        # structured array, sort / filter sweeps
+    best = table[np.argsort(-table['sharpe'])[:10]]
+
+* numeric fields only; ratios are fractions (0.12 = 12 %), an undefined
+  value is NaN and an unbounded profit factor is ``inf``
+* formatting lives in ``formatted()``; each record is also a read-only
+  Mapping over those labels, so ``metrics.items()`` still prints the report
+"""
+
+from __future__ import annotations
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+ANN = 252                                     # trading days per year
+RISK_FREE = 0.065                             # annual, Indian repo rate approximation
+
+
+@lru_cache(maxsize=None)
+def _casts(cls) -> tuple:
+    return tuple((f.name, int if f.type in ('int', int) else float)
+                 for f in fields(cls) if f.type in ('int', 'float', int, float))
+
+
+class _Record(Mapping):
+    """Numeric dataclass record + label → string Mapping view + structured-array dtype."""
+    def __post_init__(self):
+        for name, cast in _casts(type(self)):  # plain Python numbers, whatever numpy produced
+            v = getattr(self, name)
+            if type(v) is not cast: setattr(self, name, cast(v))
+
+    def formatted(self) -> dict:
+        raise NotImplementedError
+
+    def __getitem__(self, key):  return self.formatted()[key]
+    def __iter__(self):          return iter(self.formatted())
+    def __len__(self):           return len(self.formatted())
+
+    @classmethod
+    def dtype(cls) -> np.dtype:
+        return np.dtype([(f.name, 'i8' if f.type in ('int', int) else 'f8')
+                         for f in fields(cls) if f.type in ('int', 'float', int, float)])
+
+    @classmethod
+    def sql_columns(cls) -> list:
+        """(name, SQLite type) per field, for tables that store these records."""
+        sql = {'int': 'INTEGER', 'float': 'REAL', 'str': 'TEXT'}
+        return [(f.name, sql[getattr(f.type, '__name__', f.type)]) for f in fields(cls)]
+
+    def to_record(self) -> tuple:
+        return tuple(getattr(self, n) for n in self.dtype().names)
+
+    @classmethod
+    def array(cls, records) -> np.ndarray:
+        """Records → one structured array (e.g. a whole sweep, ready for argsort)."""
+        return np.array([r.to_record() for r in records], dtype=cls.dtype())
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 1. BACKTEST METRICS
+# ═══════════════════════════════════════════════════════════════════
+@dataclass(eq=False)
+class BacktestMetrics(_Record):
+    total_trades: int = 0
+    winners: int = 0
+    losers: int = 0
+    win_rate: float = float('nan')
+    net_pnl: float = 0.0
+    total_return: float = float('nan')
+    gross_profit: float = 0.0
+    gross_loss: float = 0.0
+    profit_factor: float = float('nan')
+    avg_win: float = 0.0
+    avg_loss: float = 0.0
+    max_consec_wins: int = 0
+    max_consec_losses: int = 0
+    avg_hold_days: float = float('nan')
+    total_commission: float = 0.0
+    sharpe: float = float('nan')
+    max_drawdown: float = float('nan')
+    volatility: float = float('nan')
+    starting_capital: float = float('nan')
+    final_equity: float = float('nan')
+    note: str = ''
+
+    def formatted(self) -> dict:
+        if self.total_trades == 0 or self.note:
+            return {'Total Trades': str(self.total_trades),
+                    'Note': self.note or 'No trades — conditions never triggered'}
+        pf = self.profit_factor
+        return {
+            'Total Trades':str(self.total_trades),'Winners':str(self.winners),'Losers':str(self.losers),
+            'Win Rate':f"{self.win_rate*100:.1f}%",'Net P&L':f"{self.net_pnl:+,.2f}",
+            'Total Return':f"{self.total_return*100:+.2f}%",'Gross Profit':f"{self.gross_profit:+,.2f}",
+            'Gross Loss':f"{self.gross_loss:+,.2f}",'Profit Factor':f"{pf:.2f}" if pf!=float('inf') else "∞",
+            'Avg Win':f"{self.avg_win:+,.2f}",'Avg Loss':f"{self.avg_loss:+,.2f}",
+            'Max Consec Wins':str(self.max_consec_wins),'Max Consec Losses':str(self.max_consec_losses),
+            'Avg Hold (days)':f"{self.avg_hold_days:.1f}" if self.avg_hold_days==self.avg_hold_days else "—",
+            'Total Commission':f"{self.total_commission:,.2f}",
+            'Sharpe Ratio':f"{self.sharpe:.2f}",'Max Drawdown':f"{self.max_drawdown*100:.2f}%",
+            'Volatility':f"{self.volatility*100:.2f}%",
+            'Starting Capital':f"{self.starting_capital:,.0f}",'Final Equity':f"{self.final_equity:,.2f}",
+        }
+
+
+def _longest_run(mask: np.ndarray) -> int:
+    if not mask.any(): return 0
+    d = np.diff(np.r_[0, mask.astype(np.int8), 0])
+    return int((np.flatnonzero(d == -1) - np.flatnonzero(d == 1)).max())
+
+
+def hold_days(entry, exit) -> np.ndarray:
+    """Calendar days held per trade (at least 1); NaN where a date is missing."""
+    e = pd.DatetimeIndex(pd.to_datetime(entry, errors='coerce'))
+    x = pd.DatetimeIndex(pd.to_datetime(exit, errors='coerce'))
+    d = (x - e).days.to_numpy(float)
+    return np.where(np.isnan(d), np.nan, np.maximum(d, 1))
+
+
+def backtest_metrics(pnl, commission, hold, equity, capital: float,
+                     risk_free: float = RISK_FREE) -> BacktestMetrics:
+    """Metrics from per-trade P&L / commission / hold-day arrays and the equity curve."""
+    pnl = np.asarray(pnl, float); n = len(pnl)
+    if n == 0: return BacktestMetrics(starting_capital=capital)
+    win = pnl > 0
+    gp = pnl[win].sum(); gl = pnl[~win].sum()
+    hold = np.asarray(hold, float); hold = hold[~np.isnan(hold)]
+    eq = np.asarray(equity, float)
+    ret = eq[1:] / eq[:-1] - 1; ret = ret[~np.isnan(ret)]
+    rf = (1 + risk_free) ** (1 / ANN) - 1
+    sd = ret.std(ddof=1) if len(ret) > 1 else float('nan')
+    cum = eq[1:]; peak = np.maximum.accumulate(cum) if len(cum) else cum
+    return BacktestMetrics(
+        total_trades=n, winners=int(win.sum()), losers=int(n - win.sum()),
+        win_rate=win.mean(), net_pnl=pnl.sum(), total_return=eq[-1] / eq[0] - 1,
+        gross_profit=gp, gross_loss=gl,
+        profit_factor=abs(gp / gl) if gl != 0 else float('inf'),
+        avg_win=pnl[win].mean() if win.any() else 0.0,
+        avg_loss=pnl[~win].mean() if (~win).any() else 0.0,
+        max_consec_wins=_longest_run(win), max_consec_losses=_longest_run(~win),
+        avg_hold_days=hold.mean() if len(hold) else float('nan'),
+        total_commission=float(np.sum(commission)),
+        sharpe=(ret.mean() - rf) / sd * np.sqrt(ANN) if sd > 0 else 0.0,
+        max_drawdown=((cum - peak) / peak).min() if len(cum) else float('nan'),
+        volatility=sd * np.sqrt(ANN) if len(ret) > 1 else 0.0,
+        starting_capital=capital, final_equity=eq[-1],
+    )
+
+
+def _longest_runs(col, mask, m) -> np.ndarray:
+    """``_longest_run`` per column for a mask laid out in column-sorted order."""
+    out = np.zeros(m, np.int64)
+    if not mask.any(): return out
+    new = np.r_[True, col[1:] != col[:-1]]
+    start = mask & (new | ~np.r_[False, mask[:-1]])
+    run = np.cumsum(start) - 1
+    np.maximum.at(out, col[start], np.bincount(run[mask]))
+    return out
+
+
+def batch_metrics(col, pnl, commission, hold, equity, capital,
+                  risk_free: float = RISK_FREE) -> list:
+    """
+    ``backtest_metrics`` for many runs at once: trade arrays tagged with their
+    run number ``col`` (sorted, trades in time order within a run) and
+    ``equity`` as bars × runs.  Same values up to float summation order.
+    """
+    eq = np.asarray(equity, float); m = eq.shape[1]
+    col = np.asarray(col, np.int64); pnl = np.asarray(pnl, float); hold = np.asarray(hold, float)
+    cap = np.broadcast_to(np.asarray(capital, float), (m,))
+    cnt = np.bincount(col, minlength=m); win = pnl > 0
+    nw = np.bincount(col[win], minlength=m); nl = cnt - nw
+    gp = np.bincount(col, np.where(win, pnl, 0.0), m); gl = np.bincount(col, np.where(win, 0.0, pnl), m)
+    ok = ~np.isnan(hold); nh = np.bincount(col[ok], minlength=m)
+    hs = np.bincount(col[ok], hold[ok], m)
+    comm = np.bincount(col, np.asarray(commission, float), m)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ret = eq[1:] / eq[:-1] - 1; okr = ~np.isnan(ret)
+        if okr.all():
+            nr = np.full(m, len(ret)); mean = ret.mean(0); sd = ret.std(0, ddof=1)
+        else:
+            nr = okr.sum(0); mean = np.where(okr, ret, 0.0).sum(0) / nr
+            sd = np.sqrt(np.where(okr, (ret - mean) ** 2, 0.0).sum(0) / (nr - 1))
+        sd = np.where(nr > 1, sd, np.nan)
+        rf = (1 + risk_free) ** (1 / ANN) - 1
+        cum = eq[1:]; peak = np.maximum.accumulate(cum, 0)
+        mdd = ((cum - peak) / peak).min(0) if len(cum) else np.full(m, np.nan)
+        cols = dict(
+            total_trades=cnt, winners=nw, losers=nl, win_rate=nw / cnt, net_pnl=gp + gl,
+            total_return=eq[-1] / eq[0] - 1, gross_profit=gp, gross_loss=gl,
+            profit_factor=np.where(gl != 0, np.abs(gp / gl), np.inf),
+            avg_win=np.where(nw > 0, gp / nw, 0.0), avg_loss=np.where(nl > 0, gl / nl, 0.0),
+            max_consec_wins=_longest_runs(col, win, m), max_consec_losses=_longest_runs(col, ~win, m),
+            avg_hold_days=np.where(nh > 0, hs / nh, np.nan), total_commission=comm,
+            sharpe=np.where(sd > 0, (mean - rf) / sd * np.sqrt(ANN), 0.0), max_drawdown=mdd,
+            volatility=np.where(nr > 1, sd * np.sqrt(ANN), 0.0),
+            starting_capital=cap, final_equity=eq[-1])
+    rows = zip(*(v.tolist() for v in cols.values()))
+    return [BacktestMetrics(**dict(zip(cols, r))) if r[0] else BacktestMetrics(starting_capital=r[-2])
+            for r in rows]
+
+
+def trade_metrics(trades, equity, capital: float) -> BacktestMetrics:
+    """``backtest_metrics`` for a list of ``Trade`` objects."""
+    n = len(trades)
+    col = lambda a: np.fromiter((getattr(t, a) for t in trades), float, n)
+    hold = hold_days([t.entry_date for t in trades], [t.exit_date for t in trades])
+    eq = equity.to_numpy(float) if isinstance(equity, pd.Series) else equity
+    return backtest_metrics(col('pnl'), col('commission'), hold, eq, capital)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 2. PRICE-SERIES (QUANT) METRICS
+# ═══════════════════════════════════════════════════════════════════
+@dataclass(eq=False)
+class QuantMetrics(_Record):
+    total_return: float
+    cagr: float
+    volatility: float
+    sharpe: float
+    sortino: float
+    max_drawdown: float
+    calmar: float
+    var_95: float
+    cvar_95: float
+    win_rate: float
+    profit_factor: float
+    bars: int
+    beta: float = float('nan')                # benchmark fields stay NaN without a benchmark
+    alpha_ann: float = float('nan')
+    correlation: float = float('nan')
+
+    def formatted(self) -> dict:
+        out = {
+            'Total Return':   f"{self.total_return*100:+.2f}%",
+            'CAGR':           f"{self.cagr*100:.2f}%",
+            'Volatility':     f"{self.volatility*100:.2f}%",
+            'Sharpe':         f"{self.sharpe:.2f}",
+            'Sortino':        f"{self.sortino:.2f}",
+            'Max Drawdown':   f"{self.max_drawdown*100:.2f}%",
+            'Calmar':         f"{self.calmar:.2f}",
+            'VaR 95%':        f"{self.var_95*100:.2f}%",
+            'CVaR 95%':       f"{self.cvar_95*100:.2f}%",
+            'Win Rate':       f"{self.win_rate*100:.1f}%",
+            'Profit Factor':  f"{self.profit_factor:.2f}",
+            'Bars':           str(self.bars),
+        }
+        if self.beta == self.beta:
+            out['Beta']        = f"{self.beta:.2f}"
+            out['Alpha (ann)'] = f"{self.alpha_ann*100:+.2f}%"
+            out['Correlation'] = f"{self.correlation:.2f}"
+        return out
+
+
+def compute_quant_metrics(prices: pd.Series, benchmark_prices: pd.Series = None,
+                          risk_free: float = RISK_FREE):
+    """
+    Quant-grade metrics of a price series → ``QuantMetrics`` (None with fewer than 5 returns).
+    risk_free: annual rate (default 6.5% – Indian repo rate approximation)
+    """
+    p = prices.to_numpy(float)
+    ret = p[1:] / p[:-1] - 1; ok = ~np.isnan(ret); r = ret[ok]
+    if len(r) < 5: return None
+    rf = (1 + risk_free) ** (1 / ANN) - 1
+
+    total_ret = p[-1] / p[0] - 1
+    cagr = (1 + total_ret) ** (ANN / len(p)) - 1
+    sd = r.std(ddof=1)
+    down = r[r < rf]
+    dsd = down.std(ddof=1) if len(down) > 1 else (float('nan') if len(down) else 1e-9)
+    cum = np.cumprod(1 + r); dd = cum / np.maximum.accumulate(cum) - 1; mdd = dd.min()
+    var = np.percentile(r, 5)
+    up, dn = r[r > 0], r[r < 0]
+    aw = up.mean() if len(up) else 0.0; al = dn.mean() if len(dn) else 0.0
+    m = QuantMetrics(
+        total_return=total_ret, cagr=cagr, volatility=sd * np.sqrt(ANN),
+        sharpe=(r.mean() - rf) / sd * np.sqrt(ANN) if sd > 0 else 0.0,
+        sortino=(r.mean() - rf) / dsd * np.sqrt(ANN),
+        max_drawdown=mdd, calmar=cagr / abs(mdd) if mdd != 0 else 0.0,
+        var_95=var, cvar_95=r[r <= var].mean(), win_rate=(r > 0).mean(),
+        profit_factor=abs(aw / al) if al != 0 else 0.0, bars=len(p))
+
+    # Beta / Alpha vs benchmark, on the dates both series have
+    if benchmark_prices is not None and len(benchmark_prices) > 5:
+        ra = pd.Series(ret[ok], index=prices.index[1:][ok])
+        rb = benchmark_prices.pct_change().dropna()
+        common = ra.index.intersection(rb.index)
+        if len(common) > 5:
+            a, b = ra.loc[common].to_numpy(), rb.loc[common].to_numpy(float)
+            cov = np.cov(a, b)
+            m.beta = cov[0, 1] / cov[1, 1] if cov[1, 1] != 0 else 0.0
+            m.alpha_ann = (a.mean() - (rf + m.beta * (b.mean() - rf))) * ANN
+            m.correlation = np.corrcoef(a, b)[0, 1]
+    return m
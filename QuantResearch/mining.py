@@ -0,0 +1,367 @@
+"""
+QuantResearch Strategy Mining
+=============================
+Generates QuantQL rules from the indicator registry and the condition
+grammar, scores whole populations on one cached OHLCV frame, and breeds
+the best (tournament selection, subtree crossover, point mutation).
+
+    miner = StrategyMiner(data, population=300, generations=15, workers=4, seed=1)
+    top = miner.run()                     # ranked MinedStrategy list
+    print(top[0].script)                  # a plain QuantQL script for run_backtest / the Backtest tab
+
+* every sub-expression mask is memoised by its structural key (node shape,
+  operator, threshold and indicator parameters), so a shared
+  ``RSI(14) < 30`` is computed once per worker and reused by every
+  individual and generation that contains it
+* a population is simulated as one bars × individuals matrix
+  (``batch_backtest.simulate``), split into batches over a process pool;
+  ``workers=0`` evaluates in-process
+* scores are metrics of an exact ``BacktestEngine`` run: re-running
+  ``script`` gives the same trades
+* ``fitness`` is a metrics field or ``callable(BacktestMetrics) -> float``;
+  runs with fewer than ``min_trades`` trades score ``-inf`` and each
+  condition leaf costs ``parsimony``
+* ``holdout`` keeps the last fraction of bars out of the search and
+  reports each result's metrics on it as ``holdout_metrics``
+"""
+
+from __future__ import annotations
+import copy, math, os, random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from .backtest_engine import (
+    BacktestEngine, CompareNode, CrossNode, IndicatorDecl, LogicNode, NotNode, Parser,
+    Strategy, ValueNode, unparse_strategy, _ALIAS, _IND_REG, _PRICE_COL, _needed_indicators,
+    _mask_node,
+)
+from .batch_backtest import column_metrics, simulate
+from .metrics import BacktestMetrics
+
+# key → (parameter choices per slot, {output: kind}); kinds pick the leaf shapes:
+#   osc   — bounded 0-100 oscillator: thresholds, or crosses of sibling outputs
+#   price — on the price scale: compared / crossed with CLOSE or another price output
+#   zero  — centred on 0: sign tests, or crosses of sibling outputs
+VOCAB = {
+    'RSI':   (((7, 9, 14, 21),),              {'RSI': 'osc'}),
+    'STOCH': (((9, 14, 21), (3, 5)),          {'STOCH_K': 'osc', 'STOCH_D': 'osc'}),
+    'ADX':   (((14, 20),),                    {'ADX': 'osc', 'PLUS_DI': 'osc', 'MINUS_DI': 'osc'}),
+    'SMA':   (((10, 20, 50, 100, 200),),      {'SMA': 'price'}),
+    'EMA':   (((9, 12, 20, 50, 100),),        {'EMA': 'price'}),
+    'DEMA':  (((10, 20, 50),),                {'DEMA': 'price'}),
+    'TEMA':  (((10, 20, 50),),                {'TEMA': 'price'}),
+    'BB':    (((20, 30),),                    {'BB_UPPER': 'price', 'BB_MID': 'price', 'BB_LOWER': 'price'}),
+    'VWAP':  (((20, 50),),                    {'VWAP': 'price'}),
+    'SAR':   ((),                             {'SAR': 'price'}),
+    'MACD':  (((8, 12), (21, 26), (9,)),      {'MACD': 'zero', 'SIGNAL': 'zero', 'HISTOGRAM': 'zero'}),
+    'SLOPE': (((14, 20),),                    {'SLOPE': 'zero'}),
+}
+THRESHOLDS = tuple(range(10, 95, 5))          # osc levels
+MEMO_LIMIT = 20_000                           # masks kept per worker before the memo is reset
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 1. STRUCTURE
+# ═══════════════════════════════════════════════════════════════════
+def _params(s: Strategy) -> dict:
+    return {k: tuple(v) for k, v in _needed_indicators(s).items()}
+
+
+def node_key(n, prm: dict):
+    """Structural key of a condition / value: equal keys ⇒ equal masks on the same data."""
+    if isinstance(n, ValueNode):
+        if n.kind == 'number': return float(n.number)
+        if n.kind == 'price': return n.name
+        return (n.name, prm.get(_ALIAS.get(n.name, n.name), ()))
+    if isinstance(n, CompareNode): return ('c', n.op, node_key(n.left, prm), node_key(n.right, prm))
+    if isinstance(n, CrossNode):   return ('x', n.direction, node_key(n.left, prm), node_key(n.right, prm))
+    if isinstance(n, LogicNode):   return (n.op,) + tuple(node_key(c, prm) for c in n.children)
+    if isinstance(n, NotNode):     return ('not', node_key(n.child, prm))
+    return None
+
+
+def strategy_key(s: Strategy):
+    prm = _params(s)
+    return (node_key(s.buy_cond, prm), node_key(s.sell_cond, prm))
+
+
+def _slots(n, parent=None, i=None, out=None):
+    """Every condition node as (node, parent, index in parent) for subtree surgery."""
+    out = [] if out is None else out
+    out.append((n, parent, i))
+    if isinstance(n, LogicNode):
+        for j, c in enumerate(n.children): _slots(c, n, j, out)
+    elif isinstance(n, NotNode): _slots(n.child, n, None, out)
+    return out
+
+
+def _leaves(n) -> int:
+    if isinstance(n, LogicNode): return sum(_leaves(c) for c in n.children)
+    if isinstance(n, NotNode): return _leaves(n.child)
+    return 1
+
+
+def _keys_used(*conds) -> set:
+    used = set()
+    def walk(n):
+        if isinstance(n, ValueNode):
+            if n.kind == 'indicator': used.add(_ALIAS.get(n.name, n.name))
+        elif isinstance(n, (CompareNode, CrossNode)): walk(n.left); walk(n.right)
+        elif isinstance(n, LogicNode):
+            for c in n.children: walk(c)
+        elif isinstance(n, NotNode): walk(n.child)
+    for c in conds: walk(c)
+    return used
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 2. EVALUATION  (one per worker process)
+# ═══════════════════════════════════════════════════════════════════
+class MaskEvaluator:
+    """Masks and column backtests on one frame, with the structural mask memo."""
+
+    def __init__(self, data: pd.DataFrame):
+        self.data = data; self.n = len(data)
+        self.close = data['Close'].to_numpy(float)
+        self.masks: dict = {}; self.series: dict = {}
+        self.counts = {'hits': 0, 'misses': 0}
+
+    def _series(self, key, pr):
+        if (key, pr) not in self.series:
+            try: self.series[key, pr] = {nm: np.asarray(v, float)
+                                         for nm, v in _IND_REG[key](self.data, *pr).items()}
+            except Exception as e:
+                print(f"[WARN] {key}{pr}: {e}"); self.series[key, pr] = {}
+        return self.series[key, pr]
+
+    def mask(self, n, prm: dict) -> np.ndarray:
+        if n is None: return np.zeros(self.n, bool)
+        k = node_key(n, prm)
+        m = self.masks.get(k)
+        if m is not None: self.counts['hits'] += 1; return m
+        self.counts['misses'] += 1
+        if isinstance(n, LogicNode):
+            ms = [self.mask(c, prm) for c in n.children]
+            m = np.logical_and.reduce(ms) if n.op == 'AND' else np.logical_or.reduce(ms)
+        elif isinstance(n, NotNode):
+            m = ~self.mask(n.child, prm)
+        else:
+            def val(v):
+                if v.kind == 'number': return v.number
+                if v.kind == 'price': return self.data[_PRICE_COL.get(v.name, v.name)].to_numpy(float)
+                key = _ALIAS.get(v.name, v.name)
+                if key not in _IND_REG: return np.full(self.n, np.nan)
+                return self._series(key, prm.get(key, ())).get(v.name, np.full(self.n, np.nan))
+            with np.errstate(invalid='ignore'):
+                m = np.broadcast_to(_mask_node(n, val), (self.n,))
+        if len(self.masks) >= MEMO_LIMIT: self.masks.clear()
+        self.masks[k] = m
+        return m
+
+    def evaluate(self, strats: list) -> list:
+        """``BacktestMetrics`` of each strategy (all on this frame), simulated as one matrix."""
+        P = len(strats)
+        buy = np.empty((self.n, P), bool); sell = np.empty((self.n, P), bool)
+        for j, s in enumerate(strats):
+            prm = _params(s)
+            buy[:, j] = self.mask(s.buy_cond, prm); sell[:, j] = self.mask(s.sell_cond, prm)
+        f = lambda a: np.array([getattr(s, a) for s in strats], float)
+        eq, log, _ = simulate(self.close, buy, sell, f('capital'), f('position_pct'),
+                           f('commission_pct'), f('stop_loss_pct'), f('take_profit_pct'))
+        return column_metrics(self.data.index, eq, log, f('capital'))
+
+
+_WORKER: MaskEvaluator = None
+
+def _init_worker(data):
+    global _WORKER
+    _WORKER = MaskEvaluator(data)
+
+def _evaluate(strats):
+    return _WORKER.evaluate(strats)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 3. SEARCH
+# ═══════════════════════════════════════════════════════════════════
+@dataclass
+class MinedStrategy:
+    score: float
+    metrics: BacktestMetrics
+    strategy: Strategy
+    script: str
+    holdout_metrics: BacktestMetrics = None
+
+
+class StrategyMiner:
+    def __init__(self, data: pd.DataFrame, template: Strategy = None, population: int = 200,
+                 generations: int = 10, fitness='sharpe', min_trades: int = 5,
+                 parsimony: float = 0.01, max_leaves: int = 4, elite: int = 10,
+                 tournament: int = 3, crossover: float = 0.7, mutation: float = 0.4,
+                 holdout: float = 0.0, workers: int = None, vocab: dict = None,
+                 seed: int = None, on_generation: Callable = None):
+        self.template = template or Strategy(name='Mined')
+        cut = int(len(data) * (1 - holdout)) if holdout else len(data)
+        self.data = data.iloc[:cut]; self.holdout_data = data.iloc[cut:] if holdout else None
+        self.population = population; self.generations = generations
+        self.fitness = fitness; self.min_trades = min_trades; self.parsimony = parsimony
+        self.max_leaves = max_leaves; self.elite = elite; self.tournament = tournament
+        self.cx = crossover; self.mut = mutation
+        self.workers = os.cpu_count() if workers is None else workers
+        self.vocab = vocab or {k: v for k, v in VOCAB.items() if k in _IND_REG}
+        self.rng = random.Random(seed); self.on_generation = on_generation
+        self.scores: dict = {}                    # strategy_key → (score, metrics, strategy)
+        self.counts = {'evaluated': 0, 'duplicates': 0}
+
+    @classmethod
+    def from_ticker(cls, ticker: str, market: str = 'Auto', period: str = '2Y', **kw) -> "StrategyMiner":
+        """Fetch (or read from the disk cache) the ticker's history through the data service."""
+        from .data_service import get_service
+        t = replace(kw.pop('template', None) or Strategy(name='Mined'), ticker=ticker, market=market,
+                    period_str=period, period_days=Parser._parse_period(period))
+        data = BacktestEngine(t, get_service().fetch_sync).fetch_data()[0]
+        return cls(data, template=t, **kw)
+
+    # ── random generation ─────────────────────────────────────
+    def _leaf(self, prm: dict):
+        r = self.rng
+        key = r.choice(sorted(self.vocab)); choices, outs = self.vocab[key]
+        if key not in prm: prm[key] = tuple(r.choice(c) for c in choices)
+        out = r.choice(sorted(outs)); kind = outs[out]
+        sib = [o for o in sorted(outs) if o != out and outs[o] == kind]
+        v = lambda nm: ValueNode('indicator', name=nm)
+        if kind == 'osc':
+            if sib and r.random() < 0.3:
+                return CrossNode(v(out), r.choice(('above', 'below')), v(r.choice(sib)))
+            th = ValueNode('number', number=r.choice(THRESHOLDS))
+            if r.random() < 0.25: return CrossNode(v(out), r.choice(('above', 'below')), th)
+            return CompareNode(v(out), r.choice(('<', '>')), th)
+        if kind == 'zero':
+            right = v(r.choice(sib)) if sib and r.random() < 0.5 else ValueNode('number', number=0)
+            if r.random() < 0.5: return CrossNode(v(out), r.choice(('above', 'below')), right)
+            return CompareNode(v(out), r.choice(('<', '>')), right)
+        other = v(r.choice(sib)) if sib and r.random() < 0.3 else ValueNode('price', name='CLOSE')
+        a, b = (v(out), other) if r.random() < 0.5 else (other, v(out))
+        if r.random() < 0.5: return CrossNode(a, r.choice(('above', 'below')), b)
+        return CompareNode(a, r.choice(('<', '>')), b)
+
+    def _tree(self, prm: dict, leaves: int):
+        if leaves <= 1:
+            leaf = self._leaf(prm)
+            return NotNode(leaf) if self.rng.random() < 0.05 else leaf
+        k = self.rng.randint(1, leaves - 1)
+        return LogicNode(self.rng.choice(('AND', 'OR')), [self._tree(prm, k), self._tree(prm, leaves - k)])
+
+    def _build(self, buy, sell, prm: dict) -> Strategy:
+        used = _keys_used(buy, sell)
+        return replace(self.template, buy_cond=buy, sell_cond=sell,
+                       indicators=[IndicatorDecl(k, prm[k]) for k in sorted(used)])
+
+    def random_strategy(self) -> Strategy:
+        prm = {}; n = lambda: self.rng.randint(1, max(1, self.max_leaves // 2))
+        return self._build(self._tree(prm, n()), self._tree(prm, n()), prm)
+
+    # ── variation ─────────────────────────────────────────────
+    def _crossover(self, a: Strategy, b: Strategy) -> Strategy:
+        side = self.rng.choice(('buy_cond', 'sell_cond'))
+        child = copy.deepcopy(a); prm = _params(child)
+        donor = copy.deepcopy(self.rng.choice(_slots(getattr(b, side)))[0])
+        node, parent, i = self.rng.choice(_slots(getattr(child, side)))
+        if parent is None:            setattr(child, side, donor)
+        elif isinstance(parent, NotNode): parent.child = donor
+        else:                         parent.children[i] = donor
+        for k, pr in _params(b).items(): prm.setdefault(k, pr)
+        return self._build(child.buy_cond, child.sell_cond, prm)
+
+    def _mutate(self, s: Strategy) -> Strategy:
+        r = self.rng
+        s = copy.deepcopy(s); prm = _params(s)
+        side = r.choice(('buy_cond', 'sell_cond'))
+        node, parent, i = r.choice(_slots(getattr(s, side)))
+        kind = r.choice(('threshold', 'flip', 'param', 'subtree', 'logic'))
+        if kind == 'threshold' and isinstance(node, (CompareNode, CrossNode)) \
+                and node.right.kind == 'number' and node.right.number > 0:
+            node.right.number = float(min(95, max(5, node.right.number + r.choice((-10, -5, 5, 10)))))
+        elif kind == 'flip' and isinstance(node, CompareNode):
+            node.op = {'<': '>', '>': '<', '<=': '>=', '>=': '<='}.get(node.op, node.op)
+        elif kind == 'flip' and isinstance(node, CrossNode):
+            node.direction = 'below' if node.direction == 'above' else 'above'
+        elif kind == 'param' and prm:
+            key = r.choice(sorted(k for k in prm if k in self.vocab) or sorted(prm))
+            if key in self.vocab and self.vocab[key][0]:
+                prm[key] = tuple(r.choice(c) for c in self.vocab[key][0])
+        elif kind == 'logic' and isinstance(node, LogicNode):
+            node.op = 'OR' if node.op == 'AND' else 'AND'
+        else:
+            new = self._tree(prm, r.randint(1, 2))
+            if parent is None:                setattr(s, side, new)
+            elif isinstance(parent, NotNode): parent.child = new
+            else:                             parent.children[i] = new
+        return self._build(s.buy_cond, s.sell_cond, prm)
+
+    def _pick(self, ranked):
+        return min(self.rng.sample(range(len(ranked)), min(self.tournament, len(ranked))))
+
+    # ── scoring ───────────────────────────────────────────────
+    def score(self, m: BacktestMetrics, s: Strategy) -> float:
+        if m.total_trades < self.min_trades: return -math.inf
+        v = self.fitness(m) if callable(self.fitness) else getattr(m, self.fitness)
+        if v != v: return -math.inf
+        return v - self.parsimony * (_leaves(s.buy_cond) + _leaves(s.sell_cond))
+
+    def _evaluate(self, strats, pool):
+        todo = {}
+        for s in strats:
+            k = strategy_key(s)
+            if k in self.scores or k in todo: self.counts['duplicates'] += 1
+            else: todo[k] = s
+        items = list(todo.items())
+        if not items: return
+        if pool is None:
+            res = _evaluate([s for _, s in items])
+        else:
+            size = max(1, -(-len(items) // (self.workers * 2)))
+            parts = [[s for _, s in items[a:a + size]] for a in range(0, len(items), size)]
+            res = [m for part in pool.map(_evaluate, parts) for m in part]
+        for (k, s), m in zip(items, res):
+            self.scores[k] = (self.score(m, s), m, s)
+        self.counts['evaluated'] += len(items)
+
+    def run(self, top: int = 20) -> list:
+        """Evolve for ``generations`` and return the ``top`` distinct strategies, best first."""
+        global _WORKER
+        pool = None
+        if self.workers and self.workers > 1:
+            pool = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.data,))
+        else:
+            _WORKER = MaskEvaluator(self.data)
+        try:
+            pop = [self.random_strategy() for _ in range(self.population)]
+            for g in range(self.generations):
+                self._evaluate(pop, pool)
+                ranked = sorted({strategy_key(s): s for s in pop}.values(),
+                                key=lambda s: -self.scores[strategy_key(s)][0])
+                if self.on_generation: self.on_generation(g, self.scores[strategy_key(ranked[0])])
+                if g == self.generations - 1: break
+                nxt = ranked[:self.elite]
+                while len(nxt) < self.population:
+                    a = ranked[self._pick(ranked)]
+                    if self.rng.random() < self.cx: a = self._crossover(a, ranked[self._pick(ranked)])
+                    if self.rng.random() < self.mut: a = self._mutate(a)
+                    if _leaves(a.buy_cond) + _leaves(a.sell_cond) <= 2 * self.max_leaves: nxt.append(a)
+                pop = nxt
+        finally:
+            if pool is not None: pool.shutdown()
+        best = sorted(self.scores.values(), key=lambda t: -t[0])[:top]
+        out = []
+        for i, (sc, m, s) in enumerate(best):
+            s = replace(s, name=f"{self.template.name} #{i + 1}")
+            out.append(MinedStrategy(sc, m, s, unparse_strategy(s)))
+        if self.holdout_data is not None and len(self.holdout_data) > 1 and out:
+            hm = MaskEvaluator(self.holdout_data).evaluate([o.strategy for o in out])
+            for o, m in zip(out, hm): o.holdout_metrics = m
+        return out
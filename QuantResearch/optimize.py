@@ -0,0 +1,236 @@
+"""
+QuantResearch Parameter Optimizer
+=================================
+Searches a strategy's parameter slots for the best fitness with a Parzen
+estimator surrogate (TPE) and successive halving instead of a full grid:
+most candidates are only ever simulated on a short recent window, and
+only the promising ones reach the full history.
+
+    space = {'buy[0]': (10, 50), 'sell[0]': (50, 90), 'STOP_LOSS': [0, 2, 3, 5, 8]}
+    res = optimize(src, space, budget=60, max_drawdown=0.25, seed=1)
+    res.params, res.metrics.sharpe        # best full-history run
+    res.script                            # QuantQL with the winning values filled in
+
+* ``space`` keys are ``batch_backtest`` slots; ``(lo, hi)`` is an integer
+  range when both bounds are ints and a float range otherwise, a list is a
+  set of choices
+* every round proposes ``batch`` candidates (``eta ** rungs``, 9, by
+  default): random at first, then the ones maximising l(x)/g(x), the
+  Parzen densities of the best ``gamma`` share of trials and of the rest,
+  fitted on the longest rung with enough trials
+* successive halving: a round is simulated on the last
+  len/eta^(rungs-1) bars and each rung promotes its best 1/eta to a
+  window eta times longer, up to the full history; indicators always see
+  the whole history and are computed once
+* ``max_drawdown`` (a fraction) and ``max_trades`` abort a run on the bar
+  it violates them (``batch_backtest.simulate``); aborted runs score -inf
+* ``budget`` is counted in full-history backtest equivalents (bars
+  simulated / len(data)): a default round costs 6 and sends 3
+  candidates through the full history
+"""
+
+from __future__ import annotations
+import math, random
+from dataclasses import asdict, dataclass, field
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from .backtest_engine import BacktestEngine, Strategy, compile_strategy, unparse_strategy
+from .batch_backtest import BatchBacktestEngine, apply_params, param_slots
+from .metrics import BacktestMetrics
+
+GAMMA      = 0.25                   # share of trials modelled as "good"
+CANDIDATES = 24                     # surrogate samples scored per proposal
+MIN_WINDOW = 120                    # shorter halving rungs are skipped
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 1. SEARCH SPACE  (every dimension mapped to [0, 1])
+# ═══════════════════════════════════════════════════════════════════
+class _Dim:
+    __slots__ = ('key', 'lo', 'hi', 'integer', 'choices')
+
+    def __init__(self, key, spec):
+        self.key = key; self.choices = None
+        if isinstance(spec, tuple) and len(spec) == 2 and not isinstance(spec[0], str):
+            self.lo, self.hi = spec
+            if self.hi < self.lo: raise ValueError(f"{key}: empty range {spec}")
+            self.integer = isinstance(self.lo, int) and isinstance(self.hi, int)
+        else:
+            self.choices = list(spec)
+            if not self.choices: raise ValueError(f"{key}: no choices")
+
+    def decode(self, u: float):
+        if self.choices is not None: return self.choices[min(int(u * len(self.choices)), len(self.choices) - 1)]
+        if self.integer: return int(round(self.lo + u * (self.hi - self.lo)))
+        return self.lo + u * (self.hi - self.lo)
+
+    def encode(self, v) -> float:
+        if self.choices is not None: return (self.choices.index(v) + 0.5) / len(self.choices)
+        return (v - self.lo) / (self.hi - self.lo) if self.hi > self.lo else 0.5
+
+
+def _bandwidth(x: np.ndarray) -> float:
+    return float(np.clip(1.06 * (x.std() if len(x) > 1 else 0.25) * len(x) ** -0.2, 0.02, 0.5))
+
+
+def _log_density(u: np.ndarray, pts: np.ndarray) -> np.ndarray:
+    """Log of a Gaussian Parzen mixture over ``pts`` plus one uniform prior component, at ``u``."""
+    h = _bandwidth(pts)
+    k = np.exp(-0.5 * ((u[:, None] - pts[None, :]) / h) ** 2) / (h * math.sqrt(2 * math.pi))
+    return np.log((k.sum(1) + 1.0) / (len(pts) + 1))
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 2. OPTIMIZER
+# ═══════════════════════════════════════════════════════════════════
+@dataclass
+class Trial:
+    params: dict
+    rung: int                       # 0 = shortest window; the last rung is the full history
+    bars: int
+    score: float
+    metrics: BacktestMetrics
+    pruned: int = -1                # bar the run was aborted on (within its window), -1 = ran through
+
+
+@dataclass
+class OptimizeResult:
+    params: dict
+    score: float
+    metrics: BacktestMetrics
+    strategy: Strategy
+    script: str
+    trials: list = field(default_factory=list)
+    full_runs: int = 0              # candidates that reached the full history
+    cost: float = 0.0               # full-history backtest equivalents simulated
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per trial: parameters, rung, bars, score, pruned bar and the metric fields."""
+        rows = [{**t.params, 'rung': t.rung, 'bars': t.bars, 'score': t.score, 'pruned': t.pruned,
+                 **asdict(t.metrics)} for t in self.trials]
+        return pd.DataFrame(rows)
+
+
+class ParamOptimizer:
+    def __init__(self, strat: Strategy, space: dict, data: pd.DataFrame, fitness='sharpe',
+                 min_trades: int = 5, budget: float = 60, batch: int = None, eta: int = 3,
+                 rungs: int = 2, max_drawdown: float = None, max_trades: int = None,
+                 gamma: float = GAMMA, candidates: int = CANDIDATES, explore: float = 0.1,
+                 seed: int = None, on_round: Callable = None):
+        slots = param_slots(strat)
+        bad = [k for k in space if k not in slots]
+        if bad: raise KeyError(f"unknown slot(s) {bad}; available: {list(slots)}")
+        self.strat = strat; self.data = data; self.dims = [_Dim(k, v) for k, v in space.items()]
+        self.fitness = fitness; self.min_trades = min_trades; self.budget = budget
+        self.eta = eta; self.batch = batch or eta ** rungs
+        self.max_drawdown = max_drawdown; self.max_trades = max_trades
+        self.gamma = gamma; self.candidates = candidates; self.explore = explore
+        self.rng = random.Random(seed); self.nprng = np.random.default_rng(seed)
+        self.on_round = on_round
+        n = len(data)
+        self.windows = sorted({w for w in (n // eta ** r for r in range(rungs)) if w >= min(MIN_WINDOW, n)})
+        self.trials: list = []
+        self.obs = [[] for _ in self.windows]     # per rung: (unit vector, score)
+        self.seen: set = set()
+        self.cost = 0.0
+        self._cache: dict = {}                   # indicators shared by every round
+
+    def score(self, m: BacktestMetrics, bars: int, pruned: int) -> float:
+        if pruned >= 0 or m.total_trades < self.min_trades * bars / len(self.data): return -math.inf
+        v = self.fitness(m) if callable(self.fitness) else getattr(m, self.fitness)
+        return -math.inf if v != v else float(v)
+
+    # ── proposals ─────────────────────────────────────────────
+    def _params(self, u) -> dict:
+        return {d.key: d.decode(x) for d, x in zip(self.dims, u)}
+
+    def _key(self, p: dict):
+        return tuple(p[d.key] for d in self.dims)
+
+    def _model(self):
+        """(good, bad) unit-vector arrays from the highest rung with enough trials, or None."""
+        need = max(10, 3 * len(self.dims))
+        for obs in reversed(self.obs):
+            if len(obs) < need: continue
+            obs = sorted(obs, key=lambda t: -t[1])
+            g = min(max(2, int(math.ceil(self.gamma * len(obs)))), sum(t[1] > -math.inf for t in obs))
+            if g < 2: continue
+            return (np.array([u for u, _ in obs[:g]]), np.array([u for u, _ in obs[g:]]))
+        return None
+
+    def _propose(self) -> list:
+        """One round of new candidates; each accepted one joins the bad set so the batch spreads out."""
+        model = self._model(); out = []; keys = set(); d = len(self.dims)
+        for _ in range(self.batch * 20):
+            if len(out) == self.batch: break
+            if model is None or self.rng.random() < self.explore:
+                u = self.nprng.random(d)
+            else:
+                good, bad = model
+                c = self.candidates
+                pick = self.nprng.integers(0, len(good) + 1, c)       # len(good) → the uniform prior
+                prior = (pick == len(good))[:, None]
+                h = np.array([_bandwidth(good[:, j]) for j in range(d)])
+                u = good[np.minimum(pick, len(good) - 1)] + self.nprng.normal(0, 1, (c, d)) * h
+                u = np.where(prior, self.nprng.random((c, d)), 1 - np.abs(1 - np.abs(u)))   # reflect into [0, 1]
+                u = np.clip(u, 0, 1 - 1e-9)
+                ei = sum(_log_density(u[:, j], good[:, j]) - _log_density(u[:, j], bad[:, j]) for j in range(d))
+                u = u[int(np.argmax(ei))]
+            p = self._params(u); k = self._key(p)
+            if k in self.seen or k in keys: continue
+            u = np.array([dm.encode(p[dm.key]) for dm in self.dims])
+            keys.add(k); out.append(u)
+            if model is not None: model = (model[0], np.vstack([model[1], u]))
+        return out
+
+    # ── successive halving ────────────────────────────────────
+    def _evaluate(self, us: list, rung: int) -> list:
+        bars = self.windows[rung]
+        eng = BatchBacktestEngine(self.strat, points=[self._params(u) for u in us],
+                                  max_drawdown=self.max_drawdown, max_trades=self.max_trades)
+        res = eng.run(self.data, window=bars, cache=self._cache)
+        self.cost += len(us) * bars / len(self.data)
+        out = []
+        for u, m, pr in zip(us, res.metrics, res.pruned):
+            t = Trial(self._params(u), rung, bars, self.score(m, bars, int(pr)), m, int(pr))
+            self.trials.append(t); self.obs[rung].append((u, t.score)); out.append((u, t))
+        return out
+
+    def _round(self, us: list):
+        for rung in range(len(self.windows)):
+            done = self._evaluate(us, rung)
+            if rung == len(self.windows) - 1: break
+            done = sorted((x for x in done if x[1].score > -math.inf), key=lambda x: -x[1].score)
+            keep = max(1, len(us) // self.eta)
+            us = [u for u, _ in done[:keep]]
+            if not us: break
+
+    def run(self) -> OptimizeResult:
+        """Run rounds until ``budget`` is spent; returns the best full-history trial."""
+        full = len(self.windows) - 1
+        while self.cost < self.budget:
+            us = self._propose()
+            if not us: break                     # space exhausted
+            for u in us: self.seen.add(self._key(self._params(u)))
+            self._round(us)
+            if self.on_round: self.on_round(self.cost, self.best())
+        best = self.best()
+        if best is None: raise RuntimeError("no candidate reached the full history; raise the budget")
+        if best.score == -math.inf: print("[WARN] no full-history run met min_trades / the constraints")
+        s = apply_params(self.strat, best.params)
+        return OptimizeResult(best.params, best.score, best.metrics, s, unparse_strategy(s),
+                              self.trials, sum(t.rung == full for t in self.trials), self.cost)
+
+    def best(self) -> Trial:
+        full = [t for t in self.trials if t.rung == len(self.windows) - 1]
+        return max(full, key=lambda t: t.score) if full else None
+
+
+def optimize(src: str, space: dict, data: pd.DataFrame = None, fetcher=None, **kw) -> OptimizeResult:
+    """Compile ``src``, fetch its data when ``data`` is None, and run a ``ParamOptimizer``."""
+    strat = compile_strategy(src)
+    if data is None: data = BacktestEngine(strat, fetcher).fetch_data()[0]
+    return ParamOptimizer(strat, space, data, **kw).run()
@@ -0,0 +1,297 @@
+"""
+QuantResearch Paper Trading
+===========================
+Runs compiled QuantQL strategies against the live tick stream.  Each
+``PaperTrader`` applies the same trade management as
+``BacktestEngine.run`` (capital, position size, stop-loss, take-profit,
+commission) but advances incrementally: ticks fold into bars, indicators
+update in O(1), signals are evaluated once per closed bar and stops are
+checked on every tick.  Many traders can share one feed through
+``PaperTradingEngine``.
+
+State is written to an append-only JSON-lines journal.  A restart reads
+the journal back (trades, equity, and the last committed state blob)
+instead of replaying ticks.
+"""
+
+from __future__ import annotations
+import base64, json, os, pickle, re, threading
+
+import pandas as pd
+
+from .backtest_engine import (
+    Strategy, Trade, BacktestEngine, compile_strategy, normalize_ticker,
+)
+from .incremental import IndicatorSet, BarBuilder, eval_row
+from .metrics import BacktestMetrics
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 1. JOURNAL
+# ═══════════════════════════════════════════════════════════════════
+def _trade_rec(t: Trade) -> dict:
+    return dict(entry_date=str(t.entry_date), entry_price=t.entry_price, shares=t.shares,
+                exit_date=str(t.exit_date) if t.exit_date is not None else None,
+                exit_price=t.exit_price, exit_reason=t.exit_reason,
+                pnl=t.pnl, pnl_pct=t.pnl_pct, commission=t.commission)
+
+def _trade_from(rec: dict) -> Trade:
+    t = Trade(**{k: rec.get(k) for k in Trade.__dataclass_fields__ if k in rec})
+    t.entry_date = pd.Timestamp(t.entry_date) if t.entry_date else None
+    t.exit_date = pd.Timestamp(t.exit_date) if t.exit_date else None
+    return t
+
+
+class PaperJournal:
+    """
+    Append-only JSON-lines log.  Record kinds:
+      ``open`` / ``close``  trade events
+      ``bar``               closed bar + mark-to-market equity
+      ``state``             base64 pickle of the trader's live state (commit point)
+    """
+    def __init__(self, path: str, fsync: bool = False):
+        self.path = path; self.fsync = fsync
+        d = os.path.dirname(os.path.abspath(path))
+        os.makedirs(d, exist_ok=True)
+        self._f = open(path, 'a', encoding='utf-8')
+
+    def write(self, kind: str, **rec):
+        rec['k'] = kind
+        self._f.write(json.dumps(rec, default=str) + '\n')
+        self._f.flush()
+        if self.fsync: os.fsync(self._f.fileno())
+
+    def close(self):
+        try: self._f.close()
+        except Exception: pass
+
+    @staticmethod
+    def read(path: str):
+        if not os.path.exists(path): return
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line: continue
+                try: yield json.loads(line)
+                except ValueError: return        # torn final line after a crash
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 2. PAPER TRADER  (one strategy, one symbol)
+# ═══════════════════════════════════════════════════════════════════
+class PaperTrader:
+    """
+    Incremental equivalent of ``BacktestEngine.run`` for a single strategy.
+
+    Signals are evaluated at bar close exactly like the backtest loop; stop
+    and target are additionally checked on every tick and fill at the tick
+    price.  ``warmup`` bars are consumed before any trade (use ``prime`` to
+    pre-load history so live trading can start immediately).
+    """
+    _STATE = ('ind', 'bars', 'cash', 'pos', 'n', 'prev', 'last_price')
+
+    def __init__(self, strat: Strategy, interval='1min', warmup: int = 0,
+                 journal: PaperJournal = None, name: str = None):
+        self.strat = strat
+        self.name = name or strat.name
+        self.yf_ticker, self.currency, self.exchange, _ = normalize_ticker(strat.ticker, strat.market)
+        self.interval = interval
+        self.warmup = warmup
+        self.journal = journal
+        self.ind = IndicatorSet(strat)
+        self.bars = BarBuilder(interval)
+        self.cash = strat.capital
+        self.pos: Trade = None
+        self.trades: list = []
+        self.equity: list = []          # (bar time, mark-to-market equity)
+        self.n = 0; self.prev = None; self.last_price = None
+        self._cr = strat.commission_pct / 100; self._pf = strat.position_pct / 100
+        self._lock = threading.Lock()
+
+    # ── feed ───────────────────────────────────────────────────
+    def on_tick(self, ts_ms, price, size=0.0):
+        with self._lock:
+            bar = self.bars.add(ts_ms, price, size)
+            if bar is not None: self._on_bar(bar)
+            self.last_price = price
+            if self.pos is not None:
+                reason = self._stop_reason(price)
+                if reason:
+                    self._close(pd.Timestamp(int(ts_ms), unit='ms'), price, reason)
+                    self._commit()
+
+    def prime(self, data: pd.DataFrame):
+        """Feed historical OHLCV bars through the indicators without trading."""
+        with self._lock:
+            vol = data['Volume'] if 'Volume' in data.columns else None
+            for i, (o, h, l, c) in enumerate(zip(data['Open'], data['High'], data['Low'], data['Close'])):
+                self.prev = self.ind.update(float(o), float(h), float(l), float(c),
+                                            float(vol.iloc[i]) if vol is not None else 0.0)
+                self.n += 1
+
+    # ── simulation step (mirrors BacktestEngine.run) ───────────
+    def _stop_reason(self, price):
+        s = self.strat
+        pnl_p = (price / self.pos.entry_price - 1) * 100
+        if s.stop_loss_pct > 0 and pnl_p <= -s.stop_loss_pct: return 'stop_loss'
+        if s.take_profit_pct > 0 and pnl_p >= s.take_profit_pct: return 'take_profit'
+        return None
+
+    def _on_bar(self, bar):
+        s = self.strat; row = self.ind.update_bar(bar); price = bar.close
+        if self.n >= self.warmup:
+            if self.pos is not None:
+                reason = self._stop_reason(price)
+                if reason is None and eval_row(s.sell_cond, row, self.prev): reason = 'signal'
+                if reason: self._close(bar.time, price, reason)
+            if self.pos is None and eval_row(s.buy_cond, row, self.prev):
+                self._open(bar.time, price)
+        self.n += 1; self.prev = row
+        eq = self.mark(price)
+        self.equity.append((bar.time, eq))
+        if self.journal:
+            self.journal.write('bar', t=str(bar.time), o=bar.open, h=bar.high, l=bar.low,
+                               c=bar.close, v=bar.volume, eq=eq)
+        self._commit()
+
+    def _open(self, when, price):
+        shares = int(self.cash * self._pf // price) if price > 0 else 0
+        if shares <= 0: return
+        cm = price * shares * self._cr; self.cash -= price * shares + cm
+        self.pos = Trade(entry_date=when, entry_price=price, shares=shares, commission=cm)
+        if self.journal: self.journal.write('open', **_trade_rec(self.pos))
+
+    def _close(self, when, price, reason):
+        pos = self.pos; cm = price * pos.shares * self._cr
+        gross = (price - pos.entry_price) * pos.shares
+        pos.exit_date = when; pos.exit_price = price
+        pos.pnl = gross - cm - pos.commission
+        pos.pnl_pct = (pos.pnl / (pos.entry_price * pos.shares)) * 100
+        pos.exit_reason = reason; pos.commission += cm
+        self.cash += pos.entry_price * pos.shares + pos.pnl
+        self.trades.append(pos); self.pos = None
+        if self.journal: self.journal.write('close', **_trade_rec(pos))
+
+    def _commit(self):
+        if not self.journal: return
+        blob = pickle.dumps({k: getattr(self, k) for k in self._STATE})
+        self.journal.write('state', b64=base64.b64encode(blob).decode('ascii'))
+
+    # ── read side ──────────────────────────────────────────────
+    def mark(self, price=None) -> float:
+        price = self.last_price if price is None else price
+        return self.cash + (price * self.pos.shares if self.pos and price else 0)
+
+    @property
+    def equity_curve(self) -> pd.Series:
+        with self._lock: pts = list(self.equity)
+        if not pts: return pd.Series(dtype=float)
+        t, v = zip(*pts)
+        return pd.Series(v, index=pd.DatetimeIndex(t))
+
+    def metrics(self) -> BacktestMetrics:
+        eq = self.equity_curve
+        with self._lock: trades = list(self.trades)
+        if len(eq) < 2: return BacktestMetrics(total_trades=len(trades), note='Not enough bars yet')
+        return BacktestEngine._metrics(trades, eq, self.strat)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {'name': self.name, 'ticker': self.yf_ticker, 'currency': self.currency,
+                    'bars': self.n, 'cash': self.cash, 'equity': self.mark(),
+                    'position': int(self.pos.shares) if self.pos else 0,
+                    'entry_price': self.pos.entry_price if self.pos else None,
+                    'trades': len(self.trades), 'last_price': self.last_price}
+
+    # ── recovery ───────────────────────────────────────────────
+    @classmethod
+    def recover(cls, strat: Strategy, path: str, fsync: bool = False, **kw) -> "PaperTrader":
+        """Rebuild a trader from its journal; records after the last ``state`` are discarded."""
+        tr = cls(strat, **kw)
+        trades, equity, state = [], [], None
+        pend_t, pend_e = [], []
+        for rec in PaperJournal.read(path):
+            k = rec.get('k')
+            if k == 'close': pend_t.append(_trade_from(rec))
+            elif k == 'bar': pend_e.append((pd.Timestamp(rec['t']), float(rec['eq'])))
+            elif k == 'state':
+                state = rec['b64']
+                trades.extend(pend_t); equity.extend(pend_e); pend_t, pend_e = [], []
+        if state is not None:
+            for k, v in pickle.loads(base64.b64decode(state)).items(): setattr(tr, k, v)
+        tr.trades, tr.equity = trades, equity
+        tr.journal = PaperJournal(path, fsync)
+        return tr
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 3. ENGINE  —  many strategies on one feed
+# ═══════════════════════════════════════════════════════════════════
+def _slug(s): return re.sub(r'[^A-Za-z0-9_.-]+', '_', s).strip('_') or 'strategy'
+
+
+class PaperTradingEngine:
+    """
+    Routes ticks to the traders subscribed to that symbol.  Per tick the
+    cost is one dict lookup plus O(1) work per trader on the symbol;
+    indicator/condition work happens only when a bar closes.
+
+        eng = PaperTradingEngine(journal_dir="~/.quant_paper")
+        eng.add(script)                   # QuantQL source or Strategy
+        eng.attach(dashboard.live_store)  # or call eng.on_tick(...) yourself
+    """
+    def __init__(self, journal_dir: str = None, interval='1min', warmup: int = 0):
+        self.journal_dir = os.path.expanduser(journal_dir) if journal_dir else None
+        self.interval = interval; self.warmup = warmup
+        self.traders: dict = {}
+        self._by_ticker: dict = {}
+        self._lock = threading.Lock()
+
+    def add(self, strategy, name: str = None, interval=None, warmup: int = None,
+            prime: pd.DataFrame = None) -> PaperTrader:
+        strat = compile_strategy(strategy) if isinstance(strategy, str) else strategy
+        name = name or strat.name
+        kw = dict(interval=interval or self.interval,
+                  warmup=self.warmup if warmup is None else warmup, name=name)
+        if self.journal_dir:
+            path = os.path.join(self.journal_dir, f"{_slug(name)}.jsonl")
+            if os.path.exists(path): tr = PaperTrader.recover(strat, path, **kw)
+            else: tr = PaperTrader(strat, journal=PaperJournal(path), **kw)
+        else:
+            tr = PaperTrader(strat, **kw)
+        if prime is not None and tr.n == 0: tr.prime(prime)
+        with self._lock:
+            if name in self.traders: self._drop(name)
+            self.traders[name] = tr
+            self._by_ticker.setdefault(tr.yf_ticker, []).append(tr)
+        return tr
+
+    def _drop(self, name):
+        tr = self.traders.pop(name)
+        lst = self._by_ticker.get(tr.yf_ticker, [])
+        if tr in lst: lst.remove(tr)
+        if not lst: self._by_ticker.pop(tr.yf_ticker, None)
+        if tr.journal: tr.journal.close()
+
+    def remove(self, name: str):
+        with self._lock:
+            if name in self.traders: self._drop(name)
+
+    def on_tick(self, ticker: str, ts_ms, price: float):
+        for tr in tuple(self._by_ticker.get(ticker, ())):
+            try: tr.on_tick(ts_ms, price)
+            except Exception as e: print(f"[WARN] paper {tr.name}: {e}")
+
+    def attach(self, store):
+        """Subscribe to a ``LiveDataStore`` so every stored tick reaches the traders."""
+        store.subscribe(self.on_tick)
+
+    def detach(self, store):
+        store.unsubscribe(self.on_tick)
+
+    def tickers(self) -> list:
+        with self._lock: return list(self._by_ticker)
+
+    def snapshot(self) -> list:
+        with self._lock: traders = list(self.traders.values())
+        return [t.snapshot() for t in traders]
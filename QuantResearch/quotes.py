@@ -0,0 +1,192 @@
+"""
+QuantResearch Quotes
+====================
+Cheap watchlist snapshots: last price, change vs the previous close and
+the 52-week high / low, for any number of symbols.
+
+    qs = QuoteService(get_service())
+    qs.refresh(['TCS.NS', 'AAPL'], callback=show)    # show({symbol: Quote}) on the Tk thread
+
+* each symbol's daily history is loaded once through the DataService
+  (ranges ending yesterday are disk-cached for good) and folded into a
+  ``RollingRange`` — monotonic deques, O(1) amortised per bar
+* every refresh after that downloads only the last few daily bars for
+  all symbols in a single batched request, and rolls the window forward
+  when a new session appears
+"""
+
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from .data_service import DataService
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 1. ROLLING 52-WEEK RANGE
+# ═══════════════════════════════════════════════════════════════════
+class RollingRange:
+    """High / low over the trailing ``days`` calendar days; bars must arrive in date order."""
+    def __init__(self, days: int = 365):
+        self.days = days
+        self._hi: deque = deque()            # (ordinal, high), highs strictly decreasing
+        self._lo: deque = deque()            # (ordinal, low),  lows strictly increasing
+
+    def push(self, day: int, high: float, low: float):
+        while self._hi and self._hi[-1][1] <= high: self._hi.pop()
+        while self._lo and self._lo[-1][1] >= low:  self._lo.pop()
+        self._hi.append((day, high)); self._lo.append((day, low))
+        self.expire(day)
+
+    def expire(self, today: int):
+        cut = today - self.days
+        while self._hi and self._hi[0][0] <= cut: self._hi.popleft()
+        while self._lo and self._lo[0][0] <= cut: self._lo.popleft()
+
+    @property
+    def high(self):
+        return self._hi[0][1] if self._hi else None
+
+    @property
+    def low(self):
+        return self._lo[0][1] if self._lo else None
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 2. QUOTE BOOK
+# ═══════════════════════════════════════════════════════════════════
+@dataclass
+class Quote:
+    symbol: str
+    last: float
+    prev: float                              # previous session's close (None with one bar)
+    high52: float
+    low52: float
+    day: date                                # session of ``last``
+
+    @property
+    def chg(self):
+        return (self.last / self.prev - 1) * 100 if self.prev else None
+
+
+class _Sym:
+    __slots__ = ('range', 'done', 'prev', 'open')
+    def __init__(self, days):
+        self.range = RollingRange(days)
+        self.done = -1                       # ordinal of the last bar folded into ``range``
+        self.prev = None                     # its close
+        self.open = None                     # (ordinal, high, low, close) of the newest bar, may still change
+
+
+class QuoteBook:
+    """
+    Per-symbol state.  The newest bar stays "open" (today's bar keeps
+    changing between refreshes); it is folded into the rolling range
+    only once a later session shows up.
+    """
+    def __init__(self, days: int = 365):
+        self.days = days
+        self._syms: dict = {}
+
+    def __contains__(self, symbol):
+        return symbol in self._syms
+
+    def apply(self, symbol: str, bars):
+        """Fold (ordinal, high, low, close) bars in date order; already-folded sessions are ignored."""
+        st = self._syms.get(symbol)
+        if st is None: st = self._syms[symbol] = _Sym(self.days)
+        for bar in bars:
+            if bar[0] <= st.done: continue
+            if st.open is not None and bar[0] > st.open[0]:
+                d, h, l, c = st.open
+                st.range.push(d, h, l); st.done = d; st.prev = c
+            st.open = bar
+
+    def quote(self, symbol: str):
+        st = self._syms.get(symbol)
+        if st is None or st.open is None: return None
+        d, h, l, c = st.open
+        st.range.expire(d)
+        hi, lo = st.range.high, st.range.low
+        return Quote(symbol, c, st.prev, h if hi is None else max(hi, h),
+                     l if lo is None else min(lo, l), date.fromordinal(d))
+
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+def _bars(df: pd.DataFrame):
+    """Daily OHLC frame → [(ordinal, high, low, close)] with NaN rows dropped."""
+    v = df[['High', 'Low', 'Close']].to_numpy(float)
+    ok = ~np.isnan(v).any(1)
+    days = df.index.values.astype('datetime64[D]').astype(np.int64)[ok] + _EPOCH_ORDINAL
+    return list(zip(days.tolist(), *v[ok].T.tolist()))
+
+
+def split_wide(df: pd.DataFrame, symbols) -> dict:
+    """A multi-ticker ``yf.download`` frame → {symbol: bars}, column-wise without per-symbol frames."""
+    symbols = list(symbols)
+    if df is None or df.empty: return {}
+    if not isinstance(df.columns, pd.MultiIndex):
+        return {symbols[0]: _bars(df)} if len(symbols) == 1 else {}
+    lvl = 0 if set(symbols) & set(df.columns.get_level_values(0)) else 1
+    days = df.index.values.astype('datetime64[D]').astype(np.int64) + _EPOCH_ORDINAL
+    cols = {k: df.xs(k, axis=1, level=1 - lvl) for k in ('High', 'Low', 'Close')}
+    names = [s for s in symbols if s in cols['Close'].columns]
+    v = np.stack([cols[k][names].to_numpy(float) for k in ('High', 'Low', 'Close')])   # (3, days, symbols)
+    ok = ~np.isnan(v).any(0)
+    out = {}
+    for j, s in enumerate(names):
+        m = ok[:, j]
+        if m.any(): out[s] = list(zip(days[m].tolist(), *v[:, m, j].tolist()))
+    return out
+
+
+def download_latest(symbols, period: str = '5d') -> dict:
+    """The last few daily bars for every symbol in one ``yf.download`` call → {symbol: bars}."""
+    import yfinance as yf
+    symbols = list(symbols)
+    df = yf.download(tickers=symbols, period=period, interval='1d', group_by='ticker',
+                     auto_adjust=False, progress=False, threads=True)
+    return split_wide(df, symbols)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 3. SERVICE
+# ═══════════════════════════════════════════════════════════════════
+class QuoteService:
+    def __init__(self, service: DataService, days: int = 365, downloader: Callable = None):
+        # downloader(symbols) → {symbol: bars | daily DataFrame}, one request for all symbols
+        self.svc = service
+        self.book = QuoteBook(days)
+        self.downloader = downloader or download_latest
+        self.counts = {'refreshes': 0, 'seeded': 0, 'symbols': 0}
+
+    async def arefresh(self, symbols) -> dict:
+        """{symbol: Quote} for every symbol with data; seeds new symbols first."""
+        syms = list(dict.fromkeys(symbols))
+        new = [s for s in syms if s not in self.book]
+        if new:
+            end = date.today() - timedelta(days=1)
+            start = end - timedelta(days=self.book.days + 7)
+            hist = await self.svc.afetch_many(new, start.isoformat(), end.isoformat())
+            for s, df in hist.items():
+                if isinstance(df, pd.DataFrame) and not df.empty:
+                    self.book.apply(s, _bars(df)); self.counts['seeded'] += 1
+        try:
+            latest = await self.svc.aio(self.downloader, syms)
+        except Exception as exc:
+            print(f"[WARN] quotes: {exc}"); latest = {}
+        wanted = set(syms)
+        for s, bars in latest.items():
+            if s in wanted: self.book.apply(s, _bars(bars) if isinstance(bars, pd.DataFrame) else bars)
+        self.counts['refreshes'] += 1; self.counts['symbols'] += len(syms)
+        out = {s: self.book.quote(s) for s in syms}
+        return {s: q for s, q in out.items() if q is not None}
+
+    def refresh(self, symbols, callback=None, errback=None):
+        return self.svc.submit(self.arefresh(symbols), callback, errback)
@@ -0,0 +1,235 @@
+"""
+QuantResearch Results I/O
+=========================
+Save a ``BacktestResult`` as columnar tables and load it back without
+re-running the backtest.
+
+    path = save_result(result, 'runs/rsi_macd.parquet')   # directory of Parquet tables + meta.json
+    path = save_result(result, 'runs/rsi_macd.npz')       # single file, no pyarrow needed
+    result = load_result(path)
+    trades = read_table(path, 'trades')                   # any table as a DataFrame
+
+Tables: ``data`` (OHLCV), ``indicators``, ``equity`` (equity and daily
+return), ``trades`` and ``signals`` (side +1 buy / −1 sell, bar index).
+``meta.json`` holds the strategy (AST included), metrics, currency,
+exchange and ticker.
+
+* formats: ``parquet`` and ``arrow`` (Arrow IPC) need pyarrow; ``npz``
+  works with numpy alone and is picked when pyarrow is missing
+* long tables are written in ``chunk_rows`` slices (Parquet row groups,
+  Arrow record batches, chunked ``.npy`` members) and files are replaced
+  atomically
+"""
+
+from __future__ import annotations
+import importlib.util, json, os, zipfile
+from dataclasses import asdict, fields, is_dataclass
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .backtest_engine import (
+    BacktestResult, Strategy, Trade, IndicatorDecl, ValueNode,
+    CompareNode, CrossNode, LogicNode, NotNode,
+)
+from .metrics import BacktestMetrics, trade_metrics
+
+VERSION    = 2                          # 2: metrics stored as numbers
+FORMATS    = ('parquet', 'arrow', 'npz')
+CHUNK_ROWS = 1_000_000
+TABLES     = ('data', 'indicators', 'equity', 'trades', 'signals')
+_SUFFIX    = {'parquet': '.parquet', 'arrow': '.arrow', 'npz': '.npz'}
+_NODES     = {c.__name__: c for c in (Strategy, IndicatorDecl, ValueNode, CompareNode,
+                                      CrossNode, LogicNode, NotNode)}
+_TRADE_COLS = ('entry_date', 'entry_price', 'shares', 'exit_date', 'exit_price',
+               'exit_reason', 'pnl', 'pnl_pct', 'commission')
+
+
+def have_pyarrow() -> bool:
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 1. RESULT ⇄ COLUMNS
+# ═══════════════════════════════════════════════════════════════════
+def _enc(o):
+    if is_dataclass(o):
+        return {'_': type(o).__name__, **{f.name: _enc(getattr(o, f.name)) for f in fields(o)}}
+    if isinstance(o, (list, tuple)): return [_enc(v) for v in o]
+    if isinstance(o, np.generic): return o.item()
+    return o
+
+
+def _dec(o):
+    if isinstance(o, dict) and '_' in o:
+        kw = {k: _dec(v) for k, v in o.items() if k != '_'}
+        if 'params' in kw: kw['params'] = tuple(kw['params'])
+        return _NODES[o['_']](**kw)
+    if isinstance(o, list): return [_dec(v) for v in o]
+    return o
+
+
+def _naive(dates):
+    """Datetime-like → (naive UTC datetime64 array, tz name or None)."""
+    idx = pd.DatetimeIndex(pd.to_datetime(dates, errors='coerce'))
+    if idx.tz is None: return idx.values, None
+    return idx.tz_convert('UTC').tz_localize(None).values, str(idx.tz)
+
+
+def _aware(values, tz):
+    idx = pd.DatetimeIndex(values)
+    return idx.tz_localize('UTC').tz_convert(tz) if tz else idx
+
+
+def trade_columns(trades) -> dict:
+    """List of ``Trade`` → {field: array}."""
+    n = len(trades)
+    cols = {}
+    for c in _TRADE_COLS:
+        if c.endswith('_date'):  cols[c] = _naive([getattr(t, c) for t in trades])[0]
+        elif c == 'exit_reason': cols[c] = np.array([t.exit_reason or '' for t in trades], dtype=str)
+        else:                    cols[c] = np.fromiter((getattr(t, c) for t in trades), float, n)
+    return cols
+
+
+def result_tables(result: BacktestResult):
+    """(meta, {table: {column: array}}) for a result."""
+    date, tz = _naive(result.data.index)
+    data = {'date': date, **{str(c): result.data[c].to_numpy() for c in result.data.columns}}
+    ind = {'date': date}
+    for k, s in result.indicators.items():
+        ind[k] = pd.Series(s).reindex(result.data.index).to_numpy(float)
+    eq = result.equity_curve.to_numpy(float)
+    ret = np.zeros_like(eq); ret[1:] = eq[1:] / eq[:-1] - 1
+    sig = np.r_[np.ones(len(result.buy_signals), np.int8), -np.ones(len(result.sell_signals), np.int8)]
+    tables = {
+        'data': data, 'indicators': ind,
+        'equity': {'date': _naive(result.equity_curve.index)[0], 'equity': eq, 'ret': ret},
+        'trades': trade_columns(result.trades),
+        'signals': {'side': sig, 'bar': np.asarray(list(result.buy_signals) + list(result.sell_signals), np.int64)},
+    }
+    meta = {'version': VERSION, 'created': datetime.now().isoformat(timespec='seconds'),
+            'strategy': _enc(result.strategy), 'metrics': asdict(result.metrics),
+            'currency': result.currency, 'exchange': result.exchange, 'yf_ticker': result.yf_ticker,
+            'tz': tz, 'index_name': result.data.index.name, 'rows': {k: len(next(iter(v.values())))
+                                                                  for k, v in tables.items()}}
+    return meta, tables
+
+
+def result_from_tables(meta: dict, tables: dict) -> BacktestResult:
+    """Inverse of ``result_tables``: frames are {table: DataFrame}."""
+    tz = meta.get('tz')
+    d = tables['data']
+    idx = _aware(d['date'].to_numpy(), tz).rename(meta.get('index_name'))
+    data = pd.DataFrame({c: d[c].to_numpy() for c in d.columns if c != 'date'}, index=idx)
+    ind = {c: pd.Series(tables['indicators'][c].to_numpy(), index=idx, name=c)
+           for c in tables['indicators'].columns if c != 'date'}
+    e = tables['equity']
+    equity = pd.Series(e['equity'].to_numpy(), index=_aware(e['date'].to_numpy(), tz))
+    t = tables['trades']
+    dates = {c: _aware(t[c].to_numpy(), tz) for c in ('entry_date', 'exit_date')}
+    cols = [list(dates[c]) if c in dates else t[c].tolist() for c in _TRADE_COLS]
+    trades = [Trade(**{c: (None if v is pd.NaT else v) for c, v in zip(_TRADE_COLS, row)})
+              for row in zip(*cols)]
+    s = tables['signals']; side = s['side'].to_numpy(); bar = s['bar'].to_numpy()
+    strat = _dec(meta['strategy'])
+    if meta.get('version', 1) >= 2: metrics = BacktestMetrics(**meta['metrics'])
+    else:                           metrics = trade_metrics(trades, equity, strat.capital)  # v1 kept strings
+    return BacktestResult(strat, trades, equity,
+                          bar[side > 0].tolist(), bar[side < 0].tolist(), ind, data,
+                          metrics, meta['currency'], meta['exchange'], meta['yf_ticker'])
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 2. WRITERS
+# ═══════════════════════════════════════════════════════════════════
+def _write_npz(path, meta, tables, chunk_rows):
+    tmp = path + '.tmp'
+    with zipfile.ZipFile(tmp, 'w', zipfile.ZIP_STORED, allowZip64=True) as zf:
+        zf.writestr('meta.json', json.dumps(meta))
+        for name, cols in tables.items():
+            for c, arr in cols.items():
+                arr = np.ascontiguousarray(arr)
+                with zf.open(f'{name}/{c}.npy', 'w', force_zip64=True) as f:
+                    np.lib.format.write_array_header_1_0(f, np.lib.format.header_data_from_array_1_0(arr))
+                    for s in range(0, len(arr), chunk_rows): f.write(arr[s:s + chunk_rows].tobytes())
+    os.replace(tmp, path)
+
+
+def _write_arrow(root, fmt, meta, tables, chunk_rows):
+    import pyarrow as pa, pyarrow.parquet as pq
+    os.makedirs(root, exist_ok=True)
+    for name, cols in tables.items():
+        n = meta['rows'][name]
+        batch = lambda s: pa.record_batch([pa.array(v[s]) for v in cols.values()], names=list(cols))
+        schema = batch(slice(0, 0)).schema
+        path = os.path.join(root, name + _SUFFIX[fmt]); tmp = path + '.tmp'
+        with (pq.ParquetWriter(tmp, schema) if fmt == 'parquet' else pa.ipc.new_file(tmp, schema)) as w:
+            for s in range(0, n, chunk_rows):
+                b = batch(slice(s, s + chunk_rows))
+                w.write_table(pa.Table.from_batches([b])) if fmt == 'parquet' else w.write_batch(b)
+        os.replace(tmp, path)
+    tmp = os.path.join(root, 'meta.json.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f: json.dump(meta, f, indent=1)
+    os.replace(tmp, os.path.join(root, 'meta.json'))
+
+
+def save_result(result: BacktestResult, path: str, format: str = None,
+                chunk_rows: int = CHUNK_ROWS) -> str:
+    """Write ``result``; the format comes from ``format`` or the suffix of ``path``.  Returns the path written."""
+    path = os.path.expanduser(path)
+    if format is None:
+        format = next((f for f, sfx in _SUFFIX.items() if path.lower().endswith(sfx)), None)
+        if format is None: format = 'parquet' if have_pyarrow() else 'npz'
+    if format not in FORMATS: raise ValueError(f"unknown format {format!r}; use one of {FORMATS}")
+    if format != 'npz' and not have_pyarrow():
+        print(f"[WARN] pyarrow not installed, writing npz instead of {format}"); format = 'npz'
+    if not path.lower().endswith(_SUFFIX[format]):
+        path = os.path.splitext(path)[0] + _SUFFIX[format]
+    meta, tables = result_tables(result)
+    meta['format'] = format
+    if format == 'npz': _write_npz(path, meta, tables, chunk_rows)
+    else:               _write_arrow(path, format, meta, tables, chunk_rows)
+    return path
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 3. READERS
+# ═══════════════════════════════════════════════════════════════════
+def _root(path):
+    path = os.path.expanduser(path)
+    return os.path.dirname(path) if os.path.basename(path) == 'meta.json' else path
+
+
+def read_meta(path: str) -> dict:
+    p = _root(path)
+    if os.path.isdir(p):
+        with open(os.path.join(p, 'meta.json'), encoding='utf-8') as f: return json.load(f)
+    with zipfile.ZipFile(p) as zf: return json.loads(zf.read('meta.json'))
+
+
+def read_table(path: str, name: str) -> pd.DataFrame:
+    """One table of a saved result (``data``, ``indicators``, ``equity``, ``trades`` or ``signals``)."""
+    p = _root(path)
+    if name not in TABLES: raise KeyError(f"no table {name!r}; tables are {TABLES}")
+    if not os.path.isdir(p):
+        with zipfile.ZipFile(p) as zf:
+            cols = {}
+            for member in zf.namelist():
+                if member.startswith(name + '/') and member.endswith('.npy'):
+                    with zf.open(member) as f: cols[member[len(name) + 1:-4]] = np.lib.format.read_array(f)
+        return pd.DataFrame(cols)
+    import pyarrow as pa, pyarrow.parquet as pq
+    fmt = read_meta(p).get('format', 'parquet')
+    f = os.path.join(p, name + _SUFFIX[fmt])
+    if fmt == 'parquet': return pq.read_table(f).to_pandas()
+    with pa.memory_map(f) as src: return pa.ipc.open_file(src).read_all().to_pandas()
+
+
+def load_result(path: str) -> BacktestResult:
+    """Rebuild the ``BacktestResult`` saved at ``path`` (a ``.npz``, a bundle directory or its meta.json)."""
+    meta = read_meta(path)
+    if meta.get('version', 0) > VERSION:
+        raise ValueError(f"{path}: saved by a newer version ({meta['version']} > {VERSION})")
+    return result_from_tables(meta, {t: read_table(path, t) for t in TABLES})
@@ -0,0 +1,178 @@
+"""
+QuantResearch Results Store
+===========================
+Every backtest kept on disk and queryable: one SQLite table of run
+metadata and metrics, and one columnar bundle (``results_io``) per run
+for the equity curve, trades, signals and indicators.
+
+    store = ResultStore()                                  # ~/.quant_results
+    r = store.run(src)                                     # simulated once …
+    r = store.run(src)                                     # … then loaded from the store
+    run_backtest(src, store=store)                         # same, from the usual entry point
+    store.query(ticker='MARUTI', where='sharpe > ?', args=(1,), since='2024-06-01')
+    store.load(key)                                        # the full BacktestResult
+
+* a run's key hashes the normalized script (``unparse_strategy``), every
+  ``Strategy`` field and the dataset version (a hash of the OHLCV frame),
+  so a rerun over the same bars is a lookup and new bars make a new run
+* ``query`` reads only the SQLite table (indexed on ticker, run date and
+  Sharpe); curves and trades are read by ``load``, and a
+  ``retain='metrics'`` rerun is answered from the table alone
+* the database uses WAL journaling, so sweeps and the GUI can write to one
+  store concurrently
+"""
+
+from __future__ import annotations
+import hashlib, json, os, sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+from .backtest_engine import (
+    BacktestEngine, BacktestResult, Strategy, compile_strategy, retain_result, unparse_strategy,
+)
+from .metrics import BacktestMetrics
+from .results_io import _enc, load_result, save_result
+
+STORE_DIR = os.path.join(os.path.expanduser("~"), ".quant_results")
+_METRICS  = BacktestMetrics.sql_columns()
+_COLUMNS = [('key', 'TEXT PRIMARY KEY'), ('created', 'TEXT'), ('name', 'TEXT'), ('ticker', 'TEXT'),
+            ('market', 'TEXT'), ('yf_ticker', 'TEXT'), ('currency', 'TEXT'), ('exchange', 'TEXT'),
+            ('period', 'TEXT'), ('data_version', 'TEXT'), ('data_start', 'TEXT'), ('data_end', 'TEXT'),
+            ('bars', 'INTEGER'), ('script', 'TEXT'), ('path', 'TEXT')] + _METRICS
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs ({', '.join(f'{n} {t}' for n, t in _COLUMNS)});
+CREATE INDEX IF NOT EXISTS runs_ticker  ON runs (ticker, created);
+CREATE INDEX IF NOT EXISTS runs_yf      ON runs (yf_ticker, created);
+CREATE INDEX IF NOT EXISTS runs_created ON runs (created);
+CREATE INDEX IF NOT EXISTS runs_sharpe  ON runs (sharpe);
+"""
+
+
+def data_version(data: pd.DataFrame) -> str:
+    """Content hash of an OHLCV frame (index, columns and values)."""
+    h = hashlib.sha1(repr(list(data.columns)).encode())
+    h.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    return h.hexdigest()[:20]
+
+
+def run_key(strat: Strategy, version: str) -> str:
+    """Store key of ``strat`` over the dataset ``version``."""
+    fields = json.dumps(_enc(strat), sort_keys=True, default=str)
+    return hashlib.sha1('\n'.join((unparse_strategy(strat), fields, version)).encode()).hexdigest()
+
+
+def _day(t) -> str:
+    return pd.Timestamp(t).isoformat() if t is not None else None
+
+
+class ResultStore:
+    def __init__(self, root: str = STORE_DIR, format: str = None):
+        self.root = os.path.expanduser(root); self.format = format
+        os.makedirs(os.path.join(self.root, 'runs'), exist_ok=True)
+        self.con = sqlite3.connect(os.path.join(self.root, 'store.db'), timeout=60,
+                                   isolation_level=None, check_same_thread=False)
+        self.con.execute('PRAGMA journal_mode = WAL'); self.con.execute('PRAGMA synchronous = NORMAL')
+        self.con.executescript(_SCHEMA)
+        self.counts = {'hits': 0, 'misses': 0}
+
+    def close(self):
+        self.con.close()
+
+    # ── writing ───────────────────────────────────────────────
+    def put(self, result: BacktestResult) -> str:
+        """Save a full ``BacktestResult``; returns its key."""
+        s = result.strategy; ver = data_version(result.data); key = run_key(s, ver)
+        path = save_result(result, os.path.join(self.root, 'runs', key), self.format)
+        idx = result.data.index
+        row = {'key': key, 'created': datetime.now().isoformat(timespec='seconds'), 'name': s.name,
+               'ticker': s.ticker.upper(), 'market': s.market, 'yf_ticker': result.yf_ticker.upper(),
+               'currency': result.currency, 'exchange': result.exchange, 'period': s.period_str,
+               'data_version': ver, 'data_start': _day(idx[0]) if len(idx) else None,
+               'data_end': _day(idx[-1]) if len(idx) else None, 'bars': len(idx),
+               'script': unparse_strategy(s), 'path': os.path.relpath(path, self.root),
+               **{n: getattr(result.metrics, n) for n, _ in _METRICS}}
+        self.con.execute(f"INSERT OR REPLACE INTO runs ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+                         tuple(row.values()))
+        return key
+
+    def run(self, src, fetcher=None, data: pd.DataFrame = None, retain: str = 'full'):
+        """
+        ``run_backtest`` through the store: the data is fetched (or given;
+        by default through the data service and its disk cache), and a run
+        with the same key is loaded instead of simulated.
+        """
+        strat = compile_strategy(src) if isinstance(src, str) else src
+        if fetcher is None:
+            from .data_service import get_service
+            fetcher = get_service().fetch_sync
+        eng = BacktestEngine(strat, fetcher)
+        if data is None: data, yf_t, ccy, exch = eng.fetch_data()
+        else:            yf_t = ccy = exch = None
+        key = run_key(strat, data_version(data))
+        if retain == 'metrics':                  # the table row is enough: no files read
+            m = self.metrics(key)
+            if m is not None:
+                self.counts['hits'] += 1
+                c, e, y = self.con.execute('SELECT currency, exchange, yf_ticker FROM runs WHERE key = ?',
+                                           (key,)).fetchone()
+                return retain_result(BacktestResult(strat, [], None, [], [], {}, None, m, c, e, y), retain)
+        r = self.load(key)
+        if r is None:
+            self.counts['misses'] += 1
+            r = eng.run(data)
+            if yf_t is not None: r.yf_ticker, r.currency, r.exchange = yf_t, ccy, exch   # keep a BSE fallback
+            self.put(r)
+        else:
+            self.counts['hits'] += 1
+        return retain_result(r, retain)
+
+    def delete(self, key: str):
+        row = self.con.execute('SELECT path FROM runs WHERE key = ?', (key,)).fetchone()
+        if row is None: return
+        p = os.path.join(self.root, row[0])
+        try:
+            if os.path.isdir(p):
+                for f in os.listdir(p): os.remove(os.path.join(p, f))
+                os.rmdir(p)
+            elif os.path.exists(p): os.remove(p)
+        except OSError as exc:
+            print(f"[WARN] results store: {exc}")
+        self.con.execute('DELETE FROM runs WHERE key = ?', (key,))
+
+    # ── reading ───────────────────────────────────────────────
+    def load(self, key: str) -> BacktestResult:
+        """The stored result for ``key``, or None (also when its files have gone missing)."""
+        row = self.con.execute('SELECT path FROM runs WHERE key = ?', (key,)).fetchone()
+        if row is None: return None
+        try:
+            return load_result(os.path.join(self.root, row[0]))
+        except (OSError, KeyError, ValueError) as exc:
+            print(f"[WARN] results store {key[:12]}: {exc}")
+            return None
+
+    def metrics(self, key: str) -> BacktestMetrics:
+        row = self.con.execute(f"SELECT {', '.join(n for n, _ in _METRICS)} FROM runs WHERE key = ?",
+                               (key,)).fetchone()
+        if row is None: return None
+        return BacktestMetrics(**{n: (float('nan') if v is None else v)      # SQLite stores NaN as NULL
+                                  for (n, _), v in zip(_METRICS, row)})
+
+    def query(self, ticker: str = None, where: str = None, args: tuple = (), since=None, until=None,
+              order: str = 'created DESC', limit: int = None, columns: str = '*') -> pd.DataFrame:
+        """
+        Run metadata and metrics only.  ``ticker`` matches the script's
+        ticker or the Yahoo symbol; ``since`` / ``until`` bound the run date;
+        ``where`` is an SQL filter with ``?`` placeholders filled from ``args``.
+        """
+        q = [f'SELECT {columns} FROM runs WHERE 1']; a = []
+        if ticker: q.append('AND (ticker = ? OR yf_ticker = ?)'); a += [ticker.upper()] * 2
+        if since is not None: q.append('AND created >= ?'); a.append(_day(since))
+        if until is not None: q.append('AND created < ?'); a.append(_day(until))
+        if where: q.append(f'AND ({where})'); a += list(args)
+        if order: q.append(f'ORDER BY {order}')
+        if limit: q.append(f'LIMIT {int(limit)}')
+        return pd.read_sql_query(' '.join(q), self.con, params=a)
+
+    def __len__(self):
+        return self.con.execute('SELECT COUNT(*) FROM runs').fetchone()[0]
@@ -0,0 +1,301 @@
+"""
+QuantResearch Sweep Queue
+=========================
+Parameter sweeps that survive crashes: the task list, the frozen OHLCV
+frame and every finished result live in one SQLite file, and any number
+of worker processes claim tasks from it.
+
+    q = SweepQueue('~/sweeps.db')
+    sid = q.create(src, {'buy[0]': range(10, 51), 'sell[0]': range(50, 91), 'STOP_LOSS': range(11)})
+    q.work(sid, processes=4)            # or, from any shell / host:
+    python -m QuantResearch.sweep_queue work ~/sweeps.db --processes 4
+    python -m QuantResearch.sweep_queue status ~/sweeps.db
+    q.progress(sid)                     # {'done_runs': …, 'runs_per_s': …, 'eta_s': …}
+    q.results(sid)                      # params + metrics, one row per run
+
+* a task is a range of ``chunk`` grid points run with
+  ``BatchBacktestEngine``; claiming is one ``BEGIN IMMEDIATE``
+  transaction, so two workers never get the same task
+* a claim is a lease: a task whose worker died (same host: its pid is
+  gone; any host: ``lease`` seconds without finishing) goes back to the
+  queue, so a killed sweep resumes from the last finished task
+* results are written in the transaction that marks the task done, keyed
+  by (sweep, point), so a task finished twice stores one copy
+* ``create`` fetches the data once (through the data service and its disk
+  cache) and stores the frame in the database; workers never download
+* the database uses WAL journaling; WAL needs every process on one host,
+  so pass ``wal=False`` when workers on several hosts share the file over
+  a network filesystem
+"""
+
+from __future__ import annotations
+import argparse, hashlib, json, os, pickle, socket, sqlite3, time
+
+import numpy as np
+import pandas as pd
+
+from .backtest_engine import BacktestEngine, compile_strategy
+from .batch_backtest import BatchBacktestEngine, param_slots
+from .metrics import BacktestMetrics
+
+CHUNK        = 256                     # grid points per task
+LEASE        = 600                     # seconds a claim lasts without finishing
+MAX_ATTEMPTS = 3                       # a task failing this often is marked failed
+RATE_WINDOW  = 60                      # seconds of finished tasks behind runs_per_s
+_METRICS     = BacktestMetrics.sql_columns()
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 1. SCHEMA
+# ═══════════════════════════════════════════════════════════════════
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS frames (
+    hash TEXT PRIMARY KEY, data BLOB NOT NULL);
+CREATE TABLE IF NOT EXISTS sweeps (
+    id INTEGER PRIMARY KEY, name TEXT, script TEXT NOT NULL, space TEXT NOT NULL,
+    frame TEXT NOT NULL REFERENCES frames(hash), runs INTEGER NOT NULL,
+    created REAL NOT NULL, kw TEXT NOT NULL DEFAULT '{{}}');
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY, sweep INTEGER NOT NULL, lo INTEGER NOT NULL, hi INTEGER NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending', worker TEXT, claimed REAL, finished REAL,
+    attempts INTEGER NOT NULL DEFAULT 0, error TEXT);
+CREATE INDEX IF NOT EXISTS tasks_state ON tasks (sweep, state);
+CREATE TABLE IF NOT EXISTS results (
+    sweep INTEGER NOT NULL, point INTEGER NOT NULL, params TEXT NOT NULL,
+    {', '.join(f'{n} {t}' for n, t in _METRICS)},
+    PRIMARY KEY (sweep, point));
+"""
+
+
+def _connect(path: str, wal: bool) -> sqlite3.Connection:
+    con = sqlite3.connect(path, timeout=60, isolation_level=None, check_same_thread=False)
+    con.execute('PRAGMA busy_timeout = 60000')
+    if wal: con.execute('PRAGMA journal_mode = WAL'); con.execute('PRAGMA synchronous = NORMAL')
+    con.executescript(_SCHEMA)
+    return con
+
+
+def _points(space, lo: int, hi: int) -> list:
+    """Points ``lo:hi`` of a stored space: a grid {key: values} in product order, or a point list."""
+    if isinstance(space, list): return space[lo:hi]
+    keys = list(space); shape = [len(space[k]) for k in keys]
+    idx = np.unravel_index(np.arange(lo, hi), shape)
+    return [{k: space[k][int(i[j])] for k, i in zip(keys, idx)} for j in range(hi - lo)]
+
+
+def _alive(worker: str) -> bool:
+    """False only when ``worker`` ran on this host and its process is gone."""
+    host, _, pid = (worker or '').rpartition(':')
+    if host != socket.gethostname() or not pid.isdigit(): return True
+    try: os.kill(int(pid), 0)
+    except ProcessLookupError: return False
+    except OSError: pass
+    return True
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 2. QUEUE
+# ═══════════════════════════════════════════════════════════════════
+class SweepQueue:
+    def __init__(self, path: str, wal: bool = True, lease: float = LEASE):
+        self.path = os.path.expanduser(path); self.wal = wal; self.lease = lease
+        self.con = _connect(self.path, wal)
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+        self._loaded: dict = {}                # sweep → (strategy, space, kw, data, indicator cache)
+
+    def close(self):
+        self.con.close()
+
+    def _tx(self):
+        """``with self._tx():`` — one write transaction holding the database lock from the start."""
+        con = self.con
+        class _Tx:
+            def __enter__(self): con.execute('BEGIN IMMEDIATE')
+            def __exit__(self, et, *_): con.execute('COMMIT' if et is None else 'ROLLBACK')
+        return _Tx()
+
+    # ── creating sweeps ───────────────────────────────────────
+    def create(self, src: str, grid: dict = None, points: list = None, data: pd.DataFrame = None,
+               fetcher=None, chunk: int = CHUNK, name: str = None, **kw) -> int:
+        """
+        Queue ``src`` over ``grid`` (product) or ``points`` (list of dicts).
+        ``data`` defaults to the script's ticker / period from the data
+        service; ``kw`` goes to ``BatchBacktestEngine`` (``max_drawdown``, …).
+        """
+        strat = compile_strategy(src)
+        slots = param_slots(strat)
+        if points is not None:
+            space = [{k: _plain(v) for k, v in p.items()} for p in points]; keys = {k for p in space for k in p}
+        else:
+            space = {k: [_plain(v) for v in vs] for k, vs in grid.items()}; keys = set(space)
+        bad = [k for k in keys if k not in slots]
+        if bad: raise KeyError(f"unknown slot(s) {bad}; available: {list(slots)}")
+        runs = len(space) if isinstance(space, list) else int(np.prod([len(v) for v in space.values()]))
+        if data is None:
+            if fetcher is None:
+                from .data_service import get_service
+                fetcher = get_service().fetch_sync
+            data = BacktestEngine(strat, fetcher).fetch_data()[0]
+        blob = pickle.dumps(data, protocol=4); h = hashlib.sha1(blob).hexdigest()
+        with self._tx():
+            self.con.execute('INSERT OR IGNORE INTO frames VALUES (?, ?)', (h, blob))
+            sid = self.con.execute(
+                'INSERT INTO sweeps (name, script, space, frame, runs, created, kw) VALUES (?,?,?,?,?,?,?)',
+                (name or strat.name, src, json.dumps(space), h, runs, time.time(), json.dumps(kw))).lastrowid
+            self.con.executemany('INSERT INTO tasks (sweep, lo, hi) VALUES (?, ?, ?)',
+                                 ((sid, a, min(a + chunk, runs)) for a in range(0, runs, chunk)))
+        return sid
+
+    # ── claiming and running ──────────────────────────────────
+    def recover(self) -> int:
+        """Requeue running tasks whose worker died on this host; returns how many."""
+        rows = self.con.execute("SELECT id, worker FROM tasks WHERE state = 'running'").fetchall()
+        dead = [i for i, w in rows if not _alive(w)]
+        if dead:
+            with self._tx():
+                self.con.executemany("UPDATE tasks SET state = 'pending', worker = NULL "
+                                     "WHERE id = ? AND state = 'running'", ((i,) for i in dead))
+        return len(dead)
+
+    def claim(self, sweep: int = None):
+        """Atomically take the next pending (or lease-expired) task: (task id, sweep, lo, hi) or None."""
+        now = time.time()
+        with self._tx():
+            row = self.con.execute(
+                "SELECT id, sweep, lo, hi FROM tasks WHERE (state = 'pending' OR "
+                "(state = 'running' AND claimed < ?)) AND (? IS NULL OR sweep = ?) ORDER BY id LIMIT 1",
+                (now - self.lease, sweep, sweep)).fetchone()
+            if row is None: return None
+            self.con.execute("UPDATE tasks SET state = 'running', worker = ?, claimed = ?, "
+                             "attempts = attempts + 1 WHERE id = ?", (self.worker, now, row[0]))
+        return row
+
+    def _load(self, sweep: int):
+        if sweep not in self._loaded:
+            src, space, h, kw = self.con.execute(
+                'SELECT script, space, frame, kw FROM sweeps WHERE id = ?', (sweep,)).fetchone()
+            data = pickle.loads(self.con.execute('SELECT data FROM frames WHERE hash = ?', (h,)).fetchone()[0])
+            self._loaded[sweep] = (compile_strategy(src), json.loads(space), json.loads(kw), data, {})
+        return self._loaded[sweep]
+
+    def run_task(self, task) -> int:
+        """Run one claimed task and commit its results; returns the number of runs stored."""
+        tid, sweep, lo, hi = task
+        strat, space, kw, data, cache = self._load(sweep)
+        pts = _points(space, lo, hi)
+        try:
+            res = BatchBacktestEngine(strat, points=pts, **kw).run(data, cache=cache)
+        except Exception as e:
+            with self._tx():
+                self.con.execute("UPDATE tasks SET state = CASE WHEN attempts >= ? THEN 'failed' "
+                                 "ELSE 'pending' END, error = ?, worker = NULL WHERE id = ? AND worker = ?",
+                                 (MAX_ATTEMPTS, f"{type(e).__name__}: {e}", tid, self.worker))
+            print(f"[WARN] sweep {sweep} task {tid}: {e}")
+            return 0
+        cols = ', '.join(n for n, _ in _METRICS)
+        rows = [(sweep, lo + j, json.dumps(p)) + tuple(getattr(m, n) for n, _ in _METRICS)
+                for j, (p, m) in enumerate(zip(pts, res.metrics))]
+        with self._tx():
+            self.con.executemany(f"INSERT OR REPLACE INTO results (sweep, point, params, {cols}) "
+                                 f"VALUES ({', '.join('?' * (3 + len(_METRICS)))})", rows)
+            self.con.execute("UPDATE tasks SET state = 'done', finished = ?, error = NULL WHERE id = ?",
+                             (time.time(), tid))
+        return len(rows)
+
+    def work(self, sweep: int = None, max_tasks: int = None, processes: int = 1) -> int:
+        """Claim and run tasks until none are left (or ``max_tasks``); returns runs stored by this call."""
+        if processes > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(processes) as pool:
+                futs = [pool.submit(_work, self.path, self.wal, self.lease, sweep, max_tasks)
+                        for _ in range(processes)]
+                return sum(f.result() for f in futs)
+        self.recover()
+        n = done = 0
+        while max_tasks is None or n < max_tasks:
+            task = self.claim(sweep)
+            if task is None: break
+            done += self.run_task(task); n += 1
+        return done
+
+    def retry(self, sweep: int) -> int:
+        """Put failed tasks of ``sweep`` back in the queue."""
+        with self._tx():
+            return self.con.execute("UPDATE tasks SET state = 'pending', attempts = 0, error = NULL "
+                                    "WHERE sweep = ? AND state = 'failed'", (sweep,)).rowcount
+
+    # ── queries ───────────────────────────────────────────────
+    def sweeps(self) -> pd.DataFrame:
+        return pd.read_sql_query('SELECT id, name, runs, created FROM sweeps ORDER BY id', self.con)
+
+    def progress(self, sweep: int) -> dict:
+        """Task and run counts, throughput over the last ``RATE_WINDOW`` seconds and ETA."""
+        runs, = self.con.execute('SELECT runs FROM sweeps WHERE id = ?', (sweep,)).fetchone()
+        out = {'runs': runs, 'pending': 0, 'running': 0, 'done': 0, 'failed': 0}
+        for st, c in self.con.execute('SELECT state, COUNT(*) FROM tasks WHERE sweep = ? GROUP BY state', (sweep,)):
+            out[st] = c
+        done_runs, first, last = self.con.execute(
+            "SELECT COALESCE(SUM(hi - lo), 0), MIN(claimed), MAX(finished) FROM tasks "
+            "WHERE sweep = ? AND state = 'done'", (sweep,)).fetchone()
+        now = time.time()
+        recent, since = self.con.execute(
+            "SELECT COALESCE(SUM(hi - lo), 0), MIN(claimed) FROM tasks "
+            "WHERE sweep = ? AND state = 'done' AND finished >= ?", (sweep, now - RATE_WINDOW)).fetchone()
+        if recent: rate = recent / max(now - max(since, now - RATE_WINDOW), 1e-9)
+        elif done_runs and last > first: rate = done_runs / (last - first)
+        else: rate = float('nan')
+        workers = self.con.execute("SELECT COUNT(DISTINCT worker) FROM tasks WHERE sweep = ? "
+                                   "AND state = 'running'", (sweep,)).fetchone()[0]
+        left = runs - done_runs
+        out.update(done_runs=done_runs, workers=workers, runs_per_s=rate,
+                   eta_s=0.0 if not left else (left / rate if rate == rate and rate > 0 else float('nan')))
+        return out
+
+    def results(self, sweep: int, where: str = None, args: tuple = ()) -> pd.DataFrame:
+        """Finished runs of ``sweep`` (params expanded into columns); ``where`` is an SQL filter, e.g. 'sharpe > ?'."""
+        q = 'SELECT * FROM results WHERE sweep = ?' + (f' AND ({where})' if where else '') + ' ORDER BY point'
+        df = pd.read_sql_query(q, self.con, params=(sweep,) + tuple(args))
+        prm = pd.DataFrame([json.loads(p) for p in df.pop('params')], index=df.index)
+        return pd.concat([df[['point']], prm, df.drop(columns=['sweep', 'point'])], axis=1)
+
+    def best(self, sweep: int, by: str = 'sharpe', n: int = 10, ascending: bool = False) -> pd.DataFrame:
+        if by not in dict(_METRICS): raise KeyError(f"unknown metric {by!r}")
+        q = (f"SELECT point FROM results WHERE sweep = ? AND {by} IS NOT NULL "
+             f"ORDER BY {by} {'ASC' if ascending else 'DESC'} LIMIT ?")
+        pts = [r[0] for r in self.con.execute(q, (sweep, n))]
+        if not pts: return self.results(sweep, 'point < 0')
+        df = self.results(sweep, f"point IN ({', '.join('?' * len(pts))})", pts)
+        return df.set_index('point').loc[pts].reset_index()
+
+
+def _plain(v):
+    return v.item() if isinstance(v, np.generic) else v
+
+
+def _work(path, wal, lease, sweep, max_tasks):
+    q = SweepQueue(path, wal, lease)
+    try: return q.work(sweep, max_tasks)
+    finally: q.close()
+
+
+if __name__ == '__main__':
+    ap = argparse.ArgumentParser(description="Run or inspect a SQLite sweep queue")
+    ap.add_argument('command', choices=('work', 'status', 'retry'))
+    ap.add_argument('db')
+    ap.add_argument('--sweep', type=int, help="only this sweep (default: all)")
+    ap.add_argument('--processes', type=int, default=1)
+    ap.add_argument('--max-tasks', type=int)
+    ap.add_argument('--no-wal', action='store_true', help="rollback journal, for network filesystems")
+    a = ap.parse_args()
+    q = SweepQueue(a.db, wal=not a.no_wal)
+    if a.command == 'work':
+        t = time.time(); n = q.work(a.sweep, a.max_tasks, a.processes)
+        print(f"{n:,} runs in {time.time() - t:.1f}s")
+    ids = [a.sweep] if a.sweep is not None else q.sweeps()['id'].tolist()
+    if a.command == 'retry':
+        for s in ids: print(f"sweep {s}: {q.retry(s)} task(s) requeued")
+    for s in ids:
+        p = q.progress(s)
+        print(f"sweep {s}: {p['done_runs']:,}/{p['runs']:,} runs, {p['done']} done / {p['running']} running / "
+              f"{p['pending']} pending / {p['failed']} failed tasks, {p['runs_per_s']:,.0f} runs/s, "
+              f"ETA {p['eta_s']:,.0f}s")
@@ -0,0 +1,302 @@
+"""
+QuantResearch Tick Archive
+==========================
+Append-only binary tick recorder and memory-mapped reader / replayer.
+
+Layout: one segment per UTC day, ``<root>/YYYY-MM-DD.qtk``.  A segment is
+a sequence of self-contained blocks, each block is
+
+    header  <4s I I I q q>   magic 'QTK1', n_ticks, payload_len, crc32,
+                              first_ts_ms, last_ts_ms
+    payload zlib(  n_sym:u2  names:utf8 '\\n'-joined (len u4)
+                   ts      int64  delta vs previous tick
+                   sym     uint16 index into names
+                   price   int64  price * SCALE, delta vs previous tick
+                                  of the same symbol inside the block
+                   size    float64 )
+
+Blocks never reference each other, so a torn final block (crash while
+writing) is simply ignored by the reader, and a reader can skip whole
+blocks by their timestamp range without decompressing them.
+
+    rec = TickRecorder('~/.quant_ticks')
+    ws_manager.recorder = rec                      # every received tick
+    ...
+    arc = TickArchive('~/.quant_ticks')
+    arc.read_frame('2024-06-03', '2024-06-03', symbols=['BTC-USD'])
+    arc.replay(live_store, speed=10)               # 10x into the dashboard
+    arc.replay(my_callback, speed=None)            # as fast as possible
+"""
+
+from __future__ import annotations
+import mmap, os, queue, struct, threading, time, zlib
+from datetime import datetime, timezone
+from typing import Iterator, NamedTuple
+
+import numpy as np
+import pandas as pd
+
+MAGIC   = b'QTK1'
+HEADER  = struct.Struct('<4sIIIqq')
+SCALE   = 100_000_000                     # 1e-8 price resolution
+SUFFIX  = '.qtk'
+TICK_DTYPE = np.dtype([('ts', '<i8'), ('sym', '<u2'), ('price', '<f8'), ('size', '<f8')])
+
+
+def _day(ts_ms: int) -> str:
+    return datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc).strftime('%Y-%m-%d')
+
+
+def _to_ms(t) -> int:
+    if t is None: return None
+    if isinstance(t, (int, np.integer)): return int(t)
+    ts = pd.Timestamp(t)
+    if ts.tzinfo is not None: ts = ts.tz_convert('UTC').tz_localize(None)
+    return int(ts.value // 1_000_000)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 1. BLOCK CODEC
+# ═══════════════════════════════════════════════════════════════════
+def _group_delta(sym: np.ndarray, vals: np.ndarray) -> np.ndarray:
+    """vals[i] − vals[previous i with the same sym]; first of each symbol stays absolute."""
+    order = np.argsort(sym, kind='stable')
+    s, v = sym[order], vals[order]
+    d = np.empty_like(v); d[0] = v[0]; d[1:] = np.diff(v)
+    first = np.r_[True, s[1:] != s[:-1]]
+    d[first] = v[first]
+    out = np.empty_like(d); out[order] = d
+    return out
+
+
+def _group_undelta(sym: np.ndarray, d: np.ndarray) -> np.ndarray:
+    order = np.argsort(sym, kind='stable')
+    s, v = sym[order], d[order]
+    cs = np.cumsum(v)
+    starts = np.flatnonzero(np.r_[True, s[1:] != s[:-1]])
+    base = np.where(starts > 0, cs[starts - 1], 0)
+    cs -= np.repeat(base, np.diff(np.r_[starts, len(s)]))
+    out = np.empty_like(cs); out[order] = cs
+    return out
+
+
+def encode_block(ts, sym_names, sym, price, size, level: int = 6) -> bytes:
+    ts = np.asarray(ts, dtype=np.int64); sym = np.asarray(sym, dtype=np.uint16)
+    n = len(ts)
+    ip = np.rint(np.asarray(price, dtype=np.float64) * SCALE).astype(np.int64)
+    dts = np.empty(n, np.int64); dts[0] = ts[0]; dts[1:] = np.diff(ts)
+    names = '\n'.join(sym_names).encode()
+    raw = b''.join((struct.pack('<HI', len(sym_names), len(names)), names,
+                    dts.tobytes(), sym.tobytes(), _group_delta(sym, ip).tobytes(),
+                    np.asarray(size, dtype=np.float64).tobytes()))
+    payload = zlib.compress(raw, level)
+    return HEADER.pack(MAGIC, n, len(payload), zlib.crc32(payload),
+                       int(ts.min()), int(ts.max())) + payload
+
+
+def decode_payload(n: int, payload) -> tuple:
+    raw = zlib.decompress(payload)
+    n_sym, nlen = struct.unpack_from('<HI', raw, 0)
+    off = 6
+    names = raw[off:off + nlen].decode().split('\n') if n_sym else []; off += nlen
+    dts = np.frombuffer(raw, np.int64, n, off); off += 8 * n
+    sym = np.frombuffer(raw, np.uint16, n, off); off += 2 * n
+    dp  = np.frombuffer(raw, np.int64, n, off); off += 8 * n
+    size = np.frombuffer(raw, np.float64, n, off)
+    out = np.empty(n, TICK_DTYPE)
+    out['ts'] = np.cumsum(dts); out['sym'] = sym
+    out['price'] = _group_undelta(sym, dp) / SCALE; out['size'] = size
+    return out, names
+
+
+class TickBlock(NamedTuple):
+    ticks: np.ndarray          # TICK_DTYPE, arrival order
+    symbols: list              # ticks['sym'] indexes into this
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 2. RECORDER
+# ═══════════════════════════════════════════════════════════════════
+class TickRecorder:
+    """
+    Buffers ticks and hands full buffers to a background writer, so the
+    feed thread only pays for a list append.  A block is cut every
+    ``block_ticks`` ticks, every ``flush_secs`` seconds, and at UTC midnight.
+    """
+    def __init__(self, root: str, block_ticks: int = 4096, flush_secs: float = 1.0,
+                 level: int = 6, fsync: bool = False):
+        self.root = os.path.expanduser(root)
+        os.makedirs(self.root, exist_ok=True)
+        self.block_ticks, self.flush_secs = block_ticks, flush_secs
+        self.level, self.fsync = level, fsync
+        self._lock = threading.Lock()
+        self._buf: list = []; self._day = None
+        self._day_lo = self._day_hi = 0
+        self._last_flush = time.monotonic()
+        self._q: queue.Queue = queue.Queue()
+        self._files: dict = {}
+        self.ticks = 0; self.blocks = 0; self.bytes = 0
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def on_tick(self, ticker: str, ts_ms, price: float, size: float = 0.0):
+        ts = int(ts_ms)
+        with self._lock:
+            if not self._day_lo <= ts < self._day_hi:            # day rollover
+                self._cut()
+                self._day = _day(ts)
+                self._day_lo = ts - ts % 86_400_000; self._day_hi = self._day_lo + 86_400_000
+            self._buf.append((ts, ticker, float(price), float(size or 0.0)))
+            if (len(self._buf) >= self.block_ticks
+                    or time.monotonic() - self._last_flush >= self.flush_secs):
+                self._cut()
+
+    __call__ = on_tick
+
+    def _cut(self):
+        if self._buf: self._q.put((self._day, self._buf)); self._buf = []
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        """Cut the current buffer and wait until everything queued is on disk."""
+        with self._lock: self._cut()
+        self._q.join()
+
+    def close(self):
+        self.flush()
+        self._q.put(None); self._writer.join()
+        for f in self._files.values(): f.close()
+        self._files.clear()
+
+    def _write_loop(self):
+        while True:
+            item = self._q.get()
+            try:
+                if item is None: return
+                day, buf = item
+                idx: dict = {}
+                sym = np.fromiter((idx.setdefault(t, len(idx)) for _, t, _, _ in buf), np.uint16, len(buf))
+                names = list(idx)
+                ts = np.fromiter((b[0] for b in buf), np.int64, len(buf))
+                px = np.fromiter((b[2] for b in buf), np.float64, len(buf))
+                sz = np.fromiter((b[3] for b in buf), np.float64, len(buf))
+                blob = encode_block(ts, names, sym, px, sz, self.level)
+                f = self._files.get(day)
+                if f is None:
+                    for d in [d for d in self._files if d != day]: self._files.pop(d).close()
+                    f = self._files[day] = open(os.path.join(self.root, day + SUFFIX), 'ab')
+                f.write(blob); f.flush()
+                if self.fsync: os.fsync(f.fileno())
+                self.ticks += len(buf); self.blocks += 1; self.bytes += len(blob)
+            except Exception as exc:
+                print(f"[WARN] tick recorder: {exc}")
+            finally:
+                self._q.task_done()
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 3. READER / REPLAY
+# ═══════════════════════════════════════════════════════════════════
+class TickArchive:
+    def __init__(self, root: str):
+        self.root = os.path.expanduser(root)
+
+    def days(self) -> list:
+        if not os.path.isdir(self.root): return []
+        return sorted(f[:-len(SUFFIX)] for f in os.listdir(self.root) if f.endswith(SUFFIX))
+
+    def _segments(self, start_ms, end_ms):
+        lo = _day(start_ms) if start_ms is not None else None
+        hi = _day(end_ms) if end_ms is not None else None
+        for d in self.days():
+            if (lo is None or d >= lo) and (hi is None or d <= hi):
+                yield os.path.join(self.root, d + SUFFIX)
+
+    @staticmethod
+    def _scan(path, start_ms=None, end_ms=None) -> Iterator[TickBlock]:
+        """mmap a segment and decode the blocks overlapping [start_ms, end_ms]."""
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < HEADER.size: return
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            off, end = 0, len(mm)
+            while off + HEADER.size <= end:
+                magic, n, plen, crc, t0, t1 = HEADER.unpack_from(mm, off)
+                body = off + HEADER.size
+                if magic != MAGIC or body + plen > end: break        # torn tail
+                off = body + plen
+                if (start_ms is not None and t1 < start_ms) or (end_ms is not None and t0 > end_ms):
+                    continue
+                payload = mm[body:body + plen]
+                if zlib.crc32(payload) != crc:
+                    print(f"[WARN] {os.path.basename(path)}: bad block at {body - HEADER.size}"); break
+                yield TickBlock(*decode_payload(n, payload))
+        finally:
+            mm.close()
+
+    def blocks(self, start=None, end=None, symbols=None) -> Iterator[TickBlock]:
+        """Stream decoded blocks in time order; memory stays at one block."""
+        s, e = _to_ms(start), _to_ms(end)
+        if isinstance(end, str) and len(end) == 10: e += 86_399_999       # whole day
+        want = {x.upper() for x in symbols} if symbols else None
+        for path in self._segments(s, e):
+            for blk in self._scan(path, s, e):
+                t = blk.ticks; m = None
+                if s is not None or e is not None:
+                    m = np.ones(len(t), bool)
+                    if s is not None: m &= t['ts'] >= s
+                    if e is not None: m &= t['ts'] <= e
+                if want is not None:
+                    keep = np.array([n.upper() in want for n in blk.symbols] or [False])
+                    sm = keep[t['sym']]
+                    m = sm if m is None else m & sm
+                if m is not None:
+                    if not m.any(): continue
+                    if not m.all(): t = t[m]
+                yield TickBlock(t, blk.symbols)
+
+    def read(self, start=None, end=None, symbols=None) -> tuple:
+        """All matching ticks as one TICK_DTYPE array plus the symbol table."""
+        names, parts = {}, []
+        for blk in self.blocks(start, end, symbols):
+            remap = np.array([names.setdefault(n, len(names)) for n in blk.symbols], np.uint16)
+            t = blk.ticks.copy(); t['sym'] = remap[t['sym']]; parts.append(t)
+        ticks = np.concatenate(parts) if parts else np.empty(0, TICK_DTYPE)
+        return ticks, list(names)
+
+    def read_frame(self, start=None, end=None, symbols=None) -> pd.DataFrame:
+        ticks, names = self.read(start, end, symbols)
+        if not len(ticks): return pd.DataFrame(columns=['ticker', 'price', 'size'])
+        return pd.DataFrame({'ticker': np.asarray(names, dtype=object)[ticks['sym']],
+                             'price': ticks['price'], 'size': ticks['size']},
+                            index=pd.to_datetime(ticks['ts'], unit='ms'))
+
+    def replay(self, consumer, start=None, end=None, symbols=None, speed: float = 1.0,
+               stop: threading.Event = None) -> int:
+        """
+        Push ticks into ``consumer`` — a LiveDataStore (``add_tick``), anything
+        with ``on_tick``, or a plain ``callback(ticker, ts_ms, price)``.
+        ``speed`` is the time multiple (1 = real time, 10 = 10x); ``None`` or
+        ``0`` replays as fast as possible.  Returns the number of ticks sent.
+        """
+        emit = getattr(consumer, 'add_tick', None) or getattr(consumer, 'on_tick', None) or consumer
+        paced = bool(speed) and speed != float('inf')
+        t0_data = t0_wall = None; sent = 0
+        for blk in self.blocks(start, end, symbols):
+            t = blk.ticks; names = blk.symbols
+            ts, sym, px = t['ts'].tolist(), t['sym'].tolist(), t['price'].tolist()
+            for i in range(len(ts)):
+                if stop is not None and stop.is_set(): return sent
+                if paced:
+                    if t0_data is None: t0_data, t0_wall = ts[i], time.monotonic()
+                    lag = (ts[i] - t0_data) / 1000 / speed - (time.monotonic() - t0_wall)
+                    if lag > 0.001: time.sleep(lag)
+                emit(names[sym[i]], ts[i], px[i]); sent += 1
+        return sent
+
+    def replay_async(self, consumer, **kw) -> threading.Event:
+        """``replay`` on a daemon thread; set the returned event to stop it."""
+        stop = threading.Event()
+        threading.Thread(target=self.replay, args=(consumer,), kwargs={**kw, 'stop': stop},
+                         daemon=True).start()
+        return stop
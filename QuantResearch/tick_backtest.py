@@ -0,0 +1,193 @@
+"""
+QuantResearch Tick Backtest
+===========================
+Event-driven backtest over recorded tick archives (``tick_archive``) or
+1-minute bar files, as a finer-grained companion to ``BacktestEngine``.
+
+Trade management is exactly ``PaperTrader``'s: signals are evaluated on
+each closed bar with incremental indicators, entries fill at the bar
+close, and stop-loss / take-profit are checked against every tick in
+between, so a backtest here reproduces what paper trading would have
+done on the same feed.  With bar input the stops are checked against
+each bar's high / low (gaps fill at the open; if both levels sit inside
+one bar the stop is assumed to trigger first).
+
+Input is consumed in chunks: ticks are bucketed into bars with numpy per
+chunk and only the bar loop runs in Python, so memory stays flat and
+throughput is bound by the number of bars, not ticks.
+
+    eng = TickBacktestEngine(compile_strategy(src), interval='1min')
+    res = eng.run('~/.quant_ticks', start='2024-06-01', end='2024-06-30')
+    res.metrics, res.trades, res.equity_curve
+"""
+
+from __future__ import annotations
+import os
+
+import numpy as np
+import pandas as pd
+
+from .backtest_engine import BacktestEngine, BacktestResult, Strategy, compile_strategy
+from .incremental import Bar, interval_ms
+from .paper_trading import PaperTrader
+from .tick_archive import TickArchive, TICK_DTYPE
+
+_OHLCV = ('OPEN', 'HIGH', 'LOW', 'CLOSE', 'VOLUME')
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 1. CHUNKED SOURCES
+# ═══════════════════════════════════════════════════════════════════
+def _tick_chunks(arc: TickArchive, start, end, symbol, chunk):
+    """Coalesce archive blocks for one symbol into (ts, price, size) chunks of ~``chunk`` ticks."""
+    parts, n = [], 0
+    for blk in arc.blocks(start, end, [symbol]):
+        parts.append(blk.ticks); n += len(blk.ticks)
+        if n >= chunk:
+            t = np.concatenate(parts); parts, n = [], 0
+            yield t['ts'], t['price'], t['size']
+    if parts:
+        t = np.concatenate(parts)
+        yield t['ts'], t['price'], t['size']
+
+
+def _bar_chunks(source, start, end, chunk):
+    """DataFrame, or a .csv (read ``chunk`` rows at a time) / .parquet path of OHLCV bars."""
+    if isinstance(source, pd.DataFrame): it = [source]
+    elif str(source).endswith('.csv'):
+        it = pd.read_csv(os.path.expanduser(source), index_col=0, parse_dates=True, chunksize=chunk)
+    else: it = [pd.read_parquet(os.path.expanduser(source))]
+    lo = pd.Timestamp(start) if start is not None else None
+    hi = pd.Timestamp(end) if end is not None else None
+    for df in it:
+        df = df.rename(columns=str.title)
+        if lo is not None: df = df[df.index >= lo]
+        if hi is not None: df = df[df.index <= hi]
+        if len(df): yield df
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 2. ENGINE
+# ═══════════════════════════════════════════════════════════════════
+class _Sim(PaperTrader):
+    """PaperTrader that also keeps bars, indicator rows and signal indexes for a BacktestResult."""
+    def __init__(self, strat, interval, warmup):
+        super().__init__(strat, interval=interval, warmup=warmup)
+        self.rows: list = []; self.buys: list = []; self.sells: list = []
+
+    def _on_bar(self, bar):
+        had = self.pos is not None; nt = len(self.trades)
+        super()._on_bar(bar)
+        i = len(self.rows); self.rows.append(self.prev)
+        if len(self.trades) > nt: self.sells.append(i)
+        if self.pos is not None and (not had or len(self.trades) > nt): self.buys.append(i)
+
+    def stop_out(self, ts_ms, price, reason):
+        self._close(pd.Timestamp(int(ts_ms), unit='ms'), price, reason)
+        self.sells.append(len(self.rows))            # index of the bar still forming
+
+
+class TickBacktestEngine:
+    def __init__(self, strat: Strategy, interval='1min', warmup: int = 60,
+                 chunk_ticks: int = 1 << 20):
+        self.strat = strat; self.interval = interval
+        self.warmup = warmup; self.chunk = chunk_ticks
+
+    def run(self, source, start=None, end=None, symbol: str = None) -> BacktestResult:
+        """
+        ``source``: a ``TickArchive`` or archive directory (tick mode), or a
+        DataFrame / .csv / .parquet of OHLCV bars (bar mode).  ``symbol``
+        defaults to the strategy's resolved ticker.
+        """
+        sim = _Sim(self.strat, self.interval, self.warmup)
+        symbol = symbol or sim.yf_ticker
+        if isinstance(source, str) and os.path.isdir(os.path.expanduser(source)):
+            source = TickArchive(source)
+        if isinstance(source, TickArchive):
+            self._run_ticks(sim, _tick_chunks(source, start, end, symbol, self.chunk))
+        elif isinstance(source, np.ndarray) and source.dtype == TICK_DTYPE:
+            self._run_ticks(sim, [(source['ts'], source['price'], source['size'])])
+        else:
+            self._run_bars(sim, _bar_chunks(source, start, end, self.chunk))
+        if not sim.rows:
+            raise RuntimeError(f"No data for {symbol} in the given range.")
+        return self._result(sim, symbol)
+
+    # ── tick mode ─────────────────────────────────────────────
+    def _run_ticks(self, sim: _Sim, chunks):
+        ms = interval_ms(self.interval); s = self.strat
+        sl, tp = s.stop_loss_pct, s.take_profit_pct
+        cur: Bar = None
+        for ts, px, sz in chunks:
+            if not len(ts): continue
+            # late ticks fold into the forming bar, exactly as BarBuilder does
+            b = np.maximum.accumulate(ts // ms * ms)
+            if cur is not None: b = np.maximum(b, cur.start_ms)
+            st = np.flatnonzero(np.r_[True, b[1:] != b[:-1]])
+            en = np.r_[st[1:], len(ts)]
+            hi = np.maximum.reduceat(px, st); lo = np.minimum.reduceat(px, st)
+            vol = np.add.reduceat(sz, st)
+            for j in range(len(st)):
+                a, e = int(st[j]), int(en[j])
+                if cur is not None and b[a] == cur.start_ms:
+                    cur.high = max(cur.high, float(hi[j])); cur.low = min(cur.low, float(lo[j]))
+                    cur.close = float(px[e - 1]); cur.volume += float(vol[j]); cur.ticks += e - a
+                else:
+                    if cur is not None: sim._on_bar(cur)
+                    cur = Bar(int(b[a]), float(px[a]), float(hi[j]), float(lo[j]),
+                              float(px[e - 1]), float(vol[j]), e - a)
+                sim.last_price = float(px[e - 1])
+                if sim.pos is not None and (sl > 0 or tp > 0):
+                    pnl = (px[a:e] / sim.pos.entry_price - 1) * 100
+                    hit = np.zeros(e - a, bool)
+                    if sl > 0: hit |= pnl <= -sl
+                    if tp > 0: hit |= pnl >= tp
+                    k = int(hit.argmax())
+                    if hit[k]:
+                        sim.stop_out(ts[a + k], float(px[a + k]),
+                                     'stop_loss' if sl > 0 and pnl[k] <= -sl else 'take_profit')
+        if cur is not None: sim._on_bar(cur)
+
+    # ── bar mode ──────────────────────────────────────────────
+    def _run_bars(self, sim: _Sim, chunks):
+        s = self.strat; sl, tp = s.stop_loss_pct, s.take_profit_pct
+        for df in chunks:
+            t = df.index.values.astype('datetime64[ms]').astype(np.int64)
+            o, h, l, c = (df[k].to_numpy(float) for k in ('Open', 'High', 'Low', 'Close'))
+            v = df['Volume'].to_numpy(float) if 'Volume' in df.columns else np.zeros(len(df))
+            for i in range(len(df)):
+                pos = sim.pos
+                if pos is not None and (sl > 0 or tp > 0):
+                    e = pos.entry_price
+                    sl_px = e * (1 - sl / 100) if sl > 0 else -np.inf
+                    tp_px = e * (1 + tp / 100) if tp > 0 else np.inf
+                    if o[i] <= sl_px or (l[i] <= sl_px and not o[i] >= tp_px):
+                        sim.stop_out(t[i], min(o[i], sl_px), 'stop_loss')
+                    elif o[i] >= tp_px or h[i] >= tp_px:
+                        sim.stop_out(t[i], max(o[i], tp_px), 'take_profit')
+                sim._on_bar(Bar(int(t[i]), o[i], h[i], l[i], c[i], v[i]))
+                sim.last_price = c[i]
+
+    # ── result ────────────────────────────────────────────────
+    def _result(self, sim: _Sim, symbol) -> BacktestResult:
+        s = self.strat
+        rows = pd.DataFrame(sim.rows)
+        idx = pd.DatetimeIndex([t for t, _ in sim.equity])
+        data = rows[list(_OHLCV)].set_axis([k.title() for k in _OHLCV], axis=1).set_index(idx)
+        ind = {k: pd.Series(rows[k].to_numpy(), index=idx) for k in rows.columns if k not in _OHLCV}
+        eq = np.array([v for _, v in sim.equity])
+        if sim.pos is not None:
+            sim._close(idx[-1], sim.last_price, 'end_of_data')
+            sim.sells.append(len(idx) - 1); eq[-1] = sim.cash
+        w = min(self.warmup, len(eq) - 1); eq[:w] = eq[w]
+        eqs = pd.Series(eq, index=idx)
+        # _metrics annualises with 252 periods — feed it daily equity for intraday bars
+        daily = pd.concat([eqs.iloc[:1], eqs.resample('1D').last().dropna()])
+        metrics = BacktestEngine._metrics(sim.trades, daily if len(daily) > 1 else eqs, s)
+        return BacktestResult(s, sim.trades, eqs, sim.buys, sim.sells, ind, data, metrics,
+                              sim.currency, sim.exchange, symbol)
+
+
+def run_tick_backtest(src: str, source, **kw) -> BacktestResult:
+    run_kw = {k: kw.pop(k) for k in ('start', 'end', 'symbol') if k in kw}
+    return TickBacktestEngine(compile_strategy(src), **kw).run(source, **run_kw)
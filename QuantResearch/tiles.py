@@ -0,0 +1,169 @@
+"""
+QuantResearch Tiles
+===================
+A scrolling grid of small charts that stays responsive with hundreds of
+tiles.
+
+    grid = TileGrid(frame, len(tickers), draw=draw_tile, service=get_service())
+    grid.set_data(i, payload)          # tile i renders on its own as soon as its data lands
+    grid.set_data(j, None, 'No data')  # or shows a message
+
+* every tile is drawn on its own off-screen Agg figure in the DataService
+  worker pool and cached as an image; the Tk thread only blits images
+* only tiles inside the viewport (plus one row either side) are rendered
+  and composited, so scrolling never touches the rest of the grid
+* ``draw(fig, payload)`` runs on a worker thread and must stick to the
+  object-oriented matplotlib API (no pyplot)
+* resizing the window re-flows the columns and re-renders what is visible
+"""
+
+from __future__ import annotations
+import tkinter as tk
+from typing import Callable
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 1. OFF-SCREEN RENDER
+# ═══════════════════════════════════════════════════════════════════
+def render_tile(draw: Callable, payload, w: int, h: int, dpi: int = 90) -> bytes:
+    """Draw one tile on a private Agg canvas → binary PPM, which ``tk.PhotoImage`` reads natively."""
+    fig = Figure(figsize=(w / dpi, h / dpi), dpi=dpi)
+    FigureCanvasAgg(fig)
+    draw(fig, payload)
+    fig.canvas.draw()
+    rgba = np.asarray(fig.canvas.buffer_rgba())
+    return b'P6 %d %d 255\n' % (rgba.shape[1], rgba.shape[0]) + rgba[..., :3].tobytes()
+
+
+# ═══════════════════════════════════════════════════════════════════
+# 2. VIRTUALIZED GRID
+# ═══════════════════════════════════════════════════════════════════
+class TileGrid:
+    def __init__(self, parent, n: int, draw: Callable, service, min_width: int = 320,
+                 max_cols: int = 4, aspect: float = 0.8, bg: str = '#000000',
+                 fg: str = '#808080', on_open: Callable = None, max_inflight: int = 4):
+        self.n = n; self.draw = draw; self.svc = service
+        self.min_width = min_width; self.max_cols = max_cols; self.aspect = aspect
+        self.bg = bg; self.fg = fg; self.on_open = on_open; self.max_inflight = max_inflight
+        self.payload = [None] * n
+        self.label = ['Loading…'] * n
+        self.version = [0] * n
+        self.counts = {'renders': 0, 'blits': 0}
+        self._img: dict = {}                 # i → (key, ppm), key = (version, w, h)
+        self._photo: dict = {}               # i → PhotoImage, visible tiles only
+        self._shown: dict = {}               # i → what the canvas shows: key | label text
+        self._inflight: dict = {}            # i → key being rendered
+        self._geom = (0, 0, 0)               # cols, tile w, tile h
+        self.closed = False
+
+        frame = tk.Frame(parent, bg=bg); frame.pack(fill=tk.BOTH, expand=True)
+        vs = tk.Scrollbar(frame, orient=tk.VERTICAL, bg=bg, troughcolor=bg)
+        vs.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas = cv = tk.Canvas(frame, bg=bg, highlightthickness=0, yscrollcommand=vs.set)
+        cv.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        vs.config(command=self._yview)
+        cv.bind('<Configure>', lambda e: self._layout())
+        cv.bind('<MouseWheel>', lambda e: self._yview('scroll', -1 if e.delta > 0 else 1, 'units'))
+        cv.bind('<Button-4>', lambda e: self._yview('scroll', -1, 'units'))
+        cv.bind('<Button-5>', lambda e: self._yview('scroll', 1, 'units'))
+        cv.bind('<Double-1>', self._on_double)
+        frame.bind('<Destroy>', lambda e: setattr(self, 'closed', True))
+
+    # ── data ───────────────────────────────────────────────────
+    def set_data(self, i: int, payload, label: str = ''):
+        """New content for tile ``i`` (``None`` shows ``label`` instead); only that tile redraws."""
+        if self.closed: return
+        self.payload[i] = payload; self.label[i] = label
+        self.version[i] += 1; self._img.pop(i, None)
+        self._refresh()
+
+    # ── geometry ───────────────────────────────────────────────
+    def _layout(self):
+        w = self.canvas.winfo_width()
+        if w <= 1: return
+        cols = max(1, min(self.max_cols, self.n, w // self.min_width))
+        tw = w // cols; geom = (cols, tw, int(tw * self.aspect))
+        if geom != self._geom:
+            self._geom = geom
+            self.canvas.delete('all'); self._shown.clear(); self._photo.clear()
+            rows = -(-self.n // cols)
+            self.canvas.configure(scrollregion=(0, 0, w, rows * geom[2]), yscrollincrement=geom[2] // 4)
+        self._refresh()
+
+    def _visible(self):
+        cols, _, th = self._geom
+        if not th: return range(0)
+        y0 = self.canvas.canvasy(0); y1 = y0 + self.canvas.winfo_height()
+        r0 = max(0, int(y0 // th) - 1); r1 = int(y1 // th) + 1
+        return range(r0 * cols, min(self.n, (r1 + 1) * cols))
+
+    def _yview(self, *args):
+        self.canvas.yview(*args); self._refresh()
+
+    def _on_double(self, event):
+        cols, tw, th = self._geom
+        if not th or self.on_open is None: return
+        x, y = self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
+        i = int(y // th) * cols + int(x // tw)
+        if 0 <= i < self.n and x < cols * tw: self.on_open(i)
+
+    # ── compositing ────────────────────────────────────────────
+    def _refresh(self):
+        """Show every visible tile (image or placeholder), drop the rest, and queue renders."""
+        if self.closed or not self._geom[2]: return
+        cols, tw, th = self._geom
+        vis = self._visible(); cv = self.canvas
+        for i in [i for i in self._shown if i not in vis]:
+            cv.delete(f't{i}'); del self._shown[i]; self._photo.pop(i, None)
+        for i in vis:
+            key = (self.version[i], tw, th)
+            img = self._img.get(i)
+            want = key if img is not None and img[0] == key else (
+                   'Rendering…' if self.payload[i] is not None else self.label[i])
+            if self._shown.get(i) == want: continue
+            cv.delete(f't{i}')
+            x, y = (i % cols) * tw, (i // cols) * th
+            if isinstance(want, tuple):
+                self._photo[i] = ph = tk.PhotoImage(data=img[1], format='PPM')
+                cv.create_image(x, y, image=ph, anchor='nw', tags=(f't{i}',))
+                self.counts['blits'] += 1
+            else:
+                self._photo.pop(i, None)
+                cv.create_rectangle(x + 4, y + 4, x + tw - 4, y + th - 4, outline=self.fg, dash=(2, 4),
+                                    tags=(f't{i}',))
+                cv.create_text(x + tw // 2, y + th // 2, text=want, fill=self.fg,
+                               font=('Consolas', 9), tags=(f't{i}',))
+            self._shown[i] = want
+        self._pump(vis)
+
+    def _pump(self, vis):
+        """Keep up to ``max_inflight`` renders going, visible tiles in reading order."""
+        _, tw, th = self._geom
+        for i in vis:
+            if len(self._inflight) >= self.max_inflight: break
+            if self.payload[i] is None or i in self._inflight: continue
+            key = (self.version[i], tw, th)
+            img = self._img.get(i)
+            if img is not None and img[0] == key: continue
+            self._inflight[i] = key
+            self.svc.call(render_tile, self.draw, self.payload[i], tw, th,
+                          callback=lambda ppm, i=i, key=key: self._on_render(i, key, ppm),
+                          errback=lambda exc, i=i, key=key: self._on_fail(i, key, exc))
+
+    def _on_render(self, i, key, ppm):
+        self._inflight.pop(i, None)
+        if self.closed: return
+        if key == (self.version[i],) + self._geom[1:]:
+            self._img[i] = (key, ppm); self.counts['renders'] += 1
+        self._refresh()
+
+    def _on_fail(self, i, key, exc):
+        self._inflight.pop(i, None)
+        print(f"[WARN] tile {i}: {exc}")
+        if self.closed: return
+        if key[0] == self.version[i]: self.payload[i] = None; self.label[i] = 'Render failed'
+        self._refresh()